@@ -0,0 +1 @@
+"""Charts and reports built from the generated watchlists."""
@@ -0,0 +1,75 @@
+"""Headless chart pipeline shared by the analysis scripts.
+
+Each ``Chart`` names a PNG, a module-level render function and the
+JSON-serializable data it plots. ``render_charts`` hashes every chart's
+data and skips those whose PNG already exists with the same hash (kept in
+``output/charts/.manifest.json``). The rest render on the Agg backend, in a
+process pool when there is more than one CPU, and every figure is closed
+once saved.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+from config import CHART_WORKERS
+from fileio import atomic_write_text, text_digest
+
+CHARTS_DIR = Path("output/charts")
+MANIFEST_PATH = CHARTS_DIR / ".manifest.json"
+
+
+@dataclass(frozen=True)
+class Chart:
+    filename: str
+    # render(data, path); module-level so it can be sent to a worker process
+    render: Callable[[Any, Path], None]
+    data: Any
+
+    def digest(self) -> str:
+        return text_digest(json.dumps([self.render.__name__, self.data], sort_keys=True, default=str))
+
+
+def _render(render: Callable[[Any, Path], None], data: Any, path: Path) -> None:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    try:
+        render(data, path)
+    finally:
+        plt.close("all")
+
+
+def _load_manifest() -> Dict[str, str]:
+    try:
+        return json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def render_charts(charts: Sequence[Chart], workers: int = CHART_WORKERS, force: bool = False) -> List[str]:
+    """Render the charts whose data changed; return the filenames rendered."""
+    CHARTS_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = _load_manifest()
+    digests = {chart.filename: chart.digest() for chart in charts}
+    pending = [
+        chart for chart in charts
+        if force or manifest.get(chart.filename) != digests[chart.filename] or not (CHARTS_DIR / chart.filename).exists()
+    ]
+    workers = min(workers, os.cpu_count() or 1, len(pending))
+    if workers <= 1:
+        for chart in pending:
+            _render(chart.render, chart.data, CHARTS_DIR / chart.filename)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_render, chart.render, chart.data, CHARTS_DIR / chart.filename) for chart in pending]
+            for future in futures:
+                future.result()
+    if pending:
+        manifest.update({chart.filename: digests[chart.filename] for chart in pending})
+        atomic_write_text(MANIFEST_PATH, json.dumps(manifest, indent=2, sort_keys=True))
+    return [chart.filename for chart in pending]
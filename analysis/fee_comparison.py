@@ -1,6 +1,7 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from pathlib import Path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from analysis.charts import Chart, render_charts
 
 # Define exchange fee structures
 fee_data = {
@@ -22,14 +23,11 @@ fee_data = {
     ]
 }
 
-def analyze_fees():
-    df = pd.DataFrame(fee_data)
-    
-    # Calculate total cost metrics
-    df['avg_trading_fee'] = (df['maker_fee'] + df['taker_fee']) / 2
-    df['cost_rating'] = df['avg_trading_fee'] * 0.7 + (df['withdrawal_fee_btc'] * 10000) * 0.3
-    
-    # Generate visualizations
+def render_fee_chart(data, path):
+    import pandas as pd
+    import matplotlib.pyplot as plt
+
+    df = pd.DataFrame(data)
     plt.figure(figsize=(15, 10))
     
     # Trading fees comparison
@@ -43,9 +41,20 @@ def analyze_fees():
     plt.ylabel('Fee Percentage (%)')
     plt.legend()
     
-    # Save results
     plt.tight_layout()
-    plt.savefig('output/charts/fee_comparison.png')
+    plt.savefig(path)
+
+def analyze_fees():
+    import pandas as pd
+
+    df = pd.DataFrame(fee_data)
+    
+    # Calculate total cost metrics
+    df['avg_trading_fee'] = (df['maker_fee'] + df['taker_fee']) / 2
+    df['cost_rating'] = df['avg_trading_fee'] * 0.7 + (df['withdrawal_fee_btc'] * 10000) * 0.3
+    
+    # Generate visualizations (skipped while fee_data is unchanged)
+    render_charts([Chart('fee_comparison.png', render_fee_chart, fee_data)])
     
     # Generate markdown report
     report = """# Exchange Fee Analysis
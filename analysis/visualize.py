@@ -1,77 +1,100 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import argparse
+from dataclasses import asdict
 from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from config import parse_volume_bucket
-
-# Set style for better-looking charts
-plt.style.use('default')
-sns.set_theme()
-
-# Create charts directory
-Path("output/charts").mkdir(exist_ok=True)
-
-# Load and process data
-data = []
-for volume_dir in Path("output").glob("vol_*"):
-    bucket_label = volume_dir.name.replace("vol_", "")
-    volume = parse_volume_bucket(bucket_label)
-
-    for file in volume_dir.glob("*_pairs_*.txt"):
-        content = file.read_text(encoding='utf-8', errors='replace').strip()
-        pairs = len(content.splitlines()) if content else 0
-        exchange, quote, *_ = file.name.split("_")
-        data.append({
-            "exchange": exchange.upper(),
-            "quote": quote,
-            "volume": volume,
-            "pairs": pairs
-        })
-
-df = pd.DataFrame(data)
-
-# 1. Exchange Pairs Chart
-plt.figure(figsize=(15, 8))
-total_pairs = df.groupby("exchange")["pairs"].sum().sort_values(ascending=False)
-sns.barplot(x=total_pairs.index, y=total_pairs.values)
-plt.title("Total Trading Pairs by Exchange", pad=20)
-plt.xticks(rotation=45)
-plt.ylabel("Number of Pairs")
-plt.tight_layout()
-plt.savefig("output/charts/exchange_pairs.png")
-
-# 2. Volume Threshold Comparison
-plt.figure(figsize=(15, 8))
-volume_pivot = df.pivot_table(
-    index="exchange", 
-    columns="volume",
-    values="pairs",
-    aggfunc="sum"
-).fillna(0)
-volume_pivot.plot(kind="bar", width=0.8)
-plt.title("Pairs Count by Volume Threshold", pad=20)
-plt.xlabel("Exchange")
-plt.ylabel("Number of Pairs")
-plt.legend(title="Volume Threshold ($)", labels=["500K", "1M", "5M"])
-plt.tight_layout()
-plt.savefig("output/charts/volume_comparison.png")
-
-# 3. Quote Asset Distribution
-plt.figure(figsize=(15, 8))
-quote_pivot = df.pivot_table(
-    index="exchange",
-    columns="quote",
-    values="pairs",
-    aggfunc="sum"
-).fillna(0)
-quote_pivot.plot(kind="bar", stacked=True)
-plt.title("Quote Asset Distribution by Exchange", pad=20)
-plt.xlabel("Exchange")
-plt.ylabel("Number of Pairs")
-plt.legend(title="Quote Asset", bbox_to_anchor=(1.05, 1))
-plt.tight_layout()
-plt.savefig("output/charts/quote_distribution.png")
-
-print("Charts generated successfully in output/charts/")
+from analysis.charts import CHARTS_DIR, Chart, render_charts
+from pair_counts import load_pair_counts
+
+
+def _frame(rows):
+    import pandas as pd
+
+    return pd.DataFrame(rows, columns=["exchange", "quote", "market_type", "volume", "pairs"])
+
+
+def _setup():
+    # Imported in the render workers so importing this module stays cheap
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Set style for better-looking charts
+    plt.style.use('default')
+    sns.set_theme()
+    return plt, sns
+
+
+def render_exchange_pairs(rows, path):
+    plt, sns = _setup()
+    df = _frame(rows)
+    plt.figure(figsize=(15, 8))
+    total_pairs = df.groupby("exchange")["pairs"].sum().sort_values(ascending=False)
+    sns.barplot(x=total_pairs.index, y=total_pairs.values)
+    plt.title("Total Trading Pairs by Exchange", pad=20)
+    plt.xticks(rotation=45)
+    plt.ylabel("Number of Pairs")
+    plt.tight_layout()
+    plt.savefig(path)
+
+
+def render_volume_comparison(rows, path):
+    plt, _ = _setup()
+    df = _frame(rows)
+    plt.figure(figsize=(15, 8))
+    volume_pivot = df.pivot_table(
+        index="exchange",
+        columns="volume",
+        values="pairs",
+        aggfunc="sum"
+    ).fillna(0)
+    volume_pivot.plot(kind="bar", width=0.8)
+    plt.title("Pairs Count by Volume Threshold", pad=20)
+    plt.xlabel("Exchange")
+    plt.ylabel("Number of Pairs")
+    plt.legend(title="Volume Threshold ($)", labels=["500K", "1M", "5M"])
+    plt.tight_layout()
+    plt.savefig(path)
+
+
+def render_quote_distribution(rows, path):
+    plt, _ = _setup()
+    df = _frame(rows)
+    plt.figure(figsize=(15, 8))
+    quote_pivot = df.pivot_table(
+        index="exchange",
+        columns="quote",
+        values="pairs",
+        aggfunc="sum"
+    ).fillna(0)
+    quote_pivot.plot(kind="bar", stacked=True)
+    plt.title("Quote Asset Distribution by Exchange", pad=20)
+    plt.xlabel("Exchange")
+    plt.ylabel("Number of Pairs")
+    plt.legend(title="Quote Asset", bbox_to_anchor=(1.05, 1))
+    plt.tight_layout()
+    plt.savefig(path)
+
+
+def generate_charts(table=None, force=False):
+    """Render the pair-count charts whose input changed; return the filenames rendered."""
+    if table is None:
+        table = load_pair_counts()
+    rows = [asdict(row) for row in table]
+    return render_charts([
+        Chart("exchange_pairs.png", render_exchange_pairs, rows),
+        Chart("volume_comparison.png", render_volume_comparison, rows),
+        Chart("quote_distribution.png", render_quote_distribution, rows),
+    ], force=force)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render the pair-count charts')
+    parser.add_argument('--force', action='store_true', help='Re-render charts even if their data is unchanged')
+    args = parser.parse_args()
+
+    rendered = generate_charts(force=args.force)
+    print(f"Charts generated successfully in {CHARTS_DIR}/ ({len(rendered)} rendered)")
+
+
+if __name__ == "__main__":
+    main()
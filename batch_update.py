@@ -2,142 +2,50 @@
 """
 Batch update all exchange data and generate analysis
 """
+import argparse
 import subprocess
 import sys
-import time
 import os
 import glob
 from datetime import datetime
 
 # Configuration
-from config import VOLUME_THRESHOLDS, get_volume_bucket_label
+import timing
+from analysis.insights import generate_insights
+from analysis.visualize import generate_charts
+from config import (
+    BATCH_WORKERS,
+    FUTURES_QUOTE_ASSETS,
+    HISTORY_STORE,
+    QUOTE_ASSETS,
+    VOLUME_THRESHOLDS,
+    get_volume_bucket_label,
+)
+from exchanges import cache
+from exchanges.registry import exchange_names
+from forex.oanda import run_oanda
+from marketcap_bucket import run_market_cap_buckets
+from history import record_history
+from main import clean_old_files, pairs_path
+from membership import format_changes, record_membership
+from pair_counts import load_pair_counts, record_pair_counts
+from runner import format_result, run_exchanges
 
-EXCHANGES = ["binance", "bitfinex", "bitget", "bitstamp", "bybit", "coinbase", "gateio", "huobi", "kraken", "kucoin", "mexc", "okx"]
-FUTURES_EXCHANGES = ["binance", "bybit", "coinbase", "okx"]  # Exchanges with futures/perpetual support
-QUOTE_ASSETS = ["USDT", "EUR", "USD", "BTC", "ETH"]
-FUTURES_QUOTE_ASSETS = ["USDT", "USDC"]  # Perpetuals: most are USDT, Coinbase uses USDC
-
-def clean_old_files():
-    """Remove old data files"""
-    current_date = datetime.now().strftime('%d-%b-%y').lower()
-    print(f"🧹 Cleaning old files (keeping {current_date})...")
-    
-    removed_count = 0
-    
-    # Clean crypto files (both spot and perpetual)
-    for volume in VOLUME_THRESHOLDS:
-        vol_dir = f"output/vol_{get_volume_bucket_label(volume)}"
-        if os.path.exists(vol_dir):
-            pattern = f"{vol_dir}/*pairs*.txt"
-            for file_path in glob.glob(pattern):
-                filename = os.path.basename(file_path)
-                if current_date not in filename:
-                    os.remove(file_path)
-                    removed_count += 1
-                    print(f"  🗑️  Removed: {filename}")
-    
-    # Clean forex and stocks files
-    for data_dir in ["forex", "stocks"]:
-        if os.path.exists(data_dir):
-            pattern = f"{data_dir}/*.txt"
-            for file_path in glob.glob(pattern):
-                filename = os.path.basename(file_path)
-                if current_date not in filename:
-                    os.remove(file_path)
-                    removed_count += 1
-                    print(f"  🗑️  Removed: {filename}")
-    
-    print(f"✓ Removed {removed_count} old files\n")
-
-def run_exchange_update(exchange, quote_asset, min_volume, futures=False):
-    """Run single exchange update"""
-    cmd = [
-        sys.executable, "main.py",
-        "--exchange", exchange,
-        "--quote-asset", quote_asset,
-        "--min-volume", str(min_volume)
-    ]
-    if futures:
-        cmd.append("--futures")
-    
-    label = f"{exchange} {quote_asset} {'perp' if futures else 'spot'}"
-    
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=180)
-        if result.returncode == 0:
-            # Extract pair count from output
-            output_lines = result.stdout.strip().split('\n')
-            pair_count = 0
-            for line in output_lines:
-                if "Found" in line and "pairs" in line:
-                    try:
-                        pair_count = int(line.split()[1])
-                    except (ValueError, IndexError):
-                        pass
-                    break
-            
-            if pair_count > 0:
-                print(f"✓ {label} ({pair_count} pairs)")
-            else:
-                print(f"○ {label} (0 pairs)")
-            return True, pair_count
-        else:
-            error_msg = result.stderr.strip() or result.stdout.strip()
-            print(f"✗ {label} - {error_msg}")
-            return False, 0
-    except subprocess.TimeoutExpired:
-        print(f"✗ {label} - Timeout")
-        return False, 0
-    except Exception as e:
-        print(f"✗ {label} - {e}")
-        return False, 0
+EXCHANGES = exchange_names(spot=True)
+FUTURES_EXCHANGES = exchange_names(futures=True)  # Exchanges with futures/perpetual support
 
 def update_forex():
     """Update OANDA forex data"""
     print("\n💱 Updating Forex data...")
     try:
-        result = subprocess.run([sys.executable, "oanda.py"], 
-                              cwd="forex", capture_output=True, text=True, timeout=120)
-        if result.returncode == 0:
-            print("✅ OANDA forex data updated")
-            return True
-        else:
-            print(f"❌ OANDA forex failed: {result.stderr}")
-            return False
+        counts = run_oanda()
+        print(f"✅ OANDA forex data updated ({', '.join(f'{n} {t}' for t, n in counts.items())})")
+        return True
     except Exception as e:
         print(f"❌ OANDA forex error: {e}")
         return False
 
 
-def dedupe_volume_buckets():
-    """Ensure symbols only appear in the highest qualifying volume bucket."""
-    print("\n🧹 Deduping volume buckets...")
-    current_date = datetime.now().strftime('%d-%b-%y').lower()
-    seen_symbols = set()
-
-    for volume in sorted(VOLUME_THRESHOLDS, reverse=True):
-        vol_dir = f"output/vol_{get_volume_bucket_label(volume)}"
-        filename_pattern = os.path.join(vol_dir, f"*_pairs_{current_date}.txt")
-        for file_path in sorted(glob.glob(filename_pattern)):
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                    content = f.read().strip()
-                if not content:
-                    continue
-
-                symbols = [line.strip() for line in content.split(',\n') if line.strip()]
-                unique_symbols = [s for s in symbols if s not in seen_symbols]
-
-                if len(unique_symbols) != len(symbols):
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(',\n'.join(unique_symbols))
-                    print(f"  Updated {os.path.basename(file_path)} ({len(unique_symbols)} unique symbols)")
-
-                seen_symbols.update(symbols)
-            except Exception as e:
-                print(f"  Failed to dedupe {file_path}: {e}")
-
-
 def update_stocks():
     """Update stock data"""
     print("\n📈 Updating Stock data...")
@@ -244,7 +152,49 @@ def show_summary():
     print(f"📋 Reports: output/*.md")
     print(f"🎯 TradingView: output/tradingview_master_watchlist.txt + output/crypto_rankings/*/")
 
+def show_timings():
+    """Write the run report and print the slowest spans"""
+    json_path, csv_path = timing.write_report()
+    print(f"\n⏱️  Slowest stages:")
+    for record in timing.timer.slowest(8):
+        label = " ".join(part for part in (record.stage, record.name, record.exchange) if part)
+        print(f"  {record.wall:7.2f}s  {label} ({record.calls} calls, {record.bytes / 1e6:.1f} MB, {record.rate_limited}×429)")
+    print(f"📝 Run report: {json_path} + {csv_path}")
+    if timing.timer.profiles:
+        print(f"🔬 Profiles: {timing.timer.profile_dir}/ (summary.txt)")
+
+def run_market(exchanges, quote_assets, futures, workers, results):
+    """Run one market type across exchanges and return (success, total, pairs).
+
+    Each exchange's result is appended to ``results`` for the membership
+    diff and history stages.
+    """
+    success_count = 0
+    total_count = 0
+    total_pairs = 0
+    for result in run_exchanges(exchanges, quote_assets, VOLUME_THRESHOLDS, futures=futures, workers=workers):
+        print("\n".join(format_result(result)))
+        results.append(result)
+        success_count += len(result.pair_counts)
+        total_count += result.combinations
+        total_pairs += result.total_pairs
+    return success_count, total_count, total_pairs
+
 def main():
+    parser = argparse.ArgumentParser(description='Batch update all exchange data and generate analysis')
+    parser.add_argument('--workers', type=int, default=BATCH_WORKERS,
+                        help=f'Exchanges fetched concurrently (default: {BATCH_WORKERS})')
+    parser.add_argument('--offline', action='store_true', help='Serve every API response from the local cache')
+    parser.add_argument('--max-age', type=float, help='Accept cached API responses up to this many seconds old')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only rebuild market-cap outputs whose volume files or caps changed')
+    parser.add_argument('--profile', action='store_true',
+                        help=f'Write cProfile dumps for the hot stages to {timing.PROFILE_DIR}/')
+    args = parser.parse_args()
+    cache.configure(offline=args.offline, max_age=args.max_age)
+    if args.profile:
+        timing.enable_profiling()
+
     print(f"🚀 Starting batch update at {datetime.now().strftime('%H:%M:%S')}")
     print(f"📊 Crypto Exchanges: {len(EXCHANGES)}")
     print(f"💰 Quote assets: {len(QUOTE_ASSETS)}")  
@@ -254,69 +204,82 @@ def main():
     print(f"📈 Stocks: NYSE, NASDAQ, ARCA")
     print(f"🎯 Total spot combinations: {len(EXCHANGES) * len(QUOTE_ASSETS) * len(VOLUME_THRESHOLDS)}")
     print(f"🎯 Total perpetual combinations: {len(FUTURES_EXCHANGES) * len(FUTURES_QUOTE_ASSETS) * len(VOLUME_THRESHOLDS)}")
+    print(f"🧵 Workers: {args.workers}")
     print("-" * 60)
     
     # Clean old files first
-    clean_old_files()
+    with timing.span("clean", "batch"):
+        clean_old_files()
     
     success_count = 0
     total_count = 0
     total_pairs = 0
+    results = []
     
     try:
-        # Update crypto exchanges (spot)
-        for volume in VOLUME_THRESHOLDS:
-            print(f"\n📊 Volume threshold: {volume:,}")
-            
-            for exchange in EXCHANGES:
-                print(f"\n🏢 Processing {exchange}...")
-                
-                for quote in QUOTE_ASSETS:
-                    total_count += 1
-                    success, pair_count = run_exchange_update(exchange, quote, volume)
-                    if success:
-                        success_count += 1
-                        total_pairs += pair_count
-                    
-                    # Rate limiting
-                    time.sleep(0.5)
-        
-        dedupe_volume_buckets()
+        # Update crypto exchanges (spot): one download per exchange, each symbol
+        # is assigned to its single highest volume bucket from the snapshot
+        with timing.span("spot", "batch"):
+            success, total, pairs = run_market(EXCHANGES, QUOTE_ASSETS, False, args.workers, results)
+        success_count += success
+        total_count += total
+        total_pairs += pairs
         
         # Update crypto exchanges (perpetual futures)
         print(f"\n{'='*50}")
         print(f"🔮 UPDATING PERPETUAL FUTURES (.P) SYMBOLS")
         print(f"{'='*50}")
-        for volume in VOLUME_THRESHOLDS:
-            print(f"\n📊 Volume threshold: {volume:,}")
-            
-            for exchange in FUTURES_EXCHANGES:
-                print(f"\n🏢 Processing {exchange} perpetuals...")
-                
-                for quote in FUTURES_QUOTE_ASSETS:
-                    total_count += 1
-                    success, pair_count = run_exchange_update(exchange, quote, volume, futures=True)
-                    if success:
-                        success_count += 1
-                        total_pairs += pair_count
-                    
-                    # Rate limiting
-                    time.sleep(0.5)
+        with timing.span("perp", "batch"):
+            success, total, pairs = run_market(FUTURES_EXCHANGES, FUTURES_QUOTE_ASSETS, True, args.workers, results)
+        success_count += success
+        total_count += total
+        total_pairs += pairs
+
+        # Analysis reads these counts instead of re-reading every watchlist
+        record_pair_counts({
+            pairs_path(result.exchange, quote_asset, min_volume, result.market_type): count
+            for result in results
+            for (quote_asset, min_volume), count in result.pair_counts.items()
+        })
+
+        print("\n🔁 Diffing watchlist membership...")
+        try:
+            with timing.span("membership", "batch"):
+                membership = {}
+                for result in results:
+                    membership.update(result.membership())
+                changes = record_membership(membership)
+            print("\n".join(format_changes(changes)))
+        except Exception as e:
+            print(f"❌ Membership diff failed: {e}")
 
         print("\n🧭 Building market-cap buckets...")
         try:
-            subprocess.run([sys.executable, "marketcap_bucket.py"], check=True)
+            with timing.span("marketcap", "batch"):
+                run_market_cap_buckets(incremental=args.incremental)
             print("✅ Market-cap buckets created")
-        except subprocess.CalledProcessError as e:
+        except Exception as e:
             print(f"❌ Market-cap bucketing failed: {e}")
-        except FileNotFoundError:
-            print("❌ Market-cap script not found")
+        
+        print("\n🗄️  Recording market history...")
+        try:
+            with timing.span("history", "batch"):
+                buckets = {}
+                for result in results:
+                    buckets.update(result.history_buckets())
+                records = [record for result in results for record in result.records]
+                record_history(records, buckets=buckets)
+            print(f"✅ Recorded {len(records):,} markets in {HISTORY_STORE}")
+        except Exception as e:
+            print(f"❌ History recording failed: {e}")
         
         # Update forex
-        update_forex()
+        with timing.span("forex", "batch"):
+            update_forex()
         
         # Update stocks  
-        update_stocks()
+        with timing.span("stocks", "batch"):
+            update_stocks()
     except KeyboardInterrupt:
         print(f"\n\n⚠️  Interrupted by user!")
         print(f"Progress: {success_count}/{total_count} completed")
@@ -330,14 +293,17 @@ def main():
     # Generate analysis
     print(f"\n📈 Generating analysis...")
     try:
-        subprocess.run([sys.executable, "analysis/visualize.py"], check=True)
+        with timing.span("analysis", "batch"):
+            table = load_pair_counts()
+            generate_charts(table)
+            generate_insights(table)
         print("✅ Analysis complete!")
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         print(f"❌ Analysis failed: {e}")
-    except FileNotFoundError:
-        print("❌ Analysis script not found")
     
-    show_summary()
+    with timing.span("summary", "batch"):
+        show_summary()
+    show_timings()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
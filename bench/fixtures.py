@@ -0,0 +1,469 @@
+"""Deterministic stand-ins for every upstream API the pipeline talks to.
+
+Payloads follow each venue's documented response shape (only the fields the
+adapters read, plus the volume/price fields next to them), generated from one
+seeded coin universe so every run and every machine sees identical data.
+"""
+
+import random
+import re
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from exchanges.markets import KNOWN_QUOTES
+
+DEFAULT_UNIVERSE_SIZE = 400
+DEFAULT_SEED = 7
+
+MAJORS = [
+    ("BTC", 62_000.0), ("ETH", 3_100.0), ("SOL", 150.0), ("XRP", 0.55), ("DOGE", 0.12),
+    ("ADA", 0.40), ("AVAX", 28.0), ("LINK", 13.0), ("DOT", 5.5), ("LTC", 70.0),
+]
+
+# USD value of one unit of each quote asset
+QUOTE_USD = {"USDT": 1.0, "USDC": 1.0, "USD": 1.0, "EUR": 1.08, "BTC": 62_000.0, "ETH": 3_100.0}
+
+# venue -> (spot quotes, share of the universe listed, volume scale)
+VENUES: Dict[str, Tuple[Tuple[str, ...], float, float]] = {
+    "binance": (("USDT", "USDC", "EUR", "BTC", "ETH"), 0.9, 1.0),
+    "bitfinex": (("USD", "USDT", "EUR", "BTC"), 0.35, 0.08),
+    "bitget": (("USDT", "USDC", "BTC", "ETH"), 0.8, 0.4),
+    "bitstamp": (("USD", "EUR", "BTC"), 0.2, 0.05),
+    "bybit": (("USDT", "USDC", "EUR", "BTC"), 0.7, 0.5),
+    "coinbase": (("USD", "USDT", "EUR", "BTC"), 0.45, 0.3),
+    "gateio": (("USDT", "BTC", "ETH"), 0.95, 0.3),
+    "huobi": (("USDT", "BTC", "ETH"), 0.6, 0.2),
+    "kraken": (("USD", "EUR", "USDT", "BTC"), 0.4, 0.1),
+    "kucoin": (("USDT", "USDC", "BTC", "ETH"), 0.85, 0.25),
+    "mexc": (("USDT", "USDC", "BTC"), 1.0, 0.3),
+    "okx": (("USDT", "USDC", "EUR", "BTC"), 0.65, 0.5),
+}
+PERP_VENUES: Dict[str, Tuple[str, ...]] = {
+    "binance": ("USDT", "USDC"),
+    "bitget": ("USDT", "USDC", "USD"),
+    "bybit": ("USDT", "USDC"),
+    "coinbase": ("USDC",),
+    "gateio": ("USDT", "USD"),
+    "kucoin": ("USDT", "USD"),
+    "okx": ("USDT", "USD"),
+    "mexc": ("USDT", "USDC"),
+}
+# Bitget perpetual product types and the quote each one carries
+BITGET_PRODUCT_TYPES = {"USDT-FUTURES": "USDT", "USDC-FUTURES": "USDC", "COIN-FUTURES": "USD"}
+
+OANDA_INSTRUMENTS = {
+    "currency": [
+        f"{base}_{quote}"
+        for base in ("EUR", "GBP", "AUD", "NZD", "USD", "CAD", "CHF")
+        for quote in ("USD", "JPY", "CHF", "CAD", "GBP")
+        if base != quote
+    ],
+    "cfd": ["US30_USD", "SPX500_USD", "NAS100_USD", "DE30_EUR", "UK100_GBP", "JP225_USD", "WTICO_USD", "BCO_USD"],
+    "metal": ["XAU_USD", "XAG_USD", "XPT_USD", "XPD_USD", "XAU_EUR", "XAG_EUR"],
+}
+
+
+@dataclass(frozen=True)
+class Coin:
+    base: str
+    price: float
+    usd_volume: float
+    market_cap: float
+
+
+@dataclass(frozen=True)
+class Listing:
+    base: str
+    quote: str
+    price: float
+    base_volume: float
+    usd_volume: float
+
+
+def synthetic_name(index: int) -> str:
+    letters = ""
+    index += 26 * 26  # at least three letters
+    while index:
+        index, rem = divmod(index, 26)
+        letters = chr(ord("A") + rem) + letters
+    return f"Q{letters}"
+
+
+def build_universe(size: int = DEFAULT_UNIVERSE_SIZE, seed: int = DEFAULT_SEED) -> List[Coin]:
+    """Return ``size`` coins with heavy-tailed volumes spanning every bucket."""
+    rng = random.Random(seed)
+    coins = []
+    for rank, (base, price) in enumerate(MAJORS[:size]):
+        coins.append(Coin(base, price, 5e9 / (rank + 1), 1.2e12 / (rank + 1) ** 1.5))
+
+    index = 0
+    while len(coins) < size:
+        name = synthetic_name(index)
+        index += 1
+        if any(name.endswith(quote) for quote in KNOWN_QUOTES):
+            continue
+        price = 10 ** rng.uniform(-4, 3)
+        usd_volume = 10 ** rng.uniform(3.5, 8.5)
+        coins.append(Coin(name, price, usd_volume, usd_volume * 10 ** rng.uniform(0.5, 2.5)))
+    return coins
+
+
+def venue_listings(universe: List[Coin], venue: str, quotes: Tuple[str, ...], share: float, scale: float, seed: int) -> List[Listing]:
+    rng = random.Random(zlib.crc32(venue.encode()) ^ seed)
+    listings = []
+    for coin in universe:
+        if coin.base not in dict(MAJORS) and rng.random() > share:
+            continue
+        for position, quote in enumerate(quotes):
+            if quote == coin.base or (position > 0 and rng.random() > 0.5 / position):
+                continue
+            usd_volume = coin.usd_volume * scale * rng.uniform(0.3, 1.7) / (position + 1) ** 2
+            price = coin.price / QUOTE_USD[quote]
+            listings.append(Listing(coin.base, quote, price, usd_volume / coin.price, usd_volume))
+    return listings
+
+
+def fmt(value: float) -> str:
+    return f"{value:.8g}"
+
+
+class FixtureSet:
+    """Route table mapping ``<host>/<path>`` plus query/form data to a payload."""
+
+    def __init__(self, size: int = DEFAULT_UNIVERSE_SIZE, seed: int = DEFAULT_SEED):
+        self.universe = build_universe(size, seed)
+        self.spot = {
+            venue: venue_listings(self.universe, venue, quotes, share, scale, seed)
+            for venue, (quotes, share, scale) in VENUES.items()
+        }
+        self.perps = {
+            venue: venue_listings(self.universe, f"{venue}-perp", quotes, VENUES[venue][1] * 0.4, VENUES[venue][2] * 3, seed)
+            for venue, quotes in PERP_VENUES.items()
+        }
+        self.routes = {
+            "api.binance.com/api/v3/ticker/24hr": lambda q: self.binance_tickers(self.spot["binance"]),
+            "api.binance.com/api/v3/exchangeInfo": lambda q: self.binance_info(self.spot["binance"], None),
+            "fapi.binance.com/fapi/v1/ticker/24hr": lambda q: self.binance_tickers(self.perps["binance"]),
+            "fapi.binance.com/fapi/v1/exchangeInfo": lambda q: self.binance_info(self.perps["binance"], "PERPETUAL"),
+            "api-pub.bitfinex.com/v2/tickers": lambda q: self.bitfinex_tickers(),
+            "api.bitget.com/api/spot/v1/public/products": lambda q: self.bitget_products(),
+            "api.bitget.com/api/spot/v1/market/tickers": lambda q: self.bitget_tickers(),
+            "api.bitget.com/api/v2/mix/market/tickers": lambda q: self.bitget_mix_tickers(q.get("productType", "USDT-FUTURES")),
+            "www.bitstamp.net/api/v2/trading-pairs-info/": lambda q: self.bitstamp_pairs(),
+            "www.bitstamp.net/api/v2/ticker/": lambda q: self.bitstamp_tickers(),
+            "api.bybit.com/v5/market/tickers": lambda q: self.bybit_tickers(q.get("category", "spot")),
+            "api.exchange.coinbase.com/products": lambda q: self.coinbase_products(),
+            "api.exchange.coinbase.com/products/stats": lambda q: self.coinbase_bulk_stats(),
+            "api.international.coinbase.com/api/v1/instruments": lambda q: self.coinbase_instruments(),
+            "api.gateio.ws/api/v4/spot/tickers": lambda q: self.gateio_tickers(),
+            "api.gateio.ws/api/v4/futures/usdt/tickers": lambda q: self.gateio_futures_tickers("USDT"),
+            "api.gateio.ws/api/v4/futures/btc/tickers": lambda q: self.gateio_futures_tickers("USD"),
+            "api.huobi.pro/v1/common/symbols": lambda q: self.huobi_symbols(),
+            "api.huobi.pro/market/tickers": lambda q: self.huobi_tickers(),
+            "api.kraken.com/0/public/AssetPairs": lambda q: self.kraken_pairs(),
+            "api.kraken.com/0/public/Ticker": lambda q: self.kraken_tickers(),
+            "api.kucoin.com/api/v1/symbols": lambda q: self.kucoin_symbols(),
+            "api.kucoin.com/api/v1/market/allTickers": lambda q: self.kucoin_tickers(),
+            "api-futures.kucoin.com/api/v1/contracts/active": lambda q: self.kucoin_contracts(),
+            "api.mexc.com/api/v3/ticker/24hr": lambda q: self.mexc_tickers(),
+            "contract.mexc.com/api/v1/contract/ticker": lambda q: self.mexc_contracts(),
+            "www.okx.com/api/v5/public/instruments": lambda q: self.okx_instruments(q.get("instType", "SPOT")),
+            "www.okx.com/api/v5/market/tickers": lambda q: self.okx_tickers(q.get("instType", "SPOT")),
+            "api.coingecko.com/api/v3/coins/markets": self.coingecko_markets,
+            "dashboard.acuitytrading.com/OandaPriceApi/GetPrices": lambda q: self.oanda_prices(q.get("instrumentType", "currency")),
+        }
+
+    def respond(self, path: str, query: Dict[str, str]) -> Optional[Any]:
+        """Return the payload for ``path`` (``host/endpoint``), or None for unknown routes."""
+        path = path.lstrip("/")
+        if path in self.routes:
+            return self.routes[path](query)
+        match = re.fullmatch(r"api\.exchange\.coinbase\.com/products/([^/]+)/stats", path)
+        if match:
+            return self.coinbase_product_stats(match.group(1))
+        return None
+
+    # -- Binance -----------------------------------------------------------------
+
+    @staticmethod
+    def binance_tickers(listings: List[Listing]) -> list:
+        return [
+            {
+                "symbol": f"{l.base}{l.quote}",
+                "lastPrice": fmt(l.price),
+                "volume": fmt(l.base_volume),
+                "quoteVolume": fmt(l.base_volume * l.price),
+            }
+            for l in listings
+        ]
+
+    @staticmethod
+    def binance_info(listings: List[Listing], contract_type: Optional[str]) -> dict:
+        symbols = []
+        for i, l in enumerate(listings):
+            entry = {"symbol": f"{l.base}{l.quote}", "status": "BREAK" if i % 37 == 36 else "TRADING", "baseAsset": l.base, "quoteAsset": l.quote}
+            if contract_type:
+                entry["contractType"] = contract_type
+            symbols.append(entry)
+        return {"timezone": "UTC", "symbols": symbols}
+
+    # -- Bitfinex ----------------------------------------------------------------
+
+    def bitfinex_tickers(self) -> list:
+        rows = [["fUSD", 0.0001, 0.0001, 2, 1000, 0.0001, 2, 1000, 0, 0, 0.0001, 1e6, 0.0002, 0.0001, None, None, 0]]
+        for l in self.spot["bitfinex"]:
+            quote = "UST" if l.quote == "USDT" else l.quote
+            symbol = f"t{l.base}{quote}" if len(l.base) == 3 and len(quote) == 3 else f"t{l.base}:{quote}"
+            rows.append([symbol, l.price, 1.0, l.price, 1.0, 0.0, 0.0, l.price, l.base_volume, l.price * 1.05, l.price * 0.95])
+        return rows
+
+    # -- Bitget ------------------------------------------------------------------
+
+    def bitget_products(self) -> dict:
+        return {"code": "00000", "data": [
+            {"symbol": f"{l.base}{l.quote}_SPBL", "symbolName": f"{l.base}{l.quote}", "baseCoin": l.base, "quoteCoin": l.quote, "status": "online"}
+            for l in self.spot["bitget"]
+        ]}
+
+    def bitget_tickers(self) -> dict:
+        return {"code": "00000", "data": [
+            {"symbol": f"{l.base}{l.quote}", "close": fmt(l.price), "baseVol": fmt(l.base_volume),
+             "quoteVol": fmt(l.base_volume * l.price), "usdtVol": fmt(l.usd_volume)}
+            for l in self.spot["bitget"]
+        ]}
+
+    def bitget_mix_tickers(self, product_type: str) -> dict:
+        quote = BITGET_PRODUCT_TYPES.get(product_type)
+        return {"code": "00000", "msg": "success", "data": [
+            {"symbol": f"{l.base}{'PERP' if quote == 'USDC' else quote}", "lastPr": fmt(l.price),
+             "baseVolume": fmt(l.base_volume), "quoteVolume": fmt(l.base_volume * l.price), "usdtVolume": fmt(l.usd_volume)}
+            for l in self.perps["bitget"] if l.quote == quote
+        ]}
+
+    # -- Bitstamp ----------------------------------------------------------------
+
+    def bitstamp_pairs(self) -> list:
+        return [
+            {"name": f"{l.base}/{l.quote}", "url_symbol": f"{l.base}{l.quote}".lower(), "trading": "Enabled"}
+            for l in self.spot["bitstamp"]
+        ]
+
+    def bitstamp_tickers(self) -> list:
+        return [
+            {"pair": f"{l.base}/{l.quote}", "last": fmt(l.price), "volume": fmt(l.base_volume)}
+            for l in self.spot["bitstamp"]
+        ]
+
+    # -- Bybit -------------------------------------------------------------------
+
+    def bybit_tickers(self, category: str) -> dict:
+        listings = self.perps["bybit"] if category == "linear" else self.spot["bybit"]
+        return {"retCode": 0, "retMsg": "OK", "result": {"category": category, "list": [
+            {"symbol": f"{l.base}{l.quote}", "lastPrice": fmt(l.price), "volume24h": fmt(l.base_volume),
+             "turnover24h": fmt(l.base_volume * l.price)}
+            for l in listings
+        ]}}
+
+    # -- Coinbase ----------------------------------------------------------------
+
+    def coinbase_products(self) -> list:
+        return [
+            {"id": f"{l.base}-{l.quote}", "base_currency": l.base, "quote_currency": l.quote,
+             "status": "delisted" if i % 41 == 40 else "online"}
+            for i, l in enumerate(self.spot["coinbase"])
+        ]
+
+    def coinbase_stats(self, l: Listing) -> dict:
+        return {"open": fmt(l.price * 0.98), "high": fmt(l.price * 1.04), "low": fmt(l.price * 0.95),
+                "last": fmt(l.price), "volume": fmt(l.base_volume)}
+
+    def coinbase_bulk_stats(self) -> dict:
+        return {
+            f"{l.base}-{l.quote}": {"stats_30day": {"volume": fmt(l.base_volume * 30)}, "stats_24hour": self.coinbase_stats(l)}
+            for l in self.spot["coinbase"]
+        }
+
+    def coinbase_product_stats(self, product_id: str) -> Optional[dict]:
+        for l in self.spot["coinbase"]:
+            if f"{l.base}-{l.quote}" == product_id:
+                return self.coinbase_stats(l)
+        return None
+
+    def coinbase_instruments(self) -> list:
+        return [
+            {"symbol": f"{l.base}-PERP", "type": "PERP", "trading_state": "TRADING", "base_asset_name": l.base,
+             "quote_asset_name": l.quote, "notional_24hr": fmt(l.usd_volume), "qty_24hr": fmt(l.base_volume)}
+            for l in self.perps["coinbase"]
+        ]
+
+    # -- Gate.io -----------------------------------------------------------------
+
+    def gateio_tickers(self) -> list:
+        return [
+            {"currency_pair": f"{l.base}_{l.quote}", "last": fmt(l.price), "base_volume": fmt(l.base_volume),
+             "quote_volume": fmt(l.base_volume * l.price)}
+            for l in self.spot["gateio"]
+        ]
+
+    def gateio_futures_tickers(self, quote: str) -> list:
+        return [
+            {"contract": f"{l.base}_{l.quote}", "last": fmt(l.price), "volume_24h": str(round(l.base_volume * 10)),
+             "volume_24h_base": fmt(l.base_volume), "volume_24h_quote": fmt(l.usd_volume)}
+            for l in self.perps["gateio"] if l.quote == quote
+        ]
+
+    # -- Huobi -------------------------------------------------------------------
+
+    def huobi_symbols(self) -> dict:
+        return {"status": "ok", "data": [
+            {"symbol": f"{l.base}{l.quote}".lower(), "base-currency": l.base.lower(), "quote-currency": l.quote.lower(), "state": "online"}
+            for l in self.spot["huobi"]
+        ]}
+
+    def huobi_tickers(self) -> dict:
+        # Huobi's "amount" is base volume and "vol" is quote turnover
+        return {"status": "ok", "data": [
+            {"symbol": f"{l.base}{l.quote}".lower(), "close": l.price, "amount": l.base_volume, "vol": l.base_volume * l.price}
+            for l in self.spot["huobi"]
+        ]}
+
+    # -- Kraken ------------------------------------------------------------------
+
+    KRAKEN_CODES = {"BTC": "XXBT", "ETH": "XETH", "LTC": "XLTC", "XRP": "XXRP", "DOGE": "XXDG", "USD": "ZUSD", "EUR": "ZEUR"}
+
+    def kraken_pair_name(self, l: Listing) -> Tuple[str, str, str]:
+        base = self.KRAKEN_CODES.get(l.base, l.base)
+        quote = self.KRAKEN_CODES.get(l.quote, l.quote)
+        return f"{base}{quote}", base, quote
+
+    def kraken_pairs(self) -> dict:
+        result = {}
+        for l in self.spot["kraken"]:
+            name, base, quote = self.kraken_pair_name(l)
+            result[name] = {"altname": f"{l.base}{l.quote}", "wsname": f"{l.base}/{l.quote}", "base": base, "quote": quote}
+        return {"error": [], "result": result}
+
+    def kraken_tickers(self) -> dict:
+        result = {}
+        for l in self.spot["kraken"]:
+            name = self.kraken_pair_name(l)[0]
+            result[name] = {"c": [fmt(l.price), "1.0"], "v": [fmt(l.base_volume / 2), fmt(l.base_volume)]}
+        return {"error": [], "result": result}
+
+    # -- KuCoin ------------------------------------------------------------------
+
+    def kucoin_symbols(self) -> dict:
+        return {"code": "200000", "data": [
+            {"symbol": f"{l.base}-{l.quote}", "name": f"{l.base}-{l.quote}", "baseCurrency": l.base,
+             "quoteCurrency": l.quote, "enableTrading": True}
+            for l in self.spot["kucoin"]
+        ]}
+
+    def kucoin_tickers(self) -> dict:
+        return {"code": "200000", "data": {"time": 0, "ticker": [
+            {"symbol": f"{l.base}-{l.quote}", "last": fmt(l.price), "vol": fmt(l.base_volume), "volValue": fmt(l.base_volume * l.price)}
+            for l in self.spot["kucoin"]
+        ]}}
+
+    def kucoin_contracts(self) -> dict:
+        # Inverse (USD) contracts report turnover in the base coin
+        return {"code": "200000", "data": [
+            {"symbol": f"{'XBT' if l.base == 'BTC' else l.base}{l.quote}M", "type": "FFWCSX", "status": "Open",
+             "baseCurrency": "XBT" if l.base == "BTC" else l.base, "quoteCurrency": l.quote, "isInverse": l.quote == "USD",
+             "lastTradePrice": l.price, "volumeOf24h": l.base_volume,
+             "turnoverOf24h": l.base_volume if l.quote == "USD" else l.base_volume * l.price}
+            for l in self.perps["kucoin"]
+        ]}
+
+    # -- MEXC --------------------------------------------------------------------
+
+    def mexc_tickers(self) -> list:
+        return [
+            {"symbol": f"{l.base}{l.quote}", "lastPrice": fmt(l.price), "volume": fmt(l.base_volume),
+             "quoteVolume": fmt(l.base_volume * l.price)}
+            for l in self.spot["mexc"]
+        ]
+
+    def mexc_contracts(self) -> dict:
+        # volume24 is in contracts, amount24 is quote turnover
+        return {"success": True, "code": 0, "data": [
+            {"symbol": f"{l.base}_{l.quote}", "lastPrice": l.price, "volume24": round(l.base_volume * 10), "amount24": l.base_volume * l.price}
+            for l in self.perps["mexc"]
+        ]}
+
+    # -- OKX ---------------------------------------------------------------------
+
+    def okx_instruments(self, inst_type: str) -> dict:
+        if inst_type == "SWAP":
+            data = [
+                {"instId": f"{l.base}-{l.quote}-SWAP", "instType": "SWAP", "instFamily": f"{l.base}-{l.quote}",
+                 "settleCcy": l.quote if l.quote != "USD" else l.base, "ctType": "linear" if l.quote != "USD" else "inverse", "state": "live"}
+                for l in self.perps["okx"]
+            ]
+        else:
+            data = [
+                {"instId": f"{l.base}-{l.quote}", "instType": "SPOT", "baseCcy": l.base, "quoteCcy": l.quote, "state": "live"}
+                for l in self.spot["okx"]
+            ]
+        return {"code": "0", "msg": "", "data": data}
+
+    def okx_tickers(self, inst_type: str) -> dict:
+        # SPOT: vol24h is base, volCcy24h is quote volume. SWAP: vol24h is contracts, volCcy24h is base.
+        if inst_type == "SWAP":
+            data = [
+                {"instId": f"{l.base}-{l.quote}-SWAP", "last": fmt(l.price), "vol24h": fmt(l.base_volume * 100), "volCcy24h": fmt(l.base_volume)}
+                for l in self.perps["okx"]
+            ]
+        else:
+            data = [
+                {"instId": f"{l.base}-{l.quote}", "last": fmt(l.price), "vol24h": fmt(l.base_volume), "volCcy24h": fmt(l.base_volume * l.price)}
+                for l in self.spot["okx"]
+            ]
+        return {"code": "0", "msg": "", "data": data}
+
+    # -- CoinGecko / OANDA -------------------------------------------------------
+
+    def coingecko_markets(self, query: Dict[str, str]) -> list:
+        per_page = int(query.get("per_page", 100))
+        page = int(query.get("page", 1))
+        ranked = sorted(self.universe, key=lambda coin: coin.market_cap, reverse=True)
+        return [
+            {"id": coin.base.lower(), "symbol": coin.base.lower(), "name": coin.base.title(),
+             "current_price": coin.price, "market_cap": coin.market_cap, "total_volume": coin.usd_volume}
+            for coin in ranked[(page - 1) * per_page:page * per_page]
+        ]
+
+    @staticmethod
+    def oanda_prices(instrument_type: str) -> list:
+        return [
+            {"Instrument": name, "InstrumentType": instrument_type, "Bid": 1.0, "Ask": 1.0001}
+            for name in OANDA_INSTRUMENTS.get(instrument_type, [])
+        ]
+
+    # -- nasdaqtrader (FTP) ------------------------------------------------------
+
+    def ftp_files(self) -> Dict[str, bytes]:
+        """Return the SymbolDirectory files served by the mock FTP server."""
+        rng = random.Random(DEFAULT_SEED)
+        created = datetime(2026, 10, 18, 17, 31, tzinfo=timezone.utc).strftime("%m%d%Y%H:%M")
+        tickers = [synthetic_name(i)[1:] for i in range(len(self.universe) * 10)]
+
+        nasdaq = ["Symbol|Security Name|Market Category|Test Issue|Financial Status|Round Lot Size|ETF|NextShares"]
+        other = ["ACT Symbol|Security Name|Exchange|CQS Symbol|ETF|Round Lot Size|Test Issue|NASDAQ Symbol"]
+        for i, ticker in enumerate(tickers):
+            is_test = "Y" if i % 53 == 0 else "N"
+            is_etf = "Y" if rng.random() < 0.2 else "N"
+            if i % 2:
+                nasdaq.append(f"{ticker}|{ticker.title()} Inc. - Common Stock|Q|{is_test}|N|100|{is_etf}|N")
+            else:
+                suffix = ".A" if i % 61 == 0 else ""
+                exchange = rng.choice("NPAZ")
+                other.append(f"{ticker}{suffix}|{ticker.title()} Corp. Common Stock|{exchange}|{ticker}|{is_etf}|100|{is_test}|{ticker}")
+        nasdaq.append(f"File Creation Time: {created}|||||||")
+        other.append(f"File Creation Time: {created}|||||||")
+        return {
+            "/SymbolDirectory/nasdaqlisted.txt": ("\r\n".join(nasdaq) + "\r\n").encode(),
+            "/SymbolDirectory/otherlisted.txt": ("\r\n".join(other) + "\r\n").encode(),
+        }
@@ -0,0 +1,197 @@
+"""Offline benchmark for the fetch pipeline.
+
+Starts the mock HTTP/FTP servers from ``bench/server.py``, copies the repo
+into a scratch directory (so ``output/`` here is never touched) and times:
+
+- per stage, in-process: each exchange's spot snapshot and perp run, the
+  full threaded spot run, market-cap bucketing and the OANDA fetch;
+- end to end, as subprocesses: ``main.py``, ``marketcap_bucket.py``,
+  ``forex/oanda.py``, ``stocks/nasdaqtrader.py`` and ``batch_update.py``.
+
+Every stage starts with an empty HTTP cache and cap store. Results can be
+saved as JSON and compared against an earlier run:
+
+    python -m bench.run --repeat 3 --save bench-baseline.json
+    python -m bench.run --repeat 3 --baseline bench-baseline.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from bench.server import add_fault_arguments, start_servers  # noqa: E402
+from config import FUTURES_QUOTE_ASSETS, QUOTE_ASSETS, VOLUME_THRESHOLDS  # noqa: E402
+from exchanges import cache  # noqa: E402
+from exchanges.registry import exchange_names  # noqa: E402
+
+COPY_IGNORE = shutil.ignore_patterns(".git", "output", "__pycache__", "*.pyc", ".venv", "venv")
+# Default regression tolerance when comparing against --baseline
+DEFAULT_THRESHOLD = 0.25
+
+Stage = Tuple[str, Callable[[], None]]
+
+
+def prepare_workdir() -> Path:
+    workdir = Path(tempfile.mkdtemp(prefix="watchlist-bench-"))
+    shutil.copytree(ROOT, workdir, dirs_exist_ok=True, ignore=COPY_IGNORE)
+    return workdir
+
+
+def reset_state(workdir: Path) -> None:
+    """Drop the HTTP cache, cap store and manifests so every stage starts cold."""
+    shutil.rmtree(workdir / "output" / ".cache", ignore_errors=True)
+
+
+@contextmanager
+def inside(workdir: Path):
+    previous = os.getcwd()
+    os.chdir(workdir)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def script(workdir: Path, *args: str, cwd: Optional[Path] = None) -> Callable[[], None]:
+    def run() -> None:
+        subprocess.run([sys.executable, *args], cwd=cwd or workdir, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=1800)
+    return run
+
+
+def in_process_stages() -> List[Stage]:
+    from forex.oanda import run_oanda
+    from marketcap_bucket import build_market_cap_buckets
+    from runner import run_exchanges, run_futures
+    from snapshot import build_snapshot
+
+    stages: List[Stage] = [(f"snapshot:{exchange}", lambda exchange=exchange: build_snapshot(exchange)) for exchange in exchange_names(spot=True)]
+    stages += [
+        (f"perp:{exchange}", lambda exchange=exchange: run_futures(exchange, FUTURES_QUOTE_ASSETS, VOLUME_THRESHOLDS))
+        for exchange in exchange_names(futures=True)
+    ]
+    stages.append(("spot:all", lambda: list(run_exchanges(exchange_names(spot=True), QUOTE_ASSETS, VOLUME_THRESHOLDS))))
+    # Reads the volume files spot:all just wrote
+    stages.append(("marketcap", lambda: build_market_cap_buckets()))
+    # Relative, so the files land in the scratch copy rather than next to this checkout's module
+    stages.append(("forex:oanda", lambda: run_oanda(directory=Path("forex"))))
+    return stages
+
+
+def end_to_end_stages(workdir: Path) -> List[Stage]:
+    return [
+        ("e2e:main.py", script(workdir, "main.py", "--exchange", "binance", "--quote-asset", "USDT", "--min-volume", "1000000")),
+        ("e2e:marketcap_bucket.py", script(workdir, "marketcap_bucket.py")),
+        ("e2e:oanda.py", script(workdir, "oanda.py", cwd=workdir / "forex")),
+        ("e2e:nasdaqtrader.py", script(workdir, "nasdaqtrader.py", cwd=workdir / "stocks")),
+        ("e2e:batch_update.py", script(workdir, "batch_update.py")),
+    ]
+
+
+def time_stage(run: Callable[[], None], workdir: Path, repeat: int, faults) -> dict:
+    timings = []
+    faults.reset()
+    for _ in range(repeat):
+        reset_state(workdir)
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    stats = faults.stats()
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "runs": timings,
+        "requests": stats["requests"] // repeat,
+        "rate_limited": stats["rate_limited"] // repeat,
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Return one line per stage whose median regressed by more than ``threshold``."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before or before["median"] <= 0:
+            continue
+        change = result["median"] / before["median"] - 1
+        if change > threshold:
+            regressions.append(f"{name}: {before['median']:.3f}s → {result['median']:.3f}s (+{change:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the watchlist pipeline against local fixture servers")
+    add_fault_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per stage (default: 1)")
+    parser.add_argument("--only", help="Comma-separated stage name prefixes to run (e.g. snapshot,e2e:main.py)")
+    parser.add_argument("--save", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against a JSON file written by --save")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed median slowdown vs. the baseline (default: {DEFAULT_THRESHOLD:.0%})")
+    args = parser.parse_args()
+
+    http_server, ftp_server = start_servers(args.latency, args.jitter, args.rate_limit_every, args.size, args.seed)
+    os.environ["API_BASE_OVERRIDE"] = http_server.base_url
+    os.environ["NASDAQTRADER_FTP"] = ftp_server.address
+    workdir = prepare_workdir()
+    cache.configure(directory=workdir / "output" / ".cache" / "http")
+
+    print(f"🛰️  Mock APIs on {http_server.base_url}, FTP on {ftp_server.address}")
+    print(f"📂 Scratch tree: {workdir}")
+    print(f"⏱️  latency={args.latency}s jitter={args.jitter}s 429 every={args.rate_limit_every or 'never'} "
+          f"size={args.size} repeat={args.repeat}")
+    print("-" * 72)
+
+    stages = in_process_stages() + end_to_end_stages(workdir)
+    if args.only:
+        prefixes = tuple(prefix.strip() for prefix in args.only.split(","))
+        stages = [(name, run) for name, run in stages if name.startswith(prefixes)]
+
+    results: Dict[str, dict] = {}
+    try:
+        with inside(workdir):
+            for name, run in stages:
+                try:
+                    results[name] = time_stage(run, workdir, max(1, args.repeat), http_server.faults)
+                except Exception as e:
+                    print(f"✗ {name:<28} failed: {e}")
+                    continue
+                result = results[name]
+                print(f"✓ {name:<28} median {result['median']:8.3f}s  min {result['min']:8.3f}s  "
+                      f"{result['requests']:4d} req  {result['rate_limited']:3d}×429")
+    finally:
+        http_server.stop()
+        ftp_server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.save:
+        payload = {"settings": {k: v for k, v in vars(args).items() if k not in ("save", "baseline")}, "stages": results}
+        Path(args.save).write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print(f"\n💾 Saved results to {args.save}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))["stages"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} stage(s) slower than baseline by more than {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\n✅ No stage regressed more than {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
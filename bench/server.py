@@ -0,0 +1,291 @@
+"""Local stand-in for every exchange API and the nasdaqtrader FTP site.
+
+The HTTP server answers ``/<host>/<path>`` with the payloads from
+``bench/fixtures.py``; point the pipeline at it with
+``API_BASE_OVERRIDE=http://127.0.0.1:<port>`` (see ``exchanges/client.py``).
+The FTP server serves the SymbolDirectory files; point
+``stocks/nasdaqtrader.py`` at it with ``NASDAQTRADER_FTP=127.0.0.1:<port>``.
+
+Both can add a fixed latency plus random jitter per request, and the HTTP
+server can answer every Nth request per host with ``429 Too Many Requests``.
+
+Run standalone:
+    python -m bench.server --latency 0.05 --jitter 0.02 --rate-limit-every 25
+"""
+
+import argparse
+import gzip
+import json
+import random
+import socket
+import socketserver
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from bench.fixtures import DEFAULT_SEED, DEFAULT_UNIVERSE_SIZE, FixtureSet
+
+
+class Faults:
+    """Latency, jitter and rate-limit settings shared by both servers."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, rate_limit_every: int = 0, seed: int = DEFAULT_SEED):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_every = rate_limit_every
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests: Counter = Counter()
+        self.rate_limited: Counter = Counter()
+
+    def delay(self) -> None:
+        with self.lock:
+            extra = self.random.uniform(0, self.jitter) if self.jitter else 0.0
+        if self.latency or extra:
+            time.sleep(self.latency + extra)
+
+    def should_rate_limit(self, host: str) -> bool:
+        """Count a request for ``host`` and decide whether to answer it with 429."""
+        with self.lock:
+            self.requests[host] += 1
+            if self.rate_limit_every and self.requests[host] % self.rate_limit_every == 0:
+                self.rate_limited[host] += 1
+                return True
+        return False
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {"requests": sum(self.requests.values()), "rate_limited": sum(self.rate_limited.values())}
+
+    def reset(self) -> None:
+        with self.lock:
+            self.requests.clear()
+            self.rate_limited.clear()
+
+
+class MockHTTPHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "MockExchangeServer"
+
+    def do_GET(self):
+        self.respond({})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        form = dict(parse_qsl(self.rfile.read(length).decode())) if length else {}
+        self.respond(form)
+
+    def respond(self, form: Dict[str, str]) -> None:
+        parts = urlsplit(self.path)
+        host = parts.path.lstrip("/").split("/", 1)[0]
+        query = {**dict(parse_qsl(parts.query)), **form}
+
+        self.server.faults.delay()
+        if self.server.faults.should_rate_limit(host):
+            self.send_body(429, b'{"msg":"Too many requests"}', {"Retry-After": "0"})
+            return
+
+        body = self.server.payload(parts.path, query)
+        if body is None:
+            self.send_body(404, b'{"msg":"Not found"}')
+            return
+        headers = {}
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=1)
+            headers["Content-Encoding"] = "gzip"
+        self.send_body(200, body, headers)
+
+    def send_body(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockExchangeServer(ThreadingHTTPServer):
+    """Threaded HTTP server replaying fixture payloads on 127.0.0.1."""
+
+    daemon_threads = True
+
+    def __init__(self, fixtures: FixtureSet, faults: Faults, port: int = 0):
+        super().__init__(("127.0.0.1", port), MockHTTPHandler)
+        self.fixtures = fixtures
+        self.faults = faults
+        self._encoded: Dict[Tuple[str, Tuple], Optional[bytes]] = {}
+        self._encoded_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def payload(self, path: str, query: Dict[str, str]) -> Optional[bytes]:
+        """Return the encoded fixture for a request (encoded once, then reused)."""
+        key = (path, tuple(sorted(query.items())))
+        with self._encoded_lock:
+            if key not in self._encoded:
+                body = self.fixtures.respond(path, query)
+                self._encoded[key] = None if body is None else json.dumps(body).encode()
+            return self._encoded[key]
+
+    def start(self) -> "MockExchangeServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class MockFTPHandler(socketserver.StreamRequestHandler):
+    """Just enough of RFC 959 for ftplib's login/TYPE/PASV/RETR/SIZE/MDTM."""
+
+    server: "MockFTPServer"
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.reply("220 mock nasdaqtrader FTP")
+        cwd = "/"
+        passive: Optional[socket.socket] = None
+        try:
+            while True:
+                raw = self.rfile.readline()
+                if not raw:
+                    break
+                command, _, argument = raw.decode().strip().partition(" ")
+                command = command.upper()
+                path = argument if argument.startswith("/") else f"{cwd.rstrip('/')}/{argument}"
+
+                if command == "USER":
+                    self.reply("331 Anonymous login ok, send password")
+                elif command == "PASS":
+                    self.reply("230 Logged in")
+                elif command in ("TYPE", "MODE", "STRU", "NOOP"):
+                    self.reply("200 OK")
+                elif command == "PWD":
+                    self.reply(f'257 "{cwd}"')
+                elif command == "CWD":
+                    cwd = path
+                    self.reply("250 OK")
+                elif command == "PASV":
+                    if passive:
+                        passive.close()
+                    passive = socket.create_server(("127.0.0.1", 0))
+                    port = passive.getsockname()[1]
+                    self.reply(f"227 Entering Passive Mode (127,0,0,1,{port >> 8},{port & 0xFF})")
+                elif command == "SIZE":
+                    data = self.server.files.get(path)
+                    self.reply(f"213 {len(data)}" if data is not None else "550 No such file")
+                elif command == "MDTM":
+                    self.reply(f"213 {self.server.modified}" if path in self.server.files else "550 No such file")
+                elif command == "RETR":
+                    data = self.server.files.get(path)
+                    if data is None or passive is None:
+                        self.reply("550 No such file" if data is None else "425 Use PASV first")
+                        continue
+                    self.server.faults.should_rate_limit("ftp")
+                    self.server.faults.delay()
+                    self.reply(f"150 Opening data connection ({len(data)} bytes)")
+                    conn, _ = passive.accept()
+                    with conn:
+                        conn.sendall(data)
+                    passive.close()
+                    passive = None
+                    self.reply("226 Transfer complete")
+                elif command == "QUIT":
+                    self.reply("221 Bye")
+                    break
+                else:
+                    self.reply("502 Command not implemented")
+        finally:
+            if passive:
+                passive.close()
+
+
+class MockFTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, files: Dict[str, bytes], faults: Faults, port: int = 0, modified: str = "20261018173100"):
+        super().__init__(("127.0.0.1", port), MockFTPHandler)
+        self.files = files
+        self.faults = faults
+        self.modified = modified
+
+    @property
+    def address(self) -> str:
+        return f"127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> "MockFTPServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def start_servers(
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    rate_limit_every: int = 0,
+    size: int = DEFAULT_UNIVERSE_SIZE,
+    seed: int = DEFAULT_SEED,
+    http_port: int = 0,
+    ftp_port: int = 0,
+) -> Tuple[MockExchangeServer, MockFTPServer]:
+    """Start the HTTP and FTP stand-ins in background threads."""
+    fixtures = FixtureSet(size, seed)
+    faults = Faults(latency, jitter, rate_limit_every, seed)
+    http_server = MockExchangeServer(fixtures, faults, http_port).start()
+    ftp_server = MockFTPServer(fixtures.ftp_files(), faults, ftp_port).start()
+    return http_server, ftp_server
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request (default: 0)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay of up to this many seconds")
+    parser.add_argument("--rate-limit-every", type=int, default=0,
+                        help="Answer every Nth request per host with 429 (default: never)")
+    parser.add_argument("--size", type=int, default=DEFAULT_UNIVERSE_SIZE,
+                        help=f"Coins in the synthetic universe (default: {DEFAULT_UNIVERSE_SIZE})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Fixture and jitter seed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded exchange fixtures locally")
+    add_fault_arguments(parser)
+    parser.add_argument("--http-port", type=int, default=8765)
+    parser.add_argument("--ftp-port", type=int, default=8021)
+    args = parser.parse_args()
+
+    http_server, ftp_server = start_servers(
+        args.latency, args.jitter, args.rate_limit_every, args.size, args.seed, args.http_port, args.ftp_port
+    )
+    print(f"🛰️  Mock exchange APIs on {http_server.base_url}, FTP on {ftp_server.address}")
+    print(f"   export API_BASE_OVERRIDE={http_server.base_url}")
+    print(f"   export NASDAQTRADER_FTP={ftp_server.address}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(f"\nServed {http_server.faults.stats()}")
+    finally:
+        http_server.stop()
+        ftp_server.stop()
+
+
+if __name__ == "__main__":
+    main()
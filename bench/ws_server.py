@@ -0,0 +1,256 @@
+"""Local replay of the Binance, Bybit and OKX ticker WebSocket channels.
+
+Connections arrive as ``/<host>/<path>`` (see ``route_ws_url`` in
+``exchanges/streaming.py``); point ``stream.py`` at this server with
+``WS_BASE_OVERRIDE=ws://127.0.0.1:<port>`` and at ``bench/server.py`` for
+the REST seed. Volumes start from the same fixtures the REST stand-in
+serves and then random-walk, so symbols drift across volume thresholds.
+
+Run standalone:
+    python -m bench.ws_server --interval 0.5 --volatility 0.05
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import math
+import random
+import socket
+import socketserver
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from bench.fixtures import DEFAULT_SEED, DEFAULT_UNIVERSE_SIZE, FixtureSet, Listing, fmt
+from exchanges.streaming import OP_CLOSE, OP_PING, OP_PONG, OP_TEXT, WS_GUID, FrameReader, WebSocketError, encode_frame
+
+# Share of a feed's symbols that change on every push
+UPDATE_SHARE = 0.2
+
+
+class Feed:
+    """Random-walking 24h volumes for one venue and market type."""
+
+    def __init__(self, listings: List[Listing], volatility: float, seed: int):
+        self.random = random.Random(seed)
+        self.volatility = volatility
+        self.lock = threading.Lock()
+        self.listings = {f"{l.base}{l.quote}": l for l in listings}
+        self.base_volume = {key: l.base_volume for key, l in self.listings.items()}
+
+    def step(self) -> List[str]:
+        """Move a random share of the symbols and return their keys."""
+        with self.lock:
+            keys = [key for key in self.listings if self.random.random() < UPDATE_SHARE]
+            for key in keys:
+                self.base_volume[key] *= math.exp(self.random.gauss(0, self.volatility))
+            return keys
+
+    def ticker(self, key: str) -> Tuple[Listing, float]:
+        with self.lock:
+            return self.listings[key], self.base_volume[key]
+
+
+class WSHandler(socketserver.StreamRequestHandler):
+    server: "MockStreamServer"
+
+    def handle(self):
+        head = b""
+        while b"\r\n\r\n" not in head:
+            chunk = self.request.recv(4096)
+            if not chunk:
+                return
+            head += chunk
+        head, _, rest = head.partition(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        headers = {name.strip().lower(): value.strip() for name, _, value in (line.partition(":") for line in lines[1:])}
+        path = lines[0].split(" ")[1]
+        accept = base64.b64encode(hashlib.sha1((headers.get("sec-websocket-key", "") + WS_GUID).encode()).digest()).decode()
+        self.request.sendall(
+            f"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n".encode()
+        )
+
+        host, _, channel = path.lstrip("/").partition("/")
+        host = host.split(":")[0]
+        self.venue = {"stream.binance.com": "binance", "fstream.binance.com": "binance",
+                      "stream.bybit.com": "bybit", "ws.okx.com": "okx"}.get(host)
+        self.perp = host == "fstream.binance.com" or channel.endswith("linear")
+        self.subscribed: Set[Tuple[str, bool]] = set()
+        if self.venue is None:
+            self.send_frame(b"\x03\xf0", OP_CLOSE)  # 1008: unknown endpoint
+            return
+        if self.venue == "binance":
+            self.subscribed = {(key, self.perp) for key in self.server.feed("binance", self.perp).listings}
+
+        reader = FrameReader(self.request, rest)
+        self.request.settimeout(0.05)
+        next_push = time.monotonic() + self.server.interval
+        try:
+            while not self.server.stopping.is_set():
+                try:
+                    fin, opcode, payload = reader.read_frame()
+                except socket.timeout:
+                    pass
+                else:
+                    if opcode == OP_CLOSE:
+                        self.send_frame(payload[:2], OP_CLOSE)
+                        return
+                    if opcode == OP_PING:
+                        self.send_frame(payload, OP_PONG)
+                    elif opcode == OP_TEXT:
+                        self.on_message(payload.decode())
+                if time.monotonic() >= next_push:
+                    next_push += self.server.interval
+                    self.push()
+        except (OSError, WebSocketError):
+            return
+
+    def send_frame(self, payload: bytes, opcode: int = OP_TEXT) -> None:
+        self.request.sendall(encode_frame(payload, opcode, mask=False))
+
+    def send_json(self, message) -> None:
+        self.send_frame(json.dumps(message).encode())
+
+    def on_message(self, text: str) -> None:
+        if text == "ping":
+            self.send_frame(b"pong")
+            return
+        message = json.loads(text)
+        if self.venue == "bybit":
+            if message.get("op") == "ping":
+                self.send_json({"success": True, "ret_msg": "pong", "op": "ping"})
+            elif message.get("op") == "subscribe":
+                self.send_json({"success": True, "ret_msg": "", "op": "subscribe"})
+                for topic in message.get("args", []):
+                    key = topic.split(".", 1)[1]
+                    if key in self.server.feed("bybit", self.perp).listings:
+                        self.subscribed.add((key, self.perp))
+                        self.send_json(self.bybit_message(key, "snapshot"))
+        elif self.venue == "okx" and message.get("op") == "subscribe":
+            for arg in message.get("args", []):
+                self.send_json({"event": "subscribe", "arg": arg})
+                parts = arg["instId"].split("-")
+                key, perp = "".join(parts[:2]), parts[-1] == "SWAP"
+                if key in self.server.feed("okx", perp).listings:
+                    self.subscribed.add((key, perp))
+                    self.send_json({"arg": arg, "data": [self.okx_ticker(key, perp)]})
+
+    def push(self) -> None:
+        moved = {perp: set(self.server.moved(self.venue, perp)) for perp in {perp for _, perp in self.subscribed}}
+        keys = [(key, perp) for key, perp in sorted(self.subscribed) if key in moved[perp]]
+        if not keys:
+            return
+        if self.venue == "binance":
+            self.send_json([self.binance_ticker(key) for key, _ in keys])
+        elif self.venue == "bybit":
+            for key, _ in keys:
+                self.send_json(self.bybit_message(key, "delta"))
+        else:
+            for key, perp in keys:
+                ticker = self.okx_ticker(key, perp)
+                self.send_json({"arg": {"channel": "tickers", "instId": ticker["instId"]}, "data": [ticker]})
+
+    def binance_ticker(self, key: str) -> dict:
+        listing, base_volume = self.server.feed("binance", self.perp).ticker(key)
+        return {"e": "24hrTicker", "E": int(time.time() * 1000), "s": key, "c": fmt(listing.price),
+                "v": fmt(base_volume), "q": fmt(base_volume * listing.price)}
+
+    def bybit_message(self, key: str, kind: str) -> dict:
+        listing, base_volume = self.server.feed("bybit", self.perp).ticker(key)
+        topic = f"tickers.{key}"
+        return {"topic": topic, "type": kind, "ts": int(time.time() * 1000), "data": {
+            "symbol": key, "lastPrice": fmt(listing.price), "volume24h": fmt(base_volume),
+            "turnover24h": fmt(base_volume * listing.price),
+        }}
+
+    def okx_ticker(self, key: str, perp: bool) -> dict:
+        # Same units as the REST fixture: SPOT volCcy24h in quote, SWAP volCcy24h in base
+        listing, base_volume = self.server.feed("okx", perp).ticker(key)
+        if perp:
+            return {"instId": f"{listing.base}-{listing.quote}-SWAP", "last": fmt(listing.price),
+                    "vol24h": fmt(base_volume * 100), "volCcy24h": fmt(base_volume)}
+        return {"instId": f"{listing.base}-{listing.quote}", "last": fmt(listing.price),
+                "vol24h": fmt(base_volume), "volCcy24h": fmt(base_volume * listing.price)}
+
+
+class MockStreamServer(socketserver.ThreadingTCPServer):
+    """Pushes random-walk ticker updates to every connected client."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, fixtures: FixtureSet, interval: float = 0.5, volatility: float = 0.05,
+                 seed: int = DEFAULT_SEED, port: int = 0):
+        super().__init__(("127.0.0.1", port), WSHandler)
+        self.interval = interval
+        self.stopping = threading.Event()
+        self.feeds: Dict[Tuple[str, bool], Feed] = {}
+        for venue in ("binance", "bybit", "okx"):
+            self.feeds[(venue, False)] = Feed(fixtures.spot[venue], volatility, seed)
+            self.feeds[(venue, True)] = Feed(fixtures.perps[venue], volatility, seed + 1)
+        # Every feed steps once per interval, shared by all connections
+        self._moved: Dict[Tuple[str, bool], Tuple[int, List[str]]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"ws://127.0.0.1:{self.server_address[1]}"
+
+    def feed(self, venue: str, perp: bool) -> Feed:
+        return self.feeds[(venue, perp)]
+
+    def moved(self, venue: str, perp: bool) -> List[str]:
+        """Keys that moved during the current interval (the feed steps on first request)."""
+        tick = int(time.monotonic() / self.interval)
+        with self._lock:
+            last_tick, keys = self._moved.get((venue, perp), (None, []))
+            if last_tick != tick:
+                keys = self.feeds[(venue, perp)].step()
+                self._moved[(venue, perp)] = (tick, keys)
+            return keys
+
+    def start(self) -> "MockStreamServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.stopping.set()
+        self.shutdown()
+        self.server_close()
+
+
+def start_stream_server(interval: float = 0.5, volatility: float = 0.05, size: int = DEFAULT_UNIVERSE_SIZE,
+                        seed: int = DEFAULT_SEED, port: int = 0) -> MockStreamServer:
+    """Start the WebSocket replay in a background thread."""
+    return MockStreamServer(FixtureSet(size, seed), interval, volatility, seed, port).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay exchange ticker WebSocket channels locally")
+    parser.add_argument("--interval", type=float, default=0.5, help="Seconds between pushes (default: 0.5)")
+    parser.add_argument("--volatility", type=float, default=0.05,
+                        help="Std. dev. of the log volume change per push (default: 0.05)")
+    parser.add_argument("--size", type=int, default=DEFAULT_UNIVERSE_SIZE,
+                        help=f"Coins in the synthetic universe (default: {DEFAULT_UNIVERSE_SIZE})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Fixture and random-walk seed")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    server = start_stream_server(args.interval, args.volatility, args.size, args.seed, args.port)
+    print(f"📡 Mock ticker streams on {server.base_url}")
+    print(f"   export WS_BASE_OVERRIDE={server.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
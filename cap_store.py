@@ -0,0 +1,198 @@
+"""Persistent CoinGecko market-cap store with per-symbol freshness.
+
+Caps are kept in SQLite together with the /coins/markets page they came
+from and when they were fetched. A run only re-downloads the pages that
+hold stale symbols it actually needs, so a warm store answers without
+touching the network.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from config import MARKET_CAP_MAX_AGE, MARKET_CAP_RESCAN_AGE, MARKET_CAP_STORE
+
+# page number -> list of CoinGecko coin dicts
+PageFetcher = Callable[[int], List[dict]]
+
+
+class MarketCapStore:
+    def __init__(self, path: Path = Path(MARKET_CAP_STORE)):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path))
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS caps (
+                symbol TEXT PRIMARY KEY,
+                market_cap REAL NOT NULL,
+                page INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                checked_at REAL NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS scans (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                fetched_at REAL NOT NULL
+            );
+            """
+        )
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(caps)")}
+        if "checked_at" not in columns:
+            # Stores written before page checks were tracked separately
+            self.connection.execute("ALTER TABLE caps ADD COLUMN checked_at REAL NOT NULL DEFAULT 0")
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "MarketCapStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def lookup(self, symbols: Iterable[str]) -> Dict[str, Tuple[float, int, float, float]]:
+        """Return symbol -> (market_cap, page, fetched_at, checked_at) for stored symbols."""
+        found: Dict[str, Tuple[float, int, float, float]] = {}
+        symbols = list(symbols)
+        for start in range(0, len(symbols), 500):
+            chunk = symbols[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.connection.execute(
+                f"SELECT symbol, market_cap, page, fetched_at, checked_at FROM caps WHERE symbol IN ({placeholders})",
+                chunk,
+            )
+            for symbol, market_cap, page, fetched_at, checked_at in rows:
+                found[symbol] = (market_cap, page, fetched_at, checked_at)
+        return found
+
+    def record_page(self, page: int, coins: List[dict], fetched_at: float) -> Optional[float]:
+        """Store one /coins/markets page and return its smallest market cap.
+
+        Several coins can share a ticker; like fetch_market_caps, the largest
+        cap seen during the same refresh wins.
+        """
+        page_caps: Dict[str, float] = {}
+        page_min_cap: Optional[float] = None
+        for coin in coins:
+            symbol = str(coin.get("symbol", "")).strip().lower()
+            market_cap = coin.get("market_cap")
+            if not symbol or market_cap is None:
+                continue
+            market_cap = float(market_cap)
+            if page_min_cap is None or market_cap < page_min_cap:
+                page_min_cap = market_cap
+            if market_cap > page_caps.get(symbol, -1.0):
+                page_caps[symbol] = market_cap
+
+        with self.connection:
+            self.connection.executemany(
+                """
+                INSERT INTO caps (symbol, market_cap, page, fetched_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(symbol) DO UPDATE SET
+                    market_cap = CASE
+                        WHEN caps.fetched_at = excluded.fetched_at AND caps.market_cap >= excluded.market_cap
+                        THEN caps.market_cap ELSE excluded.market_cap END,
+                    page = CASE
+                        WHEN caps.fetched_at = excluded.fetched_at AND caps.market_cap >= excluded.market_cap
+                        THEN caps.page ELSE excluded.page END,
+                    fetched_at = excluded.fetched_at
+                """,
+                [(symbol, cap, page, fetched_at) for symbol, cap in page_caps.items()],
+            )
+        return page_min_cap
+
+    def mark_checked(self, symbols: Iterable[str], checked_at: float) -> None:
+        """Note that the pages around ``symbols`` were searched at ``checked_at`` without finding them."""
+        with self.connection:
+            self.connection.executemany(
+                "UPDATE caps SET checked_at = ? WHERE symbol = ?",
+                [(checked_at, symbol) for symbol in symbols],
+            )
+
+    def last_full_scan(self) -> float:
+        row = self.connection.execute("SELECT fetched_at FROM scans WHERE id = 1").fetchone()
+        return row[0] if row else 0.0
+
+    def record_full_scan(self, fetched_at: float) -> None:
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO scans (id, fetched_at) VALUES (1, ?) ON CONFLICT(id) DO UPDATE SET fetched_at = excluded.fetched_at",
+                (fetched_at,),
+            )
+
+    def full_scan(self, fetch_page: PageFetcher, min_cap: float, page_size: int) -> int:
+        """Walk the ranked list until caps drop below ``min_cap``; return pages fetched.
+
+        Symbols the scan did not see (delisted, or now below ``min_cap``) are dropped.
+        """
+        fetched_at = time.time()
+        page = 1
+        while True:
+            coins = fetch_page(page)
+            if not coins:
+                break
+            page_min_cap = self.record_page(page, coins, fetched_at)
+            if page_min_cap is not None and page_min_cap < min_cap:
+                break
+            if len(coins) < page_size:
+                break
+            page += 1
+        with self.connection:
+            self.connection.execute("DELETE FROM caps WHERE fetched_at < ?", (fetched_at,))
+        self.record_full_scan(fetched_at)
+        return page
+
+
+def load_market_caps(
+    symbols: Iterable[str],
+    fetch_page: PageFetcher,
+    min_cap: float,
+    page_size: int,
+    max_age: float = MARKET_CAP_MAX_AGE,
+    rescan_age: float = MARKET_CAP_RESCAN_AGE,
+    store_path: Path = Path(MARKET_CAP_STORE),
+) -> Dict[str, float]:
+    """Return lowercase symbol -> market cap for ``symbols``, refreshing only what is stale.
+
+    - No full scan within ``rescan_age``: walk the whole ranked list once.
+    - Otherwise re-fetch just the pages holding needed symbols older than
+      ``max_age`` (plus their neighbours for symbols whose rank moved).
+      Symbols found on neither are searched again only after another ``max_age``.
+    - Symbols missing from a recent full scan are treated as below ``min_cap``.
+
+    Only caps fetched within ``max_age`` and since the last full scan are returned.
+    """
+    needed: Set[str] = {symbol.lower() for symbol in symbols if symbol}
+    with MarketCapStore(store_path) as store:
+        now = time.time()
+        if now - store.last_full_scan() > rescan_age:
+            store.full_scan(fetch_page, min_cap, page_size)
+        else:
+            refreshed: Set[int] = set()
+            for attempt in range(3):
+                known = store.lookup(needed)
+                stale = {
+                    symbol: info for symbol, info in known.items()
+                    if now - info[2] > max_age and now - info[3] > max_age
+                }
+                if not stale:
+                    break
+                if attempt == 2:
+                    # Not on its page or the neighbours (delisted, or moved further):
+                    # search again after max_age, not on every call
+                    store.mark_checked(stale, time.time())
+                    break
+                if attempt == 0:
+                    pages = {page for _, page, _, _ in stale.values()}
+                else:
+                    # Still stale: the coin moved off its old page, try the neighbours once
+                    pages = {p for _, page, _, _ in stale.values() for p in (page - 1, page + 1) if p >= 1}
+                refresh_at = time.time()
+                for page in sorted(pages - refreshed):
+                    store.record_page(page, fetch_page(page), refresh_at)
+                    refreshed.add(page)
+
+        oldest = max(store.last_full_scan(), now - max_age)
+        return {symbol: info[0] for symbol, info in store.lookup(needed).items() if info[2] >= oldest}
@@ -1,8 +1,16 @@
 """Shared constants for volume buckets and thresholds."""
 
+from bisect import bisect_right
+from typing import Optional, Sequence
+
 # Minimum 24h volume thresholds (in USD)
 VOLUME_THRESHOLDS: list[int] = [500_000, 1_000_000, 5_000_000]
 
+# Quote assets fetched per exchange (batch_update.py, watch.py, stream.py)
+QUOTE_ASSETS: list[str] = ["USDT", "EUR", "USD", "BTC", "ETH"]
+# Perpetuals: USDT/USDC-margined, USD = inverse (coin-margined)
+FUTURES_QUOTE_ASSETS: list[str] = ["USDT", "USDC", "USD"]
+
 # Human-readable bucket labels keyed by min_volume
 VOLUME_BUCKET_LABELS: dict[int, str] = {
     500_000: '500K-1000K',
@@ -25,6 +33,19 @@ def get_volume_bucket_label(min_volume: float) -> str:
         return f"{int(min_volume / 1000)}K"
 
 
+def assign_volume_bucket(usd_volume: Optional[float], thresholds: Sequence[float] = VOLUME_THRESHOLDS) -> Optional[float]:
+    """Return the single (highest) threshold a 24h USD volume qualifies for.
+
+    Returns None below the lowest threshold, and for symbols whose volume
+    could not be priced in USD.
+    """
+    if usd_volume is None:
+        return None
+    thresholds = sorted(thresholds)
+    index = bisect_right(thresholds, usd_volume)
+    return thresholds[index - 1] if index else None
+
+
 def parse_volume_bucket(bucket_label: str) -> int:
     """Parse a directory label like '500K-1000K' or '5M+' back to the min threshold."""
     if bucket_label in LABEL_TO_VOLUME:
@@ -34,3 +55,71 @@ def parse_volume_bucket(bucket_label: str) -> int:
     if '-' in bucket_label:
         return int(bucket_label.split('-')[0].replace('M', '000000').replace('K', '000'))
     return int(bucket_label.replace('M', '000000').replace('K', '000'))
+
+
+# Default number of exchanges fetched concurrently by batch_update.py
+BATCH_WORKERS: int = 4
+
+# Worker processes used to render analysis charts (analysis/charts.py)
+CHART_WORKERS: int = 4
+
+# Threads writing the ranking reports and per-exchange files (marketcap_bucket.py)
+REPORT_WORKERS: int = 8
+
+# Per-exchange request budget (requests per second), enforced on every HTTP call
+# made through exchanges/client.py. Each exchange gets its own token bucket, so a
+# slow venue never throttles the others.
+DEFAULT_RATE_LIMIT: float = 2.0
+RATE_LIMITS: dict[str, float] = {
+    'binance': 5.0,
+    'bybit': 5.0,
+    'okx': 5.0,
+    'coinbase': 8.0,
+    'kraken': 1.0,
+    'bitfinex': 1.0,
+    # CoinGecko's public API allows roughly 30 calls per minute
+    'coingecko': 0.5,
+}
+
+# On-disk HTTP cache used by exchanges/client.py (see exchanges/cache.py).
+# TTLs are in seconds: tickers go stale quickly, instrument metadata rarely changes.
+HTTP_CACHE_DIR: str = 'output/.cache/http'
+TICKER_TTL: int = 60
+METADATA_TTL: int = 6 * 3600
+MARKET_CAP_TTL: int = 3600
+
+# Persistent CoinGecko market-cap store (see cap_store.py).
+# Symbols older than MARKET_CAP_MAX_AGE have just their page re-fetched; the
+# full top-list scan that discovers new listings only runs every MARKET_CAP_RESCAN_AGE.
+MARKET_CAP_STORE: str = 'output/.cache/market_caps.sqlite'
+MARKET_CAP_MAX_AGE: int = 24 * 3600
+MARKET_CAP_RESCAN_AGE: int = 7 * 24 * 3600
+
+# Last stored membership of every watchlist, diffed after each run (see membership.py)
+MEMBERSHIP_STORE: str = 'output/.cache/membership.sqlite'
+
+# Every batch run's market snapshot is appended here (see history.py); unlike the
+# dated watchlists it is never cleaned up
+HISTORY_STORE: str = 'output/history.sqlite'
+
+# Watch mode (watch.py): seconds between ticker refreshes per exchange, with
+# per-exchange overrides. Intervals below TICKER_TTL are served from the cache.
+# Failed refreshes retry after WATCH_RETRY_DELAY, doubling up to WATCH_MAX_BACKOFF.
+WATCH_INTERVAL: int = 300
+WATCH_INTERVALS: dict[str, int] = {
+    'kraken': 600,
+    'bitfinex': 600,
+    'bitstamp': 900,
+}
+WATCH_RETRY_DELAY: int = 30
+WATCH_MAX_BACKOFF: int = 1800
+WATCH_STATUS_PATH: str = 'output/watch_status.json'
+
+# Streaming mode (stream.py): a symbol only changes volume bucket once it is
+# STREAM_HYSTERESIS (a fraction) past the threshold, so symbols hovering
+# around a boundary do not flap. Changed watchlists are flushed at most
+# every STREAM_FLUSH_INTERVAL seconds.
+STREAM_HYSTERESIS: float = 0.1
+STREAM_FLUSH_INTERVAL: float = 0.5
+STREAM_RETRY_DELAY: float = 1.0
+STREAM_MAX_BACKOFF: float = 60.0
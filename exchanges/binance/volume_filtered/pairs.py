@@ -1,72 +1,75 @@
 import requests
 from typing import List
 
-def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
-    """Fetch Binance spot trading symbols with volume filter."""
-    try:
-        response_tickers = requests.get('https://api.binance.com/api/v3/ticker/24hr')
-        response_info = requests.get('https://api.binance.com/api/v3/exchangeInfo')
+from config import METADATA_TTL
+from exchanges.client import fetch_all
+from exchanges.markets import MarketRecord, filter_symbols, normalize_usd_volumes, to_float
 
-        response_tickers.raise_for_status()
-        response_info.raise_for_status()
 
-        tickers = {t['symbol']: t for t in response_tickers.json()}
-        symbols_info = response_info.json()['symbols']
+def fetch_spot_markets() -> List[MarketRecord]:
+    """Fetch every trading Binance spot market with its 24h volume in USD."""
+    tickers_data, info_data = fetch_all([
+        'https://api.binance.com/api/v3/ticker/24hr',
+        {'url': 'https://api.binance.com/api/v3/exchangeInfo', 'ttl': METADATA_TTL},
+    ], exchange='binance')
 
-        symbols = []
-        for s in symbols_info:
-            if s['status'] != 'TRADING':
-                continue
+    tickers = {t['symbol']: t for t in tickers_data}
+    symbols_info = info_data['symbols']
 
-            if quote_asset and s['quoteAsset'] != quote_asset:
-                continue
+    rows = []
+    for s in symbols_info:
+        if s['status'] != 'TRADING':
+            continue
 
-            ticker = tickers.get(s['symbol'], {})
-            if min_volume and float(ticker.get('quoteVolume', 0)) < min_volume:
-                continue
+        ticker = tickers.get(s['symbol'], {})
+        rows.append(MarketRecord(
+            'binance', s['baseAsset'], s['quoteAsset'], f"BINANCE:{s['symbol']}",
+            quote_volume=float(ticker.get('quoteVolume', 0)),
+            last_price=to_float(ticker.get('lastPrice')),
+        ))
 
-            symbols.append(f"BINANCE:{s['symbol']}")
+    return normalize_usd_volumes(rows)
 
-        return symbols
+
+def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
+    """Fetch Binance spot trading symbols with volume filter."""
+    try:
+        return filter_symbols(fetch_spot_markets(), quote_asset, min_volume)
 
     except requests.RequestException as e:
         print(f"Error fetching data from Binance API: {e}")
         return []
 
 
-def get_futures_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
-    """Fetch Binance USDⓈ-M perpetual futures symbols with volume filter.
-    
-    Returns TradingView-format perpetual symbols with .P suffix,
+def fetch_futures_markets() -> List[MarketRecord]:
+    """Fetch every trading Binance USDⓈ-M perpetual with its 24h volume in USD.
+
+    Records carry TradingView-format perpetual symbols with a .P suffix,
     e.g. BINANCE:BTCUSDT.P
     """
-    try:
-        response_tickers = requests.get('https://fapi.binance.com/fapi/v1/ticker/24hr')
-        response_info = requests.get('https://fapi.binance.com/fapi/v1/exchangeInfo')
-
-        response_tickers.raise_for_status()
-        response_info.raise_for_status()
-
-        tickers = {t['symbol']: t for t in response_tickers.json()}
-        symbols_info = response_info.json()['symbols']
-
-        symbols = []
-        for s in symbols_info:
-            if s['status'] != 'TRADING':
-                continue
-            if s.get('contractType') != 'PERPETUAL':
-                continue
+    tickers_data, info_data = fetch_all([
+        'https://fapi.binance.com/fapi/v1/ticker/24hr',
+        {'url': 'https://fapi.binance.com/fapi/v1/exchangeInfo', 'ttl': METADATA_TTL},
+    ], exchange='binance')
+    tickers = {t['symbol']: t for t in tickers_data}
+
+    rows = []
+    for s in info_data['symbols']:
+        if s['status'] != 'TRADING' or s.get('contractType') != 'PERPETUAL':
+            continue
+        ticker = tickers.get(s['symbol'], {})
+        rows.append(MarketRecord(
+            'binance', s['baseAsset'], s['quoteAsset'], f"BINANCE:{s['symbol']}.P",
+            quote_volume=float(ticker.get('quoteVolume', 0)),
+            last_price=to_float(ticker.get('lastPrice')), market_type='perp',
+        ))
+    return normalize_usd_volumes(rows)
 
-            if quote_asset and s['quoteAsset'] != quote_asset:
-                continue
 
-            ticker = tickers.get(s['symbol'], {})
-            if min_volume and float(ticker.get('quoteVolume', 0)) < min_volume:
-                continue
-
-            symbols.append(f"BINANCE:{s['symbol']}.P")
-
-        return symbols
+def get_futures_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
+    """Fetch Binance USDⓈ-M perpetual futures symbols with volume filter."""
+    try:
+        return filter_symbols(fetch_futures_markets(), quote_asset, min_volume)
 
     except requests.RequestException as e:
         print(f"Error fetching data from Binance Futures API: {e}")
@@ -0,0 +1,36 @@
+"""Binance all-market ticker streams (``!ticker@arr``)."""
+
+from typing import Any, Iterable
+
+from exchanges.binance.volume_filtered.pairs import fetch_futures_markets, fetch_spot_markets
+from exchanges.markets import split_symbol, to_float
+from exchanges.streaming import StreamSpec, TickerUpdate
+
+SPOT_STREAM_URL = 'wss://stream.binance.com:9443/ws/!ticker@arr'
+FUTURES_STREAM_URL = 'wss://fstream.binance.com/ws/!ticker@arr'
+
+
+def parse_spot(message: Any) -> Iterable[TickerUpdate]:
+    if not isinstance(message, list):
+        return
+    for ticker in message:
+        base, quote = split_symbol(ticker['s'])
+        # 'q' is the rolling 24h quote volume, as quoteVolume is for the REST adapter
+        yield f"BINANCE:{ticker['s']}", base, quote, to_float(ticker.get('q')), to_float(ticker.get('c'))
+
+
+def parse_futures(message: Any) -> Iterable[TickerUpdate]:
+    if not isinstance(message, list):
+        return
+    for ticker in message:
+        # Delivery contracts (BTCUSDT_250926) share the stream; keep perpetuals only
+        if '_' in ticker['s']:
+            continue
+        base, quote = split_symbol(ticker['s'])
+        yield f"BINANCE:{ticker['s']}.P", base, quote, to_float(ticker.get('q')), to_float(ticker.get('c'))
+
+
+def stream_spec(market_type: str = 'spot') -> StreamSpec:
+    if market_type == 'perp':
+        return StreamSpec('binance', 'perp', FUTURES_STREAM_URL, parse_futures, seed=fetch_futures_markets)
+    return StreamSpec('binance', 'spot', SPOT_STREAM_URL, parse_spot, seed=fetch_spot_markets)
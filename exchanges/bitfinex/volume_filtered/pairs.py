@@ -1,20 +1,31 @@
-import requests
 from typing import List
 
-def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
-    response = requests.get('https://api-pub.bitfinex.com/v2/tickers?symbols=ALL')
-    response.raise_for_status()
-    
-    symbols = []
-    for ticker in response.json():
+from exchanges.client import get_json
+from exchanges.markets import MarketRecord, filter_symbols, normalize_usd_volumes, split_symbol, to_float
+
+
+def fetch_spot_markets() -> List[MarketRecord]:
+    """Fetch every Bitfinex trading pair with its 24h volume in USD."""
+    rows = []
+    for ticker in get_json('https://api-pub.bitfinex.com/v2/tickers', params={'symbols': 'ALL'}, exchange='bitfinex'):
         if not ticker[0].startswith('t'):
             continue
-            
+
         symbol = ticker[0][1:]  # Remove 't' prefix
-        if quote_asset:
-            if symbol.endswith(quote_asset):
-                symbols.append(f'BITFINEX:{symbol}')
+        if ':' in symbol:
+            base, quote = symbol.split(':', 1)
         else:
-            symbols.append(f'BITFINEX:{symbol}')
-    
-    return symbols
+            base, quote = split_symbol(symbol)
+        # [SYMBOL, BID, BID_SIZE, ASK, ASK_SIZE, DAILY_CHANGE, DAILY_CHANGE_RELATIVE, LAST_PRICE, VOLUME, ...]; VOLUME is in base units
+        last_price = to_float(ticker[7])
+        volume = to_float(ticker[8])
+        rows.append(MarketRecord(
+            'bitfinex', base, quote, f'BITFINEX:{symbol}', last_price=last_price,
+            quote_volume=volume * last_price if volume is not None and last_price is not None else None,
+        ))
+
+    return normalize_usd_volumes(rows)
+
+
+def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
+    return filter_symbols(fetch_spot_markets(), quote_asset, min_volume)
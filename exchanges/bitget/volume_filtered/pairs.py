@@ -2,36 +2,83 @@ import os
 import requests
 from typing import List
 
-def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
+from config import METADATA_TTL
+from exchanges.client import fetch_all
+from exchanges.markets import MarketRecord, filter_symbols, normalize_usd_volumes, to_float
+
+
+def fetch_spot_markets() -> List[MarketRecord]:
+    """Fetch every Bitget spot product with its 24h USDT volume (reported by Bitget for every quote)."""
     base_products = os.getenv('BITGET_SPOT_PRODUCTS_API', 'https://api.bitget.com/api/spot/v1/public/products')
     base_tickers = os.getenv('BITGET_SPOT_TICKERS_API', 'https://api.bitget.com/api/spot/v1/market/tickers')
 
-    with requests.Session() as session:
-        products = session.get(base_products, timeout=15)
-        tickers = session.get(base_tickers, timeout=15)
-
-        try:
-            products.raise_for_status()
-            tickers.raise_for_status()
-        except requests.RequestException as e:
-            print(f"Bitget API error: {e}")
-            return []
+    products, tickers = fetch_all([{'url': base_products, 'ttl': METADATA_TTL}, base_tickers], exchange='bitget')
 
-        pairs = products.json().get('data', [])
-        volumes = {t['symbol']: float(t.get('usdtVol', 0) or 0) for t in tickers.json().get('data', [])}
+    pairs = products.get('data', [])
+    tickers = {t['symbol']: t for t in tickers.get('data', [])}
 
-    symbols = []
+    rows = []
     for pair in pairs:
         symbol = f"{pair['baseCoin']}{pair['quoteCoin']}"
-        volume = volumes.get(symbol, 0)
+        ticker = tickers.get(symbol, {})
+        rows.append(MarketRecord(
+            'bitget', pair['baseCoin'], pair['quoteCoin'], f'BITGET:{symbol}',
+            usd_volume=float(ticker.get('usdtVol', 0) or 0),
+            last_price=to_float(ticker.get('close')),
+        ))
+
+    return rows
+
+
+def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
+    try:
+        return filter_symbols(fetch_spot_markets(), quote_asset, min_volume)
+    except requests.RequestException as e:
+        print(f"Bitget API error: {e}")
+        return []
+
+
+# productType -> (quote asset, symbol suffix); USDC perpetuals are listed as BTCPERP
+FUTURES_PRODUCT_TYPES = {
+    'USDT-FUTURES': ('USDT', 'USDT'),
+    'USDC-FUTURES': ('USDC', 'PERP'),
+    'COIN-FUTURES': ('USD', 'USD'),
+}
+
+
+def fetch_futures_markets() -> List[MarketRecord]:
+    """Fetch every Bitget USDT-M, USDC-M and coin-M perpetual with its 24h volume in USD.
+
+    Records carry TradingView-format perpetual symbols with a .P suffix,
+    e.g. BITGET:BTCUSDT.P
+    """
+    url = os.getenv('BITGET_MIX_TICKERS_API', 'https://api.bitget.com/api/v2/mix/market/tickers')
+    responses = fetch_all(
+        [{'url': url, 'params': {'productType': product_type}} for product_type in FUTURES_PRODUCT_TYPES],
+        exchange='bitget',
+    )
 
-        if min_volume and volume < min_volume:
-            continue
+    rows = []
+    for (quote, suffix), response in zip(FUTURES_PRODUCT_TYPES.values(), responses):
+        for ticker in response.get('data', []):
+            symbol = ticker['symbol']
+            # Delivery contracts (BTCUSD_251226) share the coin-M product type
+            if not symbol.endswith(suffix) or '_' in symbol:
+                continue
+            last_price = to_float(ticker.get('lastPr'))
+            base_volume = to_float(ticker.get('baseVolume'))
+            rows.append(MarketRecord(
+                'bitget', symbol[:-len(suffix)], quote, f'BITGET:{symbol}.P',
+                # No price means volume unknown, not zero
+                quote_volume=base_volume * last_price if base_volume is not None and last_price is not None else None,
+                last_price=last_price, market_type='perp',
+            ))
+    return normalize_usd_volumes(rows)
 
-        if quote_asset:
-            if pair['quoteCoin'] == quote_asset:
-                symbols.append(f'BITGET:{symbol}')
-        else:
-            symbols.append(f'BITGET:{symbol}')
 
-    return symbols
+def get_futures_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
+    try:
+        return filter_symbols(fetch_futures_markets(), quote_asset, min_volume)
+    except requests.RequestException as e:
+        print(f"Bitget futures API error: {e}")
+        return []
@@ -1,21 +1,34 @@
-import requests
 from typing import List
 
-def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
-    response = requests.get('https://www.bitstamp.net/api/v2/trading-pairs-info/')
-    response.raise_for_status()
-    pairs = response.json()
-    
-    symbols = []
+from config import METADATA_TTL
+from exchanges.client import fetch_all
+from exchanges.markets import MarketRecord, filter_symbols, normalize_usd_volumes, to_float
+
+
+def fetch_spot_markets() -> List[MarketRecord]:
+    """Fetch every enabled Bitstamp trading pair with its 24h volume in USD."""
+    pairs, tickers_data = fetch_all([
+        {'url': 'https://www.bitstamp.net/api/v2/trading-pairs-info/', 'ttl': METADATA_TTL},
+        'https://www.bitstamp.net/api/v2/ticker/',
+    ], exchange='bitstamp')
+    tickers = {t['pair']: t for t in tickers_data}
+
+    rows = []
     for pair in pairs:
-        symbol = pair['url_symbol']
-        if len(symbol) >= 6:
-            base = symbol[:-3]
-            quote = symbol[-3:]
-            if quote_asset:
-                if quote.upper() == quote_asset:
-                    symbols.append(f'BITSTAMP:{base.upper()}{quote.upper()}')
-            else:
-                symbols.append(f'BITSTAMP:{base.upper()}{quote.upper()}')
-    
-    return symbols
+        if pair.get('trading', 'Enabled') != 'Enabled' or '/' not in pair['name']:
+            continue
+        # "BTC/USDT"; url_symbol has no separator, so its last three letters are not always the quote
+        base, quote = pair['name'].split('/', 1)
+        ticker = tickers.get(pair['name'], {})
+        last_price = to_float(ticker.get('last'))
+        volume = to_float(ticker.get('volume'))  # base units
+        rows.append(MarketRecord(
+            'bitstamp', base, quote, f'BITSTAMP:{base.upper()}{quote.upper()}', last_price=last_price,
+            quote_volume=volume * last_price if volume is not None and last_price is not None else None,
+        ))
+
+    return normalize_usd_volumes(rows)
+
+
+def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
+    return filter_symbols(fetch_spot_markets(), quote_asset, min_volume)
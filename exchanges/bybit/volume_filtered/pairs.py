@@ -1,51 +1,54 @@
-import requests
 from typing import List
 
-def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
-    """Fetch Bybit spot trading symbols with volume filter."""
+from exchanges.client import get_json
+from exchanges.markets import MarketRecord, filter_symbols, normalize_usd_volumes, split_symbol
+
+
+def fetch_spot_markets() -> List[MarketRecord]:
+    """Fetch every Bybit spot ticker with its 24h volume in USD."""
     url = 'https://api.bybit.com/v5/market/tickers'
     params = {'category': 'spot'}
-    
-    response = requests.get(url, params=params)
-    response.raise_for_status()
-    
-    symbols = []
-    for item in response.json()['result']['list']:
-        volume = float(item['volume24h']) * float(item['lastPrice'])  # Convert to USD volume
-        
-        if min_volume and volume < min_volume:
-            continue
-            
-        if quote_asset and not item['symbol'].endswith(quote_asset.upper()):
-            continue
-            
-        symbols.append(f"BYBIT:{item['symbol']}")
-    
-    return sorted(symbols)
 
+    rows = []
+    for item in get_json(url, params=params, exchange='bybit')['result']['list']:
+        last_price = float(item['lastPrice'])
+        volume = float(item['volume24h']) * last_price  # base volume -> quote currency
+        base, quote = split_symbol(item['symbol'])
+        rows.append(MarketRecord('bybit', base, quote, f"BYBIT:{item['symbol']}", quote_volume=volume, last_price=last_price))
 
-def get_futures_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
-    """Fetch Bybit linear perpetual futures symbols with volume filter.
-    
-    Returns TradingView-format perpetual symbols with .P suffix,
+    return normalize_usd_volumes(rows)
+
+
+def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
+    """Fetch Bybit spot trading symbols with volume filter."""
+    return filter_symbols(fetch_spot_markets(), quote_asset, min_volume)
+
+
+def fetch_futures_markets() -> List[MarketRecord]:
+    """Fetch every Bybit linear perpetual with its 24h volume in USD.
+
+    Records carry TradingView-format perpetual symbols with a .P suffix,
     e.g. BYBIT:BTCUSDT.P
     """
     url = 'https://api.bybit.com/v5/market/tickers'
     params = {'category': 'linear'}
-    
-    response = requests.get(url, params=params)
-    response.raise_for_status()
-    
-    symbols = []
-    for item in response.json()['result']['list']:
-        volume = float(item['volume24h']) * float(item['lastPrice'])
-        
-        if min_volume and volume < min_volume:
-            continue
-            
-        if quote_asset and not item['symbol'].endswith(quote_asset.upper()):
+
+    rows = []
+    for item in get_json(url, params=params, exchange='bybit')['result']['list']:
+        symbol = item['symbol']
+        # Dated futures (BTCUSDT-26DEC25) share the linear category
+        if '-' in symbol:
             continue
-            
-        symbols.append(f"BYBIT:{item['symbol']}.P")
-    
-    return sorted(symbols)
+        # USDC perpetuals are listed as BTCPERP
+        base, quote = (symbol[:-4], 'USDC') if symbol.endswith('PERP') else split_symbol(symbol)
+        last_price = float(item['lastPrice'])
+        rows.append(MarketRecord(
+            'bybit', base, quote, f"BYBIT:{symbol}.P",
+            quote_volume=float(item['volume24h']) * last_price, last_price=last_price, market_type='perp',
+        ))
+    return normalize_usd_volumes(rows)
+
+
+def get_futures_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
+    """Fetch Bybit linear perpetual futures symbols with volume filter."""
+    return filter_symbols(fetch_futures_markets(), quote_asset, min_volume)
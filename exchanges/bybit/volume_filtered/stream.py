@@ -0,0 +1,43 @@
+"""Bybit v5 public ticker streams (``tickers.<symbol>`` topics)."""
+
+import json
+from typing import Any, Iterable, List
+
+from exchanges.bybit.volume_filtered.pairs import fetch_futures_markets, fetch_spot_markets
+from exchanges.markets import MarketRecord, split_symbol, to_float
+from exchanges.streaming import StreamSpec, TickerUpdate
+
+STREAM_URLS = {
+    'spot': 'wss://stream.bybit.com/v5/public/spot',
+    'perp': 'wss://stream.bybit.com/v5/public/linear',
+}
+# Bybit accepts at most 10 topics per subscribe request on the spot channel
+TOPICS_PER_REQUEST = 10
+
+
+def subscribe(records: List[MarketRecord]) -> List[str]:
+    # Topic names use the venue symbol (BTCUSDT, or BTCPERP for USDC perpetuals)
+    topics = sorted(f"tickers.{record.tv_symbol.split(':', 1)[1].removesuffix('.P')}" for record in records)
+    return [
+        json.dumps({'op': 'subscribe', 'args': topics[i:i + TOPICS_PER_REQUEST]})
+        for i in range(0, len(topics), TOPICS_PER_REQUEST)
+    ]
+
+
+def make_parser(suffix: str):
+    def parse(message: Any) -> Iterable[TickerUpdate]:
+        if not isinstance(message, dict) or not str(message.get('topic', '')).startswith('tickers.'):
+            return
+        data = message.get('data') or {}
+        symbol = data.get('symbol') or message['topic'].split('.', 1)[1]
+        base, quote = split_symbol(symbol)
+        # Deltas only carry the fields that changed; turnover24h is the 24h quote volume
+        yield f"BYBIT:{symbol}{suffix}", base, quote, to_float(data.get('turnover24h')), to_float(data.get('lastPrice'))
+    return parse
+
+
+def stream_spec(market_type: str = 'spot') -> StreamSpec:
+    seed = fetch_futures_markets if market_type == 'perp' else fetch_spot_markets
+    suffix = '.P' if market_type == 'perp' else ''
+    return StreamSpec('bybit', market_type, STREAM_URLS[market_type], make_parser(suffix),
+                      seed=seed, subscribe=subscribe, ping=json.dumps({'op': 'ping'}))
@@ -0,0 +1,126 @@
+"""On-disk cache for JSON API responses with TTLs and conditional revalidation.
+
+Entries live under ``HTTP_CACHE_DIR`` as one JSON file per request
+(method + URL + params + form data). Stale entries that carried an ETag or
+Last-Modified header are revalidated with If-None-Match / If-Modified-Since
+so unchanged payloads cost a 304 instead of a full download.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config import HTTP_CACHE_DIR, TICKER_TTL
+
+
+@dataclass
+class CacheSettings:
+    enabled: bool = True
+    # Serve every request from cache and never touch the network
+    offline: bool = False
+    # Overrides per-endpoint TTLs when set (seconds)
+    max_age: Optional[float] = None
+    directory: Path = Path(HTTP_CACHE_DIR)
+    # Also keep entries in process memory (long-running watch mode)
+    memory: bool = False
+
+
+settings = CacheSettings()
+_memory: Dict[str, Dict[str, Any]] = {}
+
+
+def configure(
+    offline: bool = False,
+    max_age: Optional[float] = None,
+    enabled: bool = True,
+    directory: Optional[str] = None,
+    memory: bool = False,
+) -> None:
+    """Apply the --offline / --max-age command-line switches."""
+    settings.offline = offline
+    settings.max_age = max_age
+    settings.enabled = enabled or offline
+    settings.memory = memory
+    if directory:
+        settings.directory = Path(directory)
+    _memory.clear()
+
+
+def cache_key(method: str, url: str, params: Optional[Dict[str, Any]] = None, data: Optional[Dict[str, Any]] = None) -> str:
+    raw = json.dumps([method.upper(), url, params or {}, data or {}], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def load(key: str) -> Optional[Dict[str, Any]]:
+    if not settings.enabled:
+        return None
+    if key in _memory:
+        return _memory[key]
+    path = settings.directory / f"{key}.json"
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if settings.memory:
+        _memory[key] = entry
+    return entry
+
+
+def is_fresh(entry: Dict[str, Any], ttl: Optional[float]) -> bool:
+    if settings.max_age is not None:
+        limit = settings.max_age
+    else:
+        limit = TICKER_TTL if ttl is None else ttl
+    return time.time() - entry.get("fetched_at", 0) <= limit
+
+
+def validators(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Conditional request headers for a stale entry."""
+    headers: Dict[str, str] = {}
+    if entry is None:
+        return headers
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def store(key: str, url: str, body: Any, headers=None) -> None:
+    if not settings.enabled:
+        return
+    headers = headers or {}
+    entry = {
+        "url": url,
+        "fetched_at": time.time(),
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "body": body,
+    }
+    _write(key, entry)
+
+
+def touch(key: str, entry: Dict[str, Any]) -> None:
+    """Mark a revalidated (304) entry as fresh again."""
+    if not settings.enabled:
+        return
+    entry["fetched_at"] = time.time()
+    _write(key, entry)
+
+
+def _write(key: str, entry: Dict[str, Any]) -> None:
+    if settings.memory:
+        _memory[key] = entry
+    settings.directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=settings.directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f, separators=(",", ":"))
+        os.replace(tmp_path, settings.directory / f"{key}.json")
+    except OSError:
+        Path(tmp_path).unlink(missing_ok=True)
@@ -0,0 +1,140 @@
+"""Pooled HTTP client shared by every exchange adapter.
+
+One ``requests.Session`` keeps a keep-alive connection pool per host, asks
+for compressed responses and applies a default timeout, so adapters no
+longer pay a TCP+TLS handshake per request or hang on a stalled socket.
+Successful responses are written through to the on-disk cache in
+``exchanges/cache.py``.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import timing
+from exchanges import cache
+from exchanges.ratelimit import get_limiter
+
+# (connect, read) seconds
+DEFAULT_TIMEOUT = (5, 30)
+# Attempts per request when the server answers 429 Too Many Requests
+MAX_ATTEMPTS = 4
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 16
+
+Request = Union[str, Dict[str, Any]]
+
+# Benchmarks point every adapter at a local replay server (bench/server.py) by
+# setting e.g. API_BASE_OVERRIDE=http://127.0.0.1:8765
+API_BASE_OVERRIDE_ENV = "API_BASE_OVERRIDE"
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({
+                "Accept": "application/json",
+                "Accept-Encoding": "gzip, deflate",
+                "User-Agent": "tradingview-watchlist",
+            })
+            _session = session
+        return _session
+
+
+def route_url(url: str) -> str:
+    """Rewrite ``https://host/path`` to ``<API_BASE_OVERRIDE>/host/path`` when the override is set."""
+    override = os.environ.get(API_BASE_OVERRIDE_ENV)
+    if not override:
+        return url
+    return f"{override.rstrip('/')}/{url.split('://', 1)[-1]}"
+
+
+def _send(method, url, params, data, timeout, exchange, headers) -> requests.Response:
+    """Send one request, waiting out 429 responses via Retry-After."""
+    source = exchange or urlsplit(url).hostname
+    url = route_url(url)
+    response = None
+    for attempt in range(MAX_ATTEMPTS):
+        if exchange:
+            get_limiter(exchange).acquire()
+        response = get_session().request(method, url, params=params, data=data, headers=headers, timeout=timeout)
+        timing.record_http(
+            source,
+            calls=1,
+            bytes=int(response.headers.get("Content-Length") or len(response.content)),
+            retries=1 if attempt else 0,
+            rate_limited=1 if response.status_code == 429 else 0,
+        )
+        if response.status_code != 429:
+            break
+        if attempt < MAX_ATTEMPTS - 1:
+            retry_after = response.headers.get("Retry-After", "10")
+            wait_seconds = int(retry_after) if retry_after.isdigit() else 10
+            time.sleep(wait_seconds + attempt)
+    return response
+
+
+def get_json(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    exchange: Optional[str] = None,
+    method: str = "GET",
+    data: Optional[Dict[str, Any]] = None,
+    timeout=DEFAULT_TIMEOUT,
+    ttl: Optional[float] = None,
+) -> Any:
+    """Request ``url`` and return the decoded JSON body.
+
+    Responses are served from the on-disk cache while younger than ``ttl``
+    seconds (``TICKER_TTL`` by default). When ``exchange`` is given each
+    network request first takes a token from that exchange's rate limiter.
+    Raises ``requests.RequestException`` on network errors, non-2xx
+    responses, invalid JSON, or a cache miss in offline mode.
+    """
+    key = cache.cache_key(method, url, params, data)
+    entry = cache.load(key)
+    if entry is not None and (cache.settings.offline or cache.is_fresh(entry, ttl)):
+        timing.record_http(exchange or urlsplit(url).hostname, cache_hits=1)
+        return entry["body"]
+    if cache.settings.offline:
+        raise requests.ConnectionError(f"Offline mode: no cached response for {url}")
+
+    response = _send(method, url, params, data, timeout, exchange, cache.validators(entry))
+    if response.status_code == 304 and entry is not None:
+        cache.touch(key, entry)
+        return entry["body"]
+    response.raise_for_status()
+    body = response.json()
+    cache.store(key, url, body, response.headers)
+    return body
+
+
+def fetch_all(requests_: Sequence[Request], exchange: Optional[str] = None) -> List[Any]:
+    """Fetch several endpoints concurrently and return their JSON in order.
+
+    Each entry is either a URL or a dict of ``get_json`` keyword arguments.
+    The first failure is re-raised once every request has finished.
+    """
+    calls = [{"url": r} if isinstance(r, str) else dict(r) for r in requests_]
+    for call in calls:
+        call.setdefault("exchange", exchange)
+    if len(calls) == 1:
+        return [get_json(**calls[0])]
+    with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        futures = [pool.submit(get_json, **call) for call in calls]
+        return [future.result() for future in futures]
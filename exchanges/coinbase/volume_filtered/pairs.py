@@ -1,84 +1,109 @@
 import requests
-from typing import List
-import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
-def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
+from config import METADATA_TTL
+from exchanges.client import get_json
+from exchanges.markets import USD_QUOTES, MarketRecord, filter_symbols, normalize_usd_volumes, to_float
+
+PRODUCTS_URL = 'https://api.exchange.coinbase.com/products'
+# Undocumented but long-lived: 24h/30d stats for every product in one call
+BULK_STATS_URL = 'https://api.exchange.coinbase.com/products/stats'
+STATS_URL = 'https://api.exchange.coinbase.com/products/{product_id}/stats'
+# Concurrent per-product stats requests when the bulk endpoint is unavailable;
+# the 'coinbase' token bucket still caps the overall request rate.
+STATS_WORKERS = 8
+
+
+def fetch_bulk_stats() -> Optional[Dict[str, dict]]:
+    """Return 24h stats for every product keyed by product id, or None."""
     try:
-        with requests.Session() as session:
-            response = session.get('https://api.exchange.coinbase.com/products', timeout=15)
-            response.raise_for_status()
-            products = response.json()
+        stats = get_json(BULK_STATS_URL, exchange='coinbase')
+    except requests.RequestException:
+        return None
+    if not isinstance(stats, dict):
+        return None
+    return {product_id: data.get('stats_24hour') or {} for product_id, data in stats.items() if isinstance(data, dict)}
 
-            symbols = []
-            for product in products:
-                if product['status'] != 'online':
-                    continue
 
-                base = product['base_currency']
-                quote = product['quote_currency']
+def fetch_product_stats(product_id: str) -> Optional[dict]:
+    try:
+        return get_json(STATS_URL.format(product_id=product_id), exchange='coinbase')
+    except (requests.RequestException, ValueError):
+        return None
 
-                if quote_asset and quote != quote_asset:
-                    continue
 
-                # Rate limiting to avoid 503 errors
-                time.sleep(0.1)
+def fetch_spot_markets(quote_asset: str = None) -> List[MarketRecord]:
+    """Fetch every online Coinbase product with its 24h volume in USD.
 
-                try:
-                    stats = session.get(
-                        f'https://api.exchange.coinbase.com/products/{base}-{quote}/stats',
-                        timeout=15
-                    )
-                    stats.raise_for_status()
-                    stats_data = stats.json()
-                    volume = float(stats_data.get('volume', 0) or 0) * float(stats_data.get('last', 0) or 0)
+    Stats come from the bulk endpoint in a single call. If it fails, they
+    are requested per product over a bounded pool; ``quote_asset`` then
+    limits those requests to the products a single CLI run would keep plus
+    the USD-quoted ones its volumes are converted with. Callers still
+    filter the result by quote.
+    """
+    products = [p for p in get_json(PRODUCTS_URL, exchange='coinbase', ttl=METADATA_TTL) if p['status'] == 'online']
 
-                    if min_volume and volume < min_volume:
-                        continue
+    stats_by_product = fetch_bulk_stats()
+    if stats_by_product is None:
+        if quote_asset:
+            products = [p for p in products if p['quote_currency'] in USD_QUOTES or p['quote_currency'] == quote_asset.upper()]
+        product_ids = [p['id'] for p in products]
+        with ThreadPoolExecutor(max_workers=STATS_WORKERS) as pool:
+            stats_by_product = dict(zip(product_ids, pool.map(fetch_product_stats, product_ids)))
 
-                    symbols.append(f'COINBASE:{base}{quote}')
+    rows = []
+    for product in products:
+        base = product['base_currency']
+        quote = product['quote_currency']
+        stats_data = stats_by_product.get(product['id'])
+        if not stats_data:
+            continue
 
-                except (requests.RequestException, ValueError, KeyError):
-                    continue
+        last_price = to_float(stats_data.get('last'))
+        base_volume = to_float(stats_data.get('volume'))
+        # base volume -> quote currency; no price means volume unknown, not zero
+        volume = base_volume * last_price if base_volume is not None and last_price is not None else None
 
-        return symbols
+        rows.append(MarketRecord('coinbase', base, quote, f'COINBASE:{base}{quote}', quote_volume=volume, last_price=last_price))
 
-    except requests.RequestException as e:
-        print(f"Error fetching Coinbase data: {e}")
-        return []
+    return normalize_usd_volumes(rows)
 
 
-def get_futures_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
-    """Fetch Coinbase International Exchange perpetual futures symbols with volume filter.
-    
-    Returns TradingView-format perpetual symbols with .P suffix,
-    e.g. COINBASE:BTCUSDT.P
-    """
+def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
     try:
-        with requests.Session() as session:
-            response = session.get('https://api.international.coinbase.com/api/v1/instruments', timeout=15)
-            response.raise_for_status()
-            instruments = response.json()
+        return filter_symbols(fetch_spot_markets(quote_asset), quote_asset, min_volume)
 
-            symbols = []
-            for inst in instruments:
-                if inst.get('trading_state') != 'TRADING':
-                    continue
-                if inst.get('type') != 'PERP':
-                    continue
+    except requests.RequestException as e:
+        print(f"Error fetching Coinbase data: {e}")
+        return []
 
-                base = inst['base_asset_name']
-                quote = inst['quote_asset_name']
 
-                if quote_asset and quote.upper() != quote_asset.upper():
-                    continue
+def fetch_futures_markets() -> List[MarketRecord]:
+    """Fetch every trading Coinbase International Exchange perpetual with its 24h notional.
 
-                volume = float(inst.get('notional_24hr', 0) or 0)
-                if min_volume and volume < min_volume:
-                    continue
+    Records carry TradingView-format perpetual symbols with a .P suffix,
+    e.g. COINBASE:BTCUSDC.P
+    """
+    instruments = get_json('https://api.international.coinbase.com/api/v1/instruments', exchange='coinbase')
+
+    rows = []
+    for inst in instruments:
+        if inst.get('trading_state') != 'TRADING' or inst.get('type') != 'PERP':
+            continue
+        base = inst['base_asset_name']
+        quote = inst['quote_asset_name']
+        rows.append(MarketRecord(
+            'coinbase', base, quote, f'COINBASE:{base}{quote}.P',
+            quote_volume=float(inst.get('notional_24hr', 0) or 0), market_type='perp',
+        ))
+    return normalize_usd_volumes(rows)
 
-                symbols.append(f'COINBASE:{base}{quote}.P')
 
-            return symbols
+def get_futures_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
+    """Fetch Coinbase International Exchange perpetual futures symbols with volume filter."""
+    try:
+        return filter_symbols(fetch_futures_markets(), quote_asset, min_volume)
 
     except requests.RequestException as e:
         print(f"Error fetching Coinbase International Exchange data: {e}")
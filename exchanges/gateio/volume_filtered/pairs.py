@@ -1,22 +1,53 @@
-import requests
 from typing import List
 
-def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
-    response = requests.get('https://api.gateio.ws/api/v4/spot/tickers')
-    response.raise_for_status()
-    
-    symbols = []
-    for ticker in response.json():
+from exchanges.client import fetch_all, get_json
+from exchanges.markets import MarketRecord, filter_symbols, normalize_usd_volumes, to_float
+
+# Settlement currencies with perpetual contracts: USDT-margined and BTC-margined (inverse, quoted in USD)
+FUTURES_SETTLES = ['usdt', 'btc']
+
+
+def fetch_spot_markets() -> List[MarketRecord]:
+    """Fetch every Gate.io spot ticker with its 24h volume in USD."""
+    rows = []
+    for ticker in get_json('https://api.gateio.ws/api/v4/spot/tickers', exchange='gateio'):
         symbol = ticker['currency_pair']
         base, quote = symbol.split('_')
-        volume = float(ticker['quote_volume']) * float(ticker['last'])
-        
-        if min_volume and volume < min_volume:
-            continue
-            
-        if quote_asset and quote == quote_asset:
-            symbols.append(f'GATEIO:{base}{quote}')
-        elif not quote_asset:
-            symbols.append(f'GATEIO:{base}{quote}')
-    
-    return symbols
+        # quote_volume is already in the quote currency
+        rows.append(MarketRecord(
+            'gateio', base, quote, f'GATEIO:{base}{quote}',
+            quote_volume=float(ticker['quote_volume']), last_price=float(ticker['last']),
+        ))
+
+    return normalize_usd_volumes(rows)
+
+
+def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
+    return filter_symbols(fetch_spot_markets(), quote_asset, min_volume)
+
+
+def fetch_futures_markets() -> List[MarketRecord]:
+    """Fetch every Gate.io perpetual contract with its 24h volume in USD.
+
+    Records carry TradingView-format perpetual symbols with a .P suffix,
+    e.g. GATEIO:BTCUSDT.P
+    """
+    responses = fetch_all(
+        [f'https://api.gateio.ws/api/v4/futures/{settle}/tickers' for settle in FUTURES_SETTLES],
+        exchange='gateio',
+    )
+
+    rows = []
+    for tickers in responses:
+        for ticker in tickers:
+            base, quote = ticker['contract'].split('_', 1)
+            rows.append(MarketRecord(
+                'gateio', base, quote, f'GATEIO:{base}{quote}.P',
+                quote_volume=float(ticker.get('volume_24h_quote', 0) or 0),
+                last_price=to_float(ticker.get('last')), market_type='perp',
+            ))
+    return normalize_usd_volumes(rows)
+
+
+def get_futures_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
+    return filter_symbols(fetch_futures_markets(), quote_asset, min_volume)
@@ -1,27 +1,34 @@
-import requests
 from typing import List
 
+from config import METADATA_TTL
+from exchanges.client import fetch_all
+from exchanges.markets import MarketRecord, filter_symbols, normalize_usd_volumes
+
+
+def fetch_spot_markets() -> List[MarketRecord]:
+    """Fetch every Huobi symbol with its 24h volume in USD."""
+    symbols_data, tickers_data = fetch_all([
+        {'url': 'https://api.huobi.pro/v1/common/symbols', 'ttl': METADATA_TTL},
+        'https://api.huobi.pro/market/tickers',
+    ], exchange='huobi')
+
+    symbols = symbols_data['data']
+    tickers = {t['symbol']: t for t in tickers_data['data']}
+
+    rows = []
+    for s in symbols:
+        ticker = tickers.get(s['symbol'])
+        last_price = float(ticker['close']) if ticker else None
+        # "vol" is the quote-currency turnover ("amount" is base volume)
+        volume = float(ticker['vol']) if ticker else 0
+        rows.append(MarketRecord(
+            'huobi', s['base-currency'], s['quote-currency'], f"HUOBI:{s['symbol'].upper()}",
+            quote_volume=volume, last_price=last_price,
+        ))
+
+    return normalize_usd_volumes(rows)
+
+
 def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
     """Fetch Huobi trading symbols with volume filter."""
-    symbols_response = requests.get('https://api.huobi.pro/v1/common/symbols')
-    tickers_response = requests.get('https://api.huobi.pro/market/tickers')
-    
-    symbols_response.raise_for_status()
-    tickers_response.raise_for_status()
-    
-    symbols = symbols_response.json()['data']
-    tickers = {t['symbol']: float(t['vol']) * float(t['close']) for t in tickers_response.json()['data']}
-    
-    filtered_symbols = []
-    for s in symbols:
-        volume = tickers.get(s['symbol'], 0)
-        
-        if min_volume and volume < min_volume:
-            continue
-            
-        if quote_asset and s['quote-currency'] != quote_asset.lower():
-            continue
-            
-        filtered_symbols.append(f"HUOBI:{s['symbol'].upper()}")
-    
-    return sorted(filtered_symbols)
+    return filter_symbols(fetch_spot_markets(), quote_asset, min_volume)
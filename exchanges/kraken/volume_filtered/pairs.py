@@ -1,43 +1,54 @@
-import requests
 from typing import List
 
+from config import METADATA_TTL
+from exchanges.client import fetch_all
+from exchanges.markets import MarketRecord, filter_symbols, normalize_usd_volumes
+
+
+# Kraken-specific names left after stripping the legacy X/Z prefix
+ASSET_ALIASES = {'XBT': 'BTC', 'XDG': 'DOGE'}
+
+
+def normalize_asset(asset: str) -> str:
+    """Map Kraken asset codes (XXBT, ZUSD, XETH, XBT) to their common names.
+
+    Only the legacy four-letter codes carry an X (crypto) or Z (fiat)
+    prefix; newer assets such as XTZ or ZRX are left alone.
+    """
+    asset = asset.upper()
+    if len(asset) == 4 and asset[0] in 'XZ':
+        asset = asset[1:]
+    return ASSET_ALIASES.get(asset, asset)
+
+
+def fetch_spot_markets() -> List[MarketRecord]:
+    """Fetch every Kraken spot pair with its 24h volume in USD."""
+    pairs_data, tickers_data = fetch_all([
+        {'url': 'https://api.kraken.com/0/public/AssetPairs', 'ttl': METADATA_TTL},
+        'https://api.kraken.com/0/public/Ticker',
+    ], exchange='kraken')
+
+    pairs = pairs_data['result']
+    tickers = tickers_data['result']
+
+    rows = []
+    for pair_name, pair_info in pairs.items():
+        ticker = tickers.get(pair_name)
+        if ticker is None:
+            continue
+
+        last_price = float(ticker['c'][0])
+        volume = float(ticker['v'][1]) * last_price  # base volume -> quote currency (EUR, BTC, ...)
+        base = normalize_asset(pair_info['base'])
+        quote = normalize_asset(pair_info['quote'])
+
+        rows.append(MarketRecord('kraken', base, quote, f'KRAKEN:{base}{quote}', quote_volume=volume, last_price=last_price))
+
+    return normalize_usd_volumes(rows)
+
+
 def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
     """Fetch Kraken spot trading symbols with volume filter."""
-    pairs_response = requests.get('https://api.kraken.com/0/public/AssetPairs')
-    ticker_response = requests.get('https://api.kraken.com/0/public/Ticker')
-    
-    pairs_response.raise_for_status()
-    ticker_response.raise_for_status()
-    
-    pairs = pairs_response.json()['result']
-    tickers = ticker_response.json()['result']
-    
-    asset_map = {
-        'USD': 'ZUSD', 'EUR': 'ZEUR', 'GBP': 'ZGBP', 'CAD': 'ZCAD',
-        'AUD': 'ZAUD', 'JPY': 'ZJPY', 'CHF': 'ZCHF',
-        'BTC': 'XBT', 'USDT': 'USDT', 'ETH': 'XETH', 'USDC': 'USDC',
-        'DAI': 'DAI', 'PYUSD': 'PYUSD', 'POL': 'POL',
-        'XBT': 'XBT', 'ETH': 'XETH'
-    }
-    
     if quote_asset:
-        quote_asset = asset_map.get(quote_asset, quote_asset)
-    
-    symbols = []
-    for pair_name, pair_info in pairs.items():
-        base = pair_info['base']
-        quote = pair_info['quote']
-        
-        if quote_asset and quote != quote_asset:
-            continue
-            
-        volume = float(tickers[pair_name]['v'][1]) * float(tickers[pair_name]['c'][0])
-        if min_volume and volume < min_volume:
-            continue
-            
-        base = 'BTC' if base == 'XBT' else base.replace('Z', '').replace('X', '')
-        quote = 'BTC' if quote == 'XBT' else quote.replace('Z', '').replace('X', '')
-        
-        symbols.append(f'KRAKEN:{base}{quote}')
-    
-    return sorted(symbols)
+        quote_asset = normalize_asset(quote_asset)
+    return filter_symbols(fetch_spot_markets(), quote_asset, min_volume)
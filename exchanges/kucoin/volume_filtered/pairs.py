@@ -1,27 +1,67 @@
-import requests
 from typing import List
 
+from config import METADATA_TTL
+from exchanges.client import fetch_all, get_json
+from exchanges.markets import MarketRecord, filter_symbols, normalize_usd_volumes, to_float
+
+
+def fetch_spot_markets() -> List[MarketRecord]:
+    """Fetch every KuCoin symbol with its 24h volume in USD."""
+    pairs_data, tickers_data = fetch_all([
+        {'url': 'https://api.kucoin.com/api/v1/symbols', 'ttl': METADATA_TTL},
+        'https://api.kucoin.com/api/v1/market/allTickers',
+    ], exchange='kucoin')
+
+    pairs = pairs_data['data']
+    tickers = {t['symbol']: t for t in tickers_data['data']['ticker']}
+
+    rows = []
+    for pair in pairs:
+        ticker = tickers.get(pair['symbol'], {})
+        rows.append(MarketRecord(
+            'kucoin', pair['baseCurrency'], pair['quoteCurrency'],
+            f"KUCOIN:{pair['name'].upper().replace('-', '').replace('/', '')}",
+            quote_volume=float(ticker.get('volValue', 0) or 0),
+            last_price=to_float(ticker.get('last')),
+        ))
+
+    return normalize_usd_volumes(rows)
+
+
 def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
     """Fetch KuCoin trading symbols with volume filter."""
-    pairs_response = requests.get('https://api.kucoin.com/api/v1/symbols')
-    tickers_response = requests.get('https://api.kucoin.com/api/v1/market/allTickers')
-    
-    pairs_response.raise_for_status()
-    tickers_response.raise_for_status()
-    
-    pairs = pairs_response.json()['data']
-    tickers = {t['symbol']: float(t['volValue']) for t in tickers_response.json()['data']['ticker']}
-    
-    symbols = []
-    for pair in pairs:
-        volume = tickers.get(pair['symbol'], 0)
-        
-        if min_volume and volume < min_volume:
-            continue
-            
-        if quote_asset and pair['quoteCurrency'] != quote_asset.upper():
+    return filter_symbols(fetch_spot_markets(), quote_asset, min_volume)
+
+
+def fetch_futures_markets() -> List[MarketRecord]:
+    """Fetch every open KuCoin Futures perpetual with its 24h turnover in USD.
+
+    Records carry TradingView-format perpetual symbols with a .P suffix and
+    KuCoin's XBT renamed to BTC, e.g. KUCOIN:BTCUSDT.P for XBTUSDTM.
+    """
+    contracts = get_json('https://api-futures.kucoin.com/api/v1/contracts/active', exchange='kucoin')['data']
+
+    rows = []
+    for contract in contracts:
+        # FFWCSX is a perpetual swap; FFICSX are dated futures
+        if contract.get('type') != 'FFWCSX' or contract.get('status') != 'Open':
             continue
-            
-        symbols.append(f"KUCOIN:{pair['name'].upper().replace('-', '').replace('/', '')}")
-    
-    return sorted(symbols)
+        base = 'BTC' if contract['baseCurrency'] == 'XBT' else contract['baseCurrency']
+        quote = contract['quoteCurrency']
+        last_price = to_float(contract.get('lastTradePrice'))
+        turnover = to_float(contract.get('turnoverOf24h'))
+        # Inverse contracts report turnover in the settlement coin; no price means volume unknown
+        if contract.get('isInverse'):
+            quote_volume = turnover * last_price if turnover is not None and last_price is not None else None
+        else:
+            quote_volume = turnover
+        rows.append(MarketRecord(
+            'kucoin', base, quote, f'KUCOIN:{base}{quote}.P',
+            quote_volume=quote_volume, last_price=last_price, market_type='perp',
+        ))
+    return normalize_usd_volumes(rows)
+
+
+def get_futures_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
+    """Fetch KuCoin perpetual futures symbols with volume filter."""
+    return filter_symbols(fetch_futures_markets(), quote_asset, min_volume)
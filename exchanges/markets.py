@@ -0,0 +1,161 @@
+"""Shared market records returned by every exchange adapter."""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Quote assets recognised when an exchange only reports the concatenated
+# symbol (e.g. BTCUSDT). Longest suffix wins so USDT is never read as USD.
+KNOWN_QUOTES = sorted(
+    [
+        "USDT", "USDC", "FDUSD", "TUSD", "BUSD", "USDE", "PYUSD", "DAI", "UST",
+        "USD", "EUR", "GBP", "TRY", "BRL", "JPY", "AUD", "CAD", "CHF", "MXN",
+        "BTC", "ETH", "BNB", "XRP", "TRX", "DOGE", "SOL",
+    ],
+    key=len,
+    reverse=True,
+)
+
+# Quote assets counted at par with the US dollar when converting volumes.
+# Inverse (coin-margined) perpetuals are quoted in plain USD.
+USD_QUOTES = frozenset({"USD", "USDT", "USDC", "FDUSD", "TUSD", "BUSD", "USDE", "PYUSD", "DAI"})
+
+
+class MarketRecord:
+    """One tradable market with its 24h volume, in a compact slotted layout.
+
+    ``tv_symbol`` is the TradingView symbol written to the watchlists;
+    ``base``/``quote`` are kept alongside so nothing downstream has to parse
+    them back out of that string. Adapters report ``quote_volume`` in the
+    quote currency and ``normalize_usd_volumes`` fills ``usd_volume`` from it;
+    venues that already report a USD figure set ``usd_volume`` directly.
+    """
+
+    __slots__ = ("exchange", "base", "quote", "market_type", "usd_volume", "last_price", "tv_symbol", "quote_volume")
+
+    def __init__(
+        self,
+        exchange: str,
+        base: str,
+        quote: str,
+        tv_symbol: str,
+        usd_volume: Optional[float] = None,
+        last_price: Optional[float] = None,
+        market_type: str = "spot",
+        quote_volume: Optional[float] = None,
+    ):
+        self.exchange = exchange
+        self.base = base.upper()
+        self.quote = quote.upper()
+        self.tv_symbol = tv_symbol
+        self.usd_volume = usd_volume
+        self.last_price = last_price
+        self.market_type = market_type
+        self.quote_volume = quote_volume
+
+    def as_tuple(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, MarketRecord) and self.as_tuple() == other.as_tuple()
+
+    def __hash__(self) -> int:
+        return hash(self.as_tuple())
+
+    def __repr__(self) -> str:
+        return (
+            f"MarketRecord({self.tv_symbol!r}, base={self.base!r}, quote={self.quote!r}, "
+            f"market_type={self.market_type!r}, usd_volume={self.usd_volume!r}, last_price={self.last_price!r})"
+        )
+
+
+def split_symbol(symbol: str) -> Tuple[str, str]:
+    """Split a concatenated symbol into (base, quote) using KNOWN_QUOTES.
+
+    Returns (symbol, '') when no known quote asset matches.
+    """
+    symbol = symbol.upper()
+    for quote in KNOWN_QUOTES:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return symbol[: -len(quote)], quote
+    return symbol, ""
+
+
+def tv_symbol_base(tv_symbol: str, quote_asset: str) -> str:
+    """Base asset of a TradingView symbol such as BINANCE:BTCUSDT.P or OKX:BTC-USDT-SWAP."""
+    name = tv_symbol.split(":", 1)[-1].upper().removesuffix(".P").removesuffix("-SWAP")
+    name = name.split("-")[0] if "-" in name else name
+    return name.removesuffix(quote_asset.upper()) or name
+
+
+def to_float(value) -> Optional[float]:
+    """Parse an API number that may be missing, empty or null."""
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def quote_usd_rates(records: Iterable[MarketRecord]) -> Dict[str, float]:
+    """USD value of one unit of each asset, priced from the records' own last prices.
+
+    Dollar stablecoins are at par. Any other asset is priced from its market
+    against an asset already in the table (BTC/USDT, EUR/USDT, USDT/EUR, then
+    crosses such as ETH/BTC). Each pass ranks the markets that can price a
+    new asset by their 24h volume in USD, valued at the rates known so far,
+    so one thin pair cannot set the rate. No extra requests are made.
+    """
+    rates: Dict[str, float] = {quote: 1.0 for quote in USD_QUOTES}
+    pending = [record for record in records if record.last_price]
+    while pending:
+        # (24h volume in USD, asset, USD rate it implies)
+        candidates: List[Tuple[float, str, float]] = []
+        unpriced = []
+        for record in pending:
+            if record.quote in rates and record.base not in rates:
+                quote_rate = rates[record.quote]
+                asset, rate = record.base, quote_rate * record.last_price
+            elif record.base in rates and record.quote not in rates:
+                quote_rate = rates[record.base] / record.last_price
+                asset, rate = record.quote, quote_rate
+            else:
+                if record.base not in rates:
+                    unpriced.append(record)
+                continue
+            volume = record.quote_volume * quote_rate if record.quote_volume is not None else record.usd_volume
+            candidates.append((volume or 0.0, asset, rate))
+        if not candidates:
+            break
+        for _, asset, rate in sorted(candidates, key=lambda candidate: candidate[0], reverse=True):
+            rates.setdefault(asset, rate)
+        pending = unpriced
+    return rates
+
+
+def normalize_usd_volumes(records: List[MarketRecord], rates: Optional[Dict[str, float]] = None) -> List[MarketRecord]:
+    """Convert every record's ``quote_volume`` to ``usd_volume`` in one pass and return ``records``.
+
+    ``rates`` defaults to ``quote_usd_rates(records)``. Records whose quote
+    cannot be priced get ``usd_volume=None`` so no USD bucket claims them.
+    """
+    if rates is None:
+        rates = quote_usd_rates(records)
+    for record in records:
+        if record.quote_volume is not None:
+            rate = rates.get(record.quote)
+            record.usd_volume = record.quote_volume * rate if rate is not None else None
+    return records
+
+
+def filter_symbols(records: Iterable[MarketRecord], quote_asset: str = None, min_volume: float = None) -> List[str]:
+    """Apply the quote/volume filter used by get_spot_symbols to pre-fetched records.
+
+    Records whose volume could not be priced in USD never pass a volume filter.
+    """
+    quote_asset = quote_asset.upper() if quote_asset else None
+    symbols = []
+    for record in records:
+        if quote_asset and record.quote != quote_asset:
+            continue
+        if min_volume and (record.usd_volume is None or record.usd_volume < min_volume):
+            continue
+        symbols.append(record.tv_symbol)
+    return sorted(symbols)
@@ -1,56 +1,64 @@
-import requests
 from typing import List
 
-def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
-    """Fetch MEXC spot trading symbols."""
-    response = requests.get('https://api.mexc.com/api/v3/ticker/24hr')
-    response.raise_for_status()
-    pairs = response.json()
-    
-    symbols = []
+from config import METADATA_TTL
+from exchanges.client import fetch_all, get_json
+from exchanges.markets import MarketRecord, filter_symbols, normalize_usd_volumes, split_symbol, to_float
+
+
+def fetch_spot_markets() -> List[MarketRecord]:
+    """Fetch every MEXC spot ticker with its 24h volume in USD."""
+    pairs = get_json('https://api.mexc.com/api/v3/ticker/24hr', exchange='mexc')
+
+    rows = []
     for pair in pairs:
         symbol = pair['symbol']
-        volume = float(pair['volume']) * float(pair['lastPrice'])
-        
-        if min_volume and volume < min_volume:
-            continue
-            
-        if quote_asset:
-            if symbol.endswith(quote_asset):
-                base = symbol[:-len(quote_asset)]
-                symbols.append(f'MEXC:{base}{quote_asset}')
-        else:
-            symbols.append(f'MEXC:{symbol}')
-    
-    return sorted(symbols)
+        last_price = float(pair['lastPrice'])
+        volume = float(pair['volume']) * last_price  # base volume -> quote currency
+        base, quote = split_symbol(symbol)
+        rows.append(MarketRecord('mexc', base, quote, f'MEXC:{symbol}', quote_volume=volume, last_price=last_price))
 
-def get_futures_symbols(min_volume: float = None) -> List[str]:
-    """Fetch MEXC futures trading symbols."""
-    response = requests.get('https://contract.mexc.com/api/v1/contract/ticker')
-    response.raise_for_status()
-    pairs = response.json()['data']
-    
-    symbols = []
-    for p in pairs:
-        volume = float(p['amount24']) * float(p['lastPrice'])
-        if min_volume and volume < min_volume:
-            continue
-        symbols.append(f'MEXC:{p["symbol"]}PERP')
-    
-    return sorted(symbols)
+    return normalize_usd_volumes(rows)
+
+
+def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
+    """Fetch MEXC spot trading symbols."""
+    return filter_symbols(fetch_spot_markets(), quote_asset, min_volume)
+
+def fetch_futures_markets() -> List[MarketRecord]:
+    """Fetch every MEXC perpetual contract with its 24h turnover in USD.
+
+    Records carry TradingView-format perpetual symbols with a .P suffix,
+    e.g. MEXC:BTCUSDT.P
+    """
+    contracts = get_json('https://contract.mexc.com/api/v1/contract/ticker', exchange='mexc')['data']
+
+    rows = []
+    for contract in contracts:
+        base, _, quote = contract['symbol'].partition('_')
+        # amount24 is already quote turnover; volume24 counts contracts
+        rows.append(MarketRecord(
+            'mexc', base, quote, f'MEXC:{base}{quote}.P',
+            quote_volume=float(contract['amount24']), last_price=to_float(contract['lastPrice']), market_type='perp',
+        ))
+    return normalize_usd_volumes(rows)
+
+
+def get_futures_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
+    """Fetch MEXC perpetual futures symbols with volume filter."""
+    return filter_symbols(fetch_futures_markets(), quote_asset, min_volume)
 
 
 def get_leveraged_tokens(min_volume: float = None) -> List[str]:
     """Fetch MEXC leveraged tokens."""
-    response = requests.get('https://api.mexc.com/api/v3/leveraged/tokens')
-    response.raise_for_status()
-    tokens = response.json()
-    
     if min_volume:
-        tickers = requests.get('https://api.mexc.com/api/v3/leveraged/ticker').json()
+        tokens, tickers = fetch_all([
+            {'url': 'https://api.mexc.com/api/v3/leveraged/tokens', 'ttl': METADATA_TTL},
+            'https://api.mexc.com/api/v3/leveraged/ticker',
+        ], exchange='mexc')
         volumes = {t['symbol']: float(t['volume']) * float(t['price']) for t in tickers}
         return sorted([f'MEXC:{t["symbol"]}' for t in tokens if volumes.get(t["symbol"], 0) >= min_volume])
     
+    tokens = get_json('https://api.mexc.com/api/v3/leveraged/tokens', exchange='mexc', ttl=METADATA_TTL)
     return sorted([f'MEXC:{t["symbol"]}' for t in tokens])
 
 
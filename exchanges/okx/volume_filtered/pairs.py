@@ -1,54 +1,71 @@
-import requests
-from typing import List
+from typing import List, Optional
+
+from config import METADATA_TTL
+from exchanges.client import fetch_all
+from exchanges.markets import MarketRecord, filter_symbols, normalize_usd_volumes, to_float
+
+
+def fetch_spot_markets() -> List[MarketRecord]:
+    """Fetch every OKX spot instrument with its 24h volume in USD."""
+    pairs_data, tickers_data = fetch_all([
+        {'url': 'https://www.okx.com/api/v5/public/instruments', 'params': {'instType': 'SPOT'}, 'ttl': METADATA_TTL},
+        {'url': 'https://www.okx.com/api/v5/market/tickers', 'params': {'instType': 'SPOT'}},
+    ], exchange='okx')
+
+    pairs = pairs_data['data']
+    tickers = {t['instId']: t for t in tickers_data['data']}
+
+    rows = []
+    for pair in pairs:
+        ticker = tickers.get(pair['instId'], {})
+        rows.append(MarketRecord(
+            'okx', pair['baseCcy'], pair['quoteCcy'], f"OKX:{pair['baseCcy']}{pair['quoteCcy']}",
+            # For SPOT, volCcy24h is in the quote currency
+            quote_volume=float(ticker.get('volCcy24h', 0)),
+            last_price=to_float(ticker.get('last')),
+        ))
+
+    return normalize_usd_volumes(rows)
+
 
 def get_spot_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
     """Fetch OKX spot trading symbols with volume filter."""
-    pairs_response = requests.get('https://www.okx.com/api/v5/public/instruments?instType=SPOT')
-    tickers_response = requests.get('https://www.okx.com/api/v5/market/tickers?instType=SPOT')
-    
-    pairs_response.raise_for_status()
-    tickers_response.raise_for_status()
-    
-    pairs = pairs_response.json()['data']
-    tickers = {t['instId']: float(t['volCcy24h']) for t in tickers_response.json()['data']}
-    
-    symbols = []
-    for pair in pairs:
-        volume = tickers.get(pair['instId'], 0)
-        
-        if min_volume and volume < min_volume:
-            continue
-            
-        if quote_asset and pair['quoteCcy'] != quote_asset:
-            continue
-            
-        symbols.append(f"OKX:{pair['baseCcy']}{pair['quoteCcy']}")
-    
-    return sorted(symbols)
+    return filter_symbols(fetch_spot_markets(), quote_asset, min_volume)
 
-def get_futures_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
-    """Fetch OKX perpetual swap symbols with volume filter.
-    
-    Returns TradingView-format SWAP symbols, e.g. OKX:BTC-USDT-SWAP.
+def swap_quote_volume(vol_ccy_24h, last_price: Optional[float]) -> Optional[float]:
+    """For SWAP instruments volCcy24h is in base-currency units; convert it to the quote currency."""
+    volume = to_float(vol_ccy_24h)
+    return volume * last_price if volume is not None and last_price is not None else None
+
+
+def fetch_futures_markets() -> List[MarketRecord]:
+    """Fetch every OKX perpetual swap with its 24h volume in USD.
+
+    Linear (USDT/USDC) and inverse (USD) swaps are both included; the quote
+    comes from the instrument family. Records carry TradingView-format SWAP
+    symbols, e.g. OKX:BTC-USDT-SWAP.
     """
-    pairs_response = requests.get('https://www.okx.com/api/v5/public/instruments?instType=SWAP')
-    tickers_response = requests.get('https://www.okx.com/api/v5/market/tickers?instType=SWAP')
-    
-    pairs_response.raise_for_status()
-    tickers_response.raise_for_status()
-    
-    pairs = pairs_response.json()['data']
-    tickers = {t['instId']: float(t['volCcy24h']) for t in tickers_response.json()['data']}
-    
-    symbols = []
-    for pair in pairs:
-        volume = tickers.get(pair['instId'], 0)
-        if min_volume and volume < min_volume:
-            continue
-        # Extract quote asset from instFamily (e.g. 'BTC-USD' -> quote='USD')
-        inst_quote = pair['instFamily'].split('-')[-1] if '-' in pair.get('instFamily', '') else ''
-        if quote_asset and inst_quote.upper() != quote_asset.upper():
+    pairs_data, tickers_data = fetch_all([
+        {'url': 'https://www.okx.com/api/v5/public/instruments', 'params': {'instType': 'SWAP'}, 'ttl': METADATA_TTL},
+        {'url': 'https://www.okx.com/api/v5/market/tickers', 'params': {'instType': 'SWAP'}},
+    ], exchange='okx')
+    tickers = {t['instId']: t for t in tickers_data['data']}
+
+    rows = []
+    for pair in pairs_data['data']:
+        if '-' not in pair.get('instFamily', ''):
             continue
-        symbols.append(f"OKX:{pair['instId']}")
-    
-    return sorted(symbols)
+        base, quote = pair['instFamily'].split('-', 1)
+        ticker = tickers.get(pair['instId'], {})
+        last_price = to_float(ticker.get('last'))
+        rows.append(MarketRecord(
+            'okx', base, quote, f"OKX:{pair['instId']}",
+            quote_volume=swap_quote_volume(ticker.get('volCcy24h'), last_price),
+            last_price=last_price, market_type='perp',
+        ))
+    return normalize_usd_volumes(rows)
+
+
+def get_futures_symbols(quote_asset: str = None, min_volume: float = None) -> List[str]:
+    """Fetch OKX perpetual swap symbols with volume filter."""
+    return filter_symbols(fetch_futures_markets(), quote_asset, min_volume)
@@ -0,0 +1,39 @@
+"""OKX v5 public ``tickers`` channel."""
+
+import json
+from typing import Any, Iterable, List
+
+from exchanges.markets import MarketRecord, to_float
+from exchanges.okx.volume_filtered.pairs import fetch_futures_markets, fetch_spot_markets, swap_quote_volume
+from exchanges.streaming import StreamSpec, TickerUpdate
+
+STREAM_URL = 'wss://ws.okx.com:8443/ws/v5/public'
+ARGS_PER_REQUEST = 100
+
+
+def inst_id(record: MarketRecord) -> str:
+    return record.tv_symbol.split(':', 1)[1] if record.market_type == 'perp' else f"{record.base}-{record.quote}"
+
+
+def subscribe(records: List[MarketRecord]) -> List[str]:
+    args = [{'channel': 'tickers', 'instId': inst_id(record)} for record in sorted(records, key=lambda r: r.tv_symbol)]
+    return [json.dumps({'op': 'subscribe', 'args': args[i:i + ARGS_PER_REQUEST]}) for i in range(0, len(args), ARGS_PER_REQUEST)]
+
+
+def parse(message: Any) -> Iterable[TickerUpdate]:
+    if not isinstance(message, dict) or message.get('arg', {}).get('channel') != 'tickers':
+        return
+    for ticker in message.get('data', []):
+        parts = ticker['instId'].split('-')
+        last_price = to_float(ticker.get('last'))
+        # volCcy24h is quote currency for SPOT and base currency for SWAP, as in the REST adapter
+        if parts[-1] == 'SWAP':
+            yield f"OKX:{ticker['instId']}", parts[0], parts[1], swap_quote_volume(ticker.get('volCcy24h'), last_price), last_price
+        else:
+            yield f"OKX:{parts[0]}{parts[1]}", parts[0], parts[1], to_float(ticker.get('volCcy24h')), last_price
+
+
+def stream_spec(market_type: str = 'spot') -> StreamSpec:
+    seed = fetch_futures_markets if market_type == 'perp' else fetch_spot_markets
+    # OKX drops connections idle for 30s; it answers a plain-text "ping" with "pong"
+    return StreamSpec('okx', market_type, STREAM_URL, parse, seed=seed, subscribe=subscribe, ping='ping')
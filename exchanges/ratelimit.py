@@ -0,0 +1,46 @@
+"""Thread-safe token buckets keyed by exchange name."""
+
+import threading
+import time
+from typing import Dict
+
+from config import DEFAULT_RATE_LIMIT, RATE_LIMITS
+
+
+class TokenBucket:
+    """Allow ``rate`` acquisitions per second with bursts of up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(exchange: str) -> TokenBucket:
+    """Return the shared token bucket for an exchange, creating it on first use."""
+    with _limiters_lock:
+        limiter = _limiters.get(exchange)
+        if limiter is None:
+            rate = RATE_LIMITS.get(exchange, DEFAULT_RATE_LIMIT)
+            limiter = TokenBucket(rate, capacity=max(1.0, rate))
+            _limiters[exchange] = limiter
+        return limiter
@@ -0,0 +1,100 @@
+"""Declarative list of exchange adapters and what each one supports.
+
+Tools that only need to know which exchanges exist, or whether one has
+perpetuals, read ``ADAPTERS`` instead of importing every adapter and probing
+it with ``hasattr``. Adapter modules (and their dependencies) are imported
+on first use through ``AdapterInfo.load()``.
+"""
+
+import importlib
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Dict, List, Optional, Tuple
+
+from config import DEFAULT_RATE_LIMIT, RATE_LIMITS
+
+
+@dataclass(frozen=True)
+class AdapterInfo:
+    name: str
+    # Quote assets the venue lists spot markets in (informational; filters accept any)
+    quotes: Tuple[str, ...]
+    spot: bool = True
+    # ``fetch_futures_markets()`` and ``get_futures_symbols(quote_asset, min_volume)`` for perpetual swaps
+    futures: bool = False
+    futures_quotes: Tuple[str, ...] = ()
+    # ``get_leveraged_tokens(min_volume)``
+    leveraged_tokens: bool = False
+    # ``volume_filtered/stream.py`` with ``stream_spec(market_type)``
+    streaming: bool = False
+
+    @property
+    def module_name(self) -> str:
+        return f"exchanges.{self.name}.volume_filtered.pairs"
+
+    @property
+    def rate_limit(self) -> float:
+        """Requests per second allowed by the client's token bucket."""
+        return RATE_LIMITS.get(self.name, DEFAULT_RATE_LIMIT)
+
+    def load(self) -> ModuleType:
+        return importlib.import_module(self.module_name)
+
+    def load_stream(self) -> ModuleType:
+        if not self.streaming:
+            raise ValueError(f"{self.name} has no ticker stream")
+        return importlib.import_module(f"exchanges.{self.name}.volume_filtered.stream")
+
+    def capabilities(self) -> List[str]:
+        flags = [("spot", self.spot), ("futures", self.futures), ("leveraged", self.leveraged_tokens), ("stream", self.streaming)]
+        return [label for label, enabled in flags if enabled]
+
+
+ADAPTERS: Dict[str, AdapterInfo] = {
+    adapter.name: adapter
+    for adapter in [
+        AdapterInfo("binance", ("USDT", "USDC", "FDUSD", "EUR", "TRY", "BTC", "ETH", "BNB"),
+                    futures=True, futures_quotes=("USDT", "USDC"), streaming=True),
+        AdapterInfo("bitfinex", ("USD", "USDT", "EUR", "GBP", "JPY", "BTC", "ETH")),
+        AdapterInfo("bitget", ("USDT", "USDC", "EUR", "BTC", "ETH"),
+                    futures=True, futures_quotes=("USDT", "USDC", "USD")),
+        AdapterInfo("bitstamp", ("USD", "EUR", "GBP", "USDT", "USDC", "BTC", "ETH")),
+        AdapterInfo("bybit", ("USDT", "USDC", "EUR", "BTC"),
+                    futures=True, futures_quotes=("USDT", "USDC"), streaming=True),
+        AdapterInfo("coinbase", ("USD", "USDC", "USDT", "EUR", "GBP", "BTC", "ETH"),
+                    futures=True, futures_quotes=("USDC",)),
+        AdapterInfo("gateio", ("USDT", "USDC", "BTC", "ETH"),
+                    futures=True, futures_quotes=("USDT", "USD")),
+        AdapterInfo("huobi", ("USDT", "USDC", "BTC", "ETH")),
+        AdapterInfo("kraken", ("USD", "EUR", "GBP", "CAD", "USDT", "USDC", "BTC", "ETH")),
+        AdapterInfo("kucoin", ("USDT", "USDC", "BTC", "ETH"),
+                    futures=True, futures_quotes=("USDT", "USDC", "USD")),
+        AdapterInfo("mexc", ("USDT", "USDC", "BTC", "ETH"),
+                    futures=True, futures_quotes=("USDT", "USDC", "USD"), leveraged_tokens=True),
+        AdapterInfo("okx", ("USDT", "USDC", "EUR", "BTC", "ETH"),
+                    futures=True, futures_quotes=("USDT", "USDC", "USD"), streaming=True),
+    ]
+}
+
+
+def get_adapter(name: str) -> AdapterInfo:
+    """Return the registry entry for ``name``; raises ``KeyError`` listing the known exchanges."""
+    try:
+        return ADAPTERS[name.lower()]
+    except KeyError:
+        raise KeyError(f"unknown exchange {name!r} (known: {', '.join(ADAPTERS)})") from None
+
+
+def exchange_names(spot: Optional[bool] = None, futures: Optional[bool] = None, streaming: Optional[bool] = None) -> List[str]:
+    """Exchange names, optionally restricted to those with (or without) a capability."""
+    return [
+        adapter.name
+        for adapter in ADAPTERS.values()
+        if (spot is None or adapter.spot == spot)
+        and (futures is None or adapter.futures == futures)
+        and (streaming is None or adapter.streaming == streaming)
+    ]
+
+
+def load_adapter(name: str) -> ModuleType:
+    return get_adapter(name).load()
@@ -0,0 +1,396 @@
+"""Live ticker streaming: a minimal WebSocket client and an in-memory market table.
+
+Exchanges with all-market ticker channels push their rolling 24h statistics,
+so instead of polling REST ticker endpoints a stream keeps one
+``MarketRecord`` per symbol up to date in a ``LiveTable``. The existing
+quote/volume filters run against ``LiveTable.snapshot()``, and
+``VolumeHysteresis`` decides bucket membership so symbols hovering around a
+threshold do not flap between watchlists.
+
+Per-exchange channel details live next to the REST adapters in
+``exchanges/<name>/volume_filtered/stream.py`` as ``stream_spec(market_type)``.
+Only the standard library is used (RFC 6455 over ``socket``/``ssl``).
+"""
+
+import base64
+import hashlib
+import json
+import os
+import socket
+import ssl
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from config import VOLUME_THRESHOLDS, assign_volume_bucket
+from exchanges.markets import MarketRecord, quote_usd_rates
+from snapshot import MarketSnapshot
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_CONTINUATION, OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x0, 0x1, 0x2, 0x8, 0x9, 0xA
+# Benchmarks and tests point streams at bench/ws_server.py, e.g. ws://127.0.0.1:8766
+WS_BASE_OVERRIDE_ENV = "WS_BASE_OVERRIDE"
+
+# (tv_symbol, base, quote, quote_volume, last_price); None keeps the previous value
+TickerUpdate = Tuple[str, str, str, Optional[float], Optional[float]]
+
+
+class WebSocketError(ConnectionError):
+    pass
+
+
+def route_ws_url(url: str) -> str:
+    """Rewrite ``wss://host/path`` to ``<WS_BASE_OVERRIDE>/host/path`` when the override is set."""
+    override = os.environ.get(WS_BASE_OVERRIDE_ENV)
+    if not override:
+        return url
+    return f"{override.rstrip('/')}/{url.split('://', 1)[-1]}"
+
+
+def encode_frame(payload: bytes, opcode: int = OP_TEXT, mask: bool = True) -> bytes:
+    """Encode one final frame; clients must mask, servers must not."""
+    header = bytearray([0x80 | opcode])
+    length = len(payload)
+    mask_bit = 0x80 if mask else 0
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 1 << 16:
+        header.append(mask_bit | 126)
+        header += struct.pack("!H", length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack("!Q", length)
+    if not mask:
+        return bytes(header) + payload
+    key = os.urandom(4)
+    return bytes(header) + key + apply_mask(payload, key)
+
+
+def apply_mask(payload: bytes, key: bytes) -> bytes:
+    if not payload:
+        return payload
+    repeated = (key * (len(payload) // 4 + 1))[:len(payload)]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(len(payload), "big")
+
+
+class FrameReader:
+    """Parses frames from a socket, keeping partial data across read timeouts."""
+
+    def __init__(self, sock: socket.socket, initial: bytes = b""):
+        self.sock = sock
+        self.buffer = bytearray(initial)
+
+    def _need(self, size: int) -> None:
+        while len(self.buffer) < size:
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                raise WebSocketError("connection closed")
+            self.buffer += chunk
+
+    def read_frame(self) -> Tuple[bool, int, bytes]:
+        """Return ``(fin, opcode, payload)``; raises ``socket.timeout`` with the buffer intact."""
+        self._need(2)
+        fin, opcode = bool(self.buffer[0] & 0x80), self.buffer[0] & 0x0F
+        masked, length = bool(self.buffer[1] & 0x80), self.buffer[1] & 0x7F
+        offset = 2
+        if length == 126:
+            self._need(4)
+            length = struct.unpack("!H", self.buffer[2:4])[0]
+            offset = 4
+        elif length == 127:
+            self._need(10)
+            length = struct.unpack("!Q", self.buffer[2:10])[0]
+            offset = 10
+        key = b""
+        if masked:
+            self._need(offset + 4)
+            key = bytes(self.buffer[offset:offset + 4])
+            offset += 4
+        self._need(offset + length)
+        payload = bytes(self.buffer[offset:offset + length])
+        del self.buffer[:offset + length]
+        return fin, opcode, apply_mask(payload, key) if masked else payload
+
+
+class WebSocket:
+    """Blocking RFC 6455 client with automatic ping replies."""
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        parts = urlsplit(url)
+        secure = parts.scheme == "wss"
+        host = parts.hostname or ""
+        port = parts.port or (443 if secure else 80)
+        sock = socket.create_connection((host, port), timeout=timeout)
+        if secure:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+        self.sock = sock
+        self.lock = threading.Lock()
+
+        key = base64.b64encode(os.urandom(16)).decode()
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+        request = (
+            f"GET {target} HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\nUser-Agent: tradingview-watchlist\r\n\r\n"
+        )
+        sock.sendall(request.encode())
+
+        response = b""
+        while b"\r\n\r\n" not in response:
+            chunk = sock.recv(4096)
+            if not chunk:
+                raise WebSocketError(f"handshake with {host} failed: connection closed")
+            response += chunk
+        head, _, rest = response.partition(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        if " 101 " not in f"{lines[0]} ":
+            raise WebSocketError(f"handshake with {host} failed: {lines[0]}")
+        headers = {name.strip().lower(): value.strip() for name, _, value in (line.partition(":") for line in lines[1:])}
+        expected = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        if headers.get("sec-websocket-accept") != expected:
+            raise WebSocketError(f"handshake with {host} failed: bad Sec-WebSocket-Accept")
+        self.reader = FrameReader(sock, rest)
+        # Fragments of a message still being received (survive read timeouts)
+        self.fragments: List[bytes] = []
+
+    def settimeout(self, timeout: Optional[float]) -> None:
+        self.sock.settimeout(timeout)
+
+    def send(self, text: str) -> None:
+        self._send(text.encode(), OP_TEXT)
+
+    def _send(self, payload: bytes, opcode: int) -> None:
+        with self.lock:
+            self.sock.sendall(encode_frame(payload, opcode))
+
+    def recv(self) -> Optional[str]:
+        """Return the next text message, or None once the server closed the stream."""
+        while True:
+            fin, opcode, payload = self.reader.read_frame()
+            if opcode == OP_PING:
+                self._send(payload, OP_PONG)
+            elif opcode == OP_CLOSE:
+                try:
+                    self._send(payload[:2], OP_CLOSE)
+                except OSError:
+                    pass
+                return None
+            elif opcode in (OP_TEXT, OP_BINARY, OP_CONTINUATION):
+                self.fragments.append(payload)
+                if fin:
+                    message, self.fragments = b"".join(self.fragments), []
+                    return message.decode("utf-8")
+
+    def close(self) -> None:
+        try:
+            self._send(struct.pack("!H", 1000), OP_CLOSE)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+@dataclass
+class StreamSpec:
+    """How to follow one exchange's ticker channel.
+
+    ``seed`` returns the REST markets to start from (and to subscribe to),
+    ``subscribe`` turns them into the messages sent after connecting, and
+    ``parse`` turns one decoded message into ticker updates.
+    """
+
+    exchange: str
+    market_type: str
+    url: str
+    parse: Callable[[Any], Iterable[TickerUpdate]]
+    seed: Callable[[], List[MarketRecord]] = list
+    subscribe: Callable[[List[MarketRecord]], List[str]] = lambda records: []
+    # Application-level keepalive some venues require (sent as-is every ping_interval seconds)
+    ping: Optional[str] = None
+    ping_interval: float = 20.0
+
+
+class LiveTable:
+    """Latest ``MarketRecord`` per symbol for one exchange and market type.
+
+    Ticker volumes arrive in the quote currency and are converted to USD
+    with rates priced from the table's own last prices, as in a REST run.
+    The rates start from the REST seed and follow the stream through
+    ``refresh_rates``.
+    """
+
+    def __init__(self, exchange: str, market_type: str, records: Iterable[MarketRecord] = ()):
+        self.exchange = exchange
+        self.market_type = market_type
+        self.lock = threading.Lock()
+        self.records: Dict[str, MarketRecord] = {record.tv_symbol: record for record in records}
+        self.usd_rates = quote_usd_rates(self.records.values())
+        self.updated_at: Optional[float] = None
+        self.updates = 0
+
+    def apply(self, updates: Iterable[TickerUpdate]) -> List[MarketRecord]:
+        """Merge ticker updates and return the records that changed."""
+        changed = []
+        with self.lock:
+            for tv_symbol, base, quote, quote_volume, last_price in updates:
+                previous = self.records.get(tv_symbol)
+                if previous is not None:
+                    base, quote = previous.base, previous.quote
+                    quote_volume = previous.quote_volume if quote_volume is None else quote_volume
+                    last_price = previous.last_price if last_price is None else last_price
+                record = MarketRecord(self.exchange, base, quote, tv_symbol, last_price=last_price,
+                                      market_type=self.market_type, quote_volume=quote_volume)
+                rate = self.usd_rates.get(record.quote)
+                if quote_volume is not None and rate is not None:
+                    record.usd_volume = quote_volume * rate
+                elif previous is not None and quote_volume is None:
+                    record.usd_volume = previous.usd_volume
+                self.records[tv_symbol] = record
+                changed.append(record)
+            if changed:
+                self.updated_at = time.time()
+                self.updates += len(changed)
+        return changed
+
+    def refresh_rates(self) -> List[MarketRecord]:
+        """Re-price the quote assets from the live records; return the records whose USD volume moved."""
+        changed = []
+        with self.lock:
+            self.usd_rates = quote_usd_rates(self.records.values())
+            for record in self.records.values():
+                if record.quote_volume is None:
+                    continue
+                rate = self.usd_rates.get(record.quote)
+                usd_volume = record.quote_volume * rate if rate is not None else None
+                if usd_volume != record.usd_volume:
+                    record.usd_volume = usd_volume
+                    changed.append(record)
+        return changed
+
+    def snapshot(self) -> MarketSnapshot:
+        """Freeze the table so the usual quote/volume filters can run against it."""
+        with self.lock:
+            return MarketSnapshot(self.exchange, tuple(self.records.values()))
+
+
+class VolumeHysteresis:
+    """Assigns symbols to volume buckets, only moving them once clearly across a boundary.
+
+    A symbol moves up into a bucket once its volume reaches the threshold
+    plus ``margin`` (a fraction), and drops out of its bucket only once the
+    volume falls below the threshold minus ``margin``.
+    """
+
+    def __init__(self, thresholds: Sequence[float] = VOLUME_THRESHOLDS, margin: float = 0.1):
+        self.thresholds = sorted(thresholds)
+        self.margin = margin
+        self.buckets: Dict[str, Optional[float]] = {}
+
+    def update(self, record: MarketRecord) -> bool:
+        """Re-evaluate one record; return True when its bucket changed."""
+        volume = record.usd_volume
+        raw = assign_volume_bucket(volume, self.thresholds)
+        if record.tv_symbol not in self.buckets:
+            self.buckets[record.tv_symbol] = raw
+            return True
+
+        current = self.buckets[record.tv_symbol]
+        new = current
+        if volume is None:
+            new = raw
+        elif current is None or (raw is not None and raw > current):
+            raised = assign_volume_bucket(volume / (1 + self.margin), self.thresholds)
+            if raised is not None and (current is None or raised > current):
+                new = raised
+        elif volume < current * (1 - self.margin):
+            new = assign_volume_bucket(volume * (1 + self.margin), self.thresholds)
+        if new != current:
+            self.buckets[record.tv_symbol] = new
+            return True
+        return False
+
+    def bucket(self, tv_symbol: str) -> Optional[float]:
+        return self.buckets.get(tv_symbol)
+
+
+@dataclass
+class StreamState:
+    connected: bool = False
+    connects: int = 0
+    messages: int = 0
+    last_message: Optional[float] = None
+    last_error: str = ""
+    errors: int = 0
+
+
+@dataclass
+class StreamWorker:
+    """Follows one ``StreamSpec`` in a background thread, reconnecting with backoff."""
+
+    spec: StreamSpec
+    table: LiveTable
+    on_change: Callable[[List[MarketRecord]], None] = lambda records: None
+    retry_delay: float = 1.0
+    max_backoff: float = 60.0
+    state: StreamState = field(default_factory=StreamState)
+
+    def __post_init__(self):
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name=f"stream-{self.spec.exchange}-{self.spec.market_type}", daemon=True)
+
+    def start(self) -> "StreamWorker":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+    def run(self) -> None:
+        failures = 0
+        while not self.stop_event.is_set():
+            try:
+                self.follow()
+                failures = 0
+            except Exception as e:
+                failures += 1
+                self.state.errors += 1
+                self.state.last_error = str(e)
+            self.state.connected = False
+            if not self.stop_event.is_set():
+                self.stop_event.wait(min(self.max_backoff, self.retry_delay * 2 ** max(0, failures - 1)))
+
+    def follow(self) -> None:
+        ws = WebSocket(route_ws_url(self.spec.url))
+        try:
+            with self.table.lock:
+                records = list(self.table.records.values())
+            for message in self.spec.subscribe(records):
+                ws.send(message)
+            ws.settimeout(1.0)
+            self.state.connected = True
+            self.state.connects += 1
+            last_ping = time.monotonic()
+            while not self.stop_event.is_set():
+                if self.spec.ping and time.monotonic() - last_ping >= self.spec.ping_interval:
+                    ws.send(self.spec.ping)
+                    last_ping = time.monotonic()
+                try:
+                    text = ws.recv()
+                except socket.timeout:
+                    continue
+                if text is None:
+                    raise WebSocketError(f"{self.spec.exchange} closed the stream")
+                try:
+                    message = json.loads(text)
+                except ValueError:
+                    continue  # e.g. OKX's plain-text "pong"
+                self.state.messages += 1
+                self.state.last_message = time.time()
+                changed = self.table.apply(self.spec.parse(message))
+                if changed:
+                    self.on_change(changed)
+        finally:
+            ws.close()
@@ -0,0 +1 @@
+"""OANDA forex/CFD/metal instrument lists (``forex/oanda.py``)."""
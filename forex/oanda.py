@@ -1,46 +1,78 @@
 import argparse
-from pathlib import Path
-import requests
-from typing import List
+import sys
 from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config import HTTP_CACHE_DIR, METADATA_TTL
+from exchanges import cache
+from exchanges.client import fetch_all
+from fileio import atomic_write_text
+
+# Benchmarks replay this endpoint from a local server (API_BASE_OVERRIDE, see exchanges/client.py)
+PRICES_URL = 'https://dashboard.acuitytrading.com/OandaPriceApi/GetPrices?apikey=4b12e6bb-7ecd-49f7-9bbc-2e03644ce41f&lang=en-GB'
+INSTRUMENT_TYPES = ['currency', 'cfd', 'metal']
+FOREX_DIR = Path(__file__).resolve().parent
+
+
+def fetch_oanda_symbols(instrument_types: Sequence[str] = INSTRUMENT_TYPES) -> Dict[str, List[str]]:
+    """Fetch every instrument type concurrently over the pooled session.
 
-def get_and_save_oanda_symbols(instrument_type: str):
-    """Fetch, format and save Oanda trading symbols for a specific instrument type."""
-    symbols = requests.post(
-        'https://dashboard.acuitytrading.com/OandaPriceApi/GetPrices?apikey=4b12e6bb-7ecd-49f7-9bbc-2e03644ce41f&lang=en-GB',
-        data={'lang': 'en-GB', 'region': 'OEL', 'instrumentType': instrument_type}
-    ).json()
-    
-    formatted_symbols = [
-        f"OANDA:{x['Instrument'].replace('_', '')}"
-        for x in symbols
-    ]
-    
-    # Save to file
+    The instrument universe rarely changes, so responses are cached for
+    ``METADATA_TTL`` seconds like other exchange metadata.
+    """
+    responses = fetch_all([
+        {
+            'url': PRICES_URL,
+            'method': 'POST',
+            'data': {'lang': 'en-GB', 'region': 'OEL', 'instrumentType': instrument_type},
+            'ttl': METADATA_TTL,
+        }
+        for instrument_type in instrument_types
+    ], exchange='oanda')
+    return {
+        instrument_type: sorted(f"OANDA:{x['Instrument'].replace('_', '')}" for x in instruments)
+        for instrument_type, instruments in zip(instrument_types, responses)
+    }
+
+
+def oanda_path(instrument_type: str, directory: Path = FOREX_DIR) -> Path:
     current_date = datetime.now().strftime('%d-%b-%y').lower()
-    filename = f"oanda_{instrument_type}_pairs_{current_date}.txt"
-    filepath = Path(__file__).resolve().parent / filename
+    return directory / f"oanda_{instrument_type}_pairs_{current_date}.txt"
+
+
+def save_oanda_symbols(symbols: List[str], instrument_type: str, directory: Path = FOREX_DIR) -> Path:
+    filepath = oanda_path(instrument_type, directory)
+    atomic_write_text(filepath, ',\n'.join(sorted(symbols)))
+    return filepath
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(',\n'.join(sorted(formatted_symbols)))
 
-    print(f"Saved {instrument_type} pairs to {filepath}")
-    return sorted(formatted_symbols)
+def run_oanda(instrument_types: Sequence[str] = INSTRUMENT_TYPES, directory: Path = FOREX_DIR) -> Dict[str, int]:
+    """Fetch and save each instrument type; return the symbol count per type."""
+    symbols = fetch_oanda_symbols(instrument_types)
+    for instrument_type, formatted in symbols.items():
+        save_oanda_symbols(formatted, instrument_type, directory)
+    return {instrument_type: len(formatted) for instrument_type, formatted in symbols.items()}
+
 
 def main():
     parser = argparse.ArgumentParser(description='Oanda tickers formatter')
-    parser.add_argument('-t', '--type', 
-                       nargs='*', 
-                       default=['currency', 'cfd', 'metal'],
+    parser.add_argument('-t', '--type',
+                       nargs='*',
+                       default=INSTRUMENT_TYPES,
                        help='Instrument types to fetch')
-    
+    parser.add_argument('--max-age', type=float, help='Accept cached responses up to this many seconds old')
+
     args = parser.parse_args()
-    
-    for inst_type in args.type:
-        symbols = get_and_save_oanda_symbols(inst_type)
-        print(f"\n{inst_type.upper()} Pairs:")
-        print(',\n'.join(symbols))
-        print("\n")
+    # Share the repo's HTTP cache even when started from forex/
+    cache.configure(max_age=args.max_age, directory=str(ROOT / HTTP_CACHE_DIR))
+
+    for inst_type, count in run_oanda(args.type).items():
+        print(f"Saved {count} {inst_type} pairs to {oanda_path(inst_type)}")
 
 if __name__ == "__main__":
     main()
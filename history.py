@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Historical market snapshots.
+
+``clean_old_files()`` keeps only today's watchlists, so every batch run also
+appends its normalized snapshot (exchange, symbol, quote, market type, USD
+volume, volume bucket, market cap) to one SQLite file. Markets are stored
+once and referenced by id, so a run costs one small row per market, and the
+indexes make questions like "how long has X been in 5M+" single queries:
+
+    python history.py BINANCE:BTCUSDT --bucket 5M+
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from cap_store import MarketCapStore
+from config import HISTORY_STORE, MARKET_CAP_STORE, VOLUME_THRESHOLDS, assign_volume_bucket, get_volume_bucket_label, parse_volume_bucket
+from exchanges.markets import MarketRecord
+
+
+@dataclass
+class BucketHistory:
+    tv_symbol: str
+    bucket: str
+    days: int
+    streak: int
+    first_seen: Optional[str]
+    last_seen: Optional[str]
+    total_days: int
+
+
+class HistoryStore:
+    def __init__(self, path: Path = Path(HISTORY_STORE)):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path), timeout=30)
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY,
+                run_at REAL NOT NULL,
+                day TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS runs_by_day ON runs (day);
+            CREATE TABLE IF NOT EXISTS markets (
+                id INTEGER PRIMARY KEY,
+                exchange TEXT NOT NULL,
+                market_type TEXT NOT NULL,
+                quote TEXT NOT NULL,
+                base TEXT NOT NULL,
+                tv_symbol TEXT NOT NULL,
+                UNIQUE (tv_symbol, market_type)
+            );
+            CREATE INDEX IF NOT EXISTS markets_by_exchange ON markets (exchange, market_type, quote);
+            CREATE TABLE IF NOT EXISTS observations (
+                market_id INTEGER NOT NULL REFERENCES markets (id),
+                run_id INTEGER NOT NULL REFERENCES runs (id),
+                usd_volume REAL,
+                bucket INTEGER,
+                market_cap REAL,
+                PRIMARY KEY (market_id, run_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS observations_by_run ON observations (run_id, bucket);
+            """
+        )
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def market_ids(self, records: Sequence[MarketRecord]) -> Dict[Tuple[str, str], int]:
+        """Ids of the records' markets, inserting new ones; only this run's keys are looked up."""
+        keys = {(record.tv_symbol, record.market_type): record for record in records}
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO markets (exchange, market_type, quote, base, tv_symbol) VALUES (?, ?, ?, ?, ?)",
+            [(r.exchange, r.market_type, r.quote, r.base, r.tv_symbol) for r in keys.values()],
+        )
+        self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS run_keys (tv_symbol TEXT NOT NULL, market_type TEXT NOT NULL)")
+        self.connection.execute("DELETE FROM run_keys")
+        self.connection.executemany("INSERT INTO run_keys VALUES (?, ?)", keys.keys())
+        # Joins through the UNIQUE (tv_symbol, market_type) index, so the cost follows the snapshot size
+        return {
+            (tv_symbol, market_type): market_id
+            for market_id, tv_symbol, market_type in self.connection.execute(
+                "SELECT m.id, m.tv_symbol, m.market_type FROM run_keys k "
+                "JOIN markets m ON m.tv_symbol = k.tv_symbol AND m.market_type = k.market_type"
+            )
+        }
+
+    def record_run(
+        self,
+        records: Iterable[MarketRecord],
+        market_caps: Optional[Dict[str, float]] = None,
+        buckets: Optional[Dict[Tuple[str, str], Optional[float]]] = None,
+        thresholds: Sequence[float] = VOLUME_THRESHOLDS,
+        run_at: Optional[float] = None,
+    ) -> int:
+        """Append one run and return its id.
+
+        ``buckets`` (keyed by ``(tv_symbol, market_type)``) says which list
+        each market was written to; markets missing from it were not listed
+        and get a NULL bucket. Without ``buckets``, buckets are derived from
+        each record's USD volume. Market caps are looked up by lowercase base
+        asset.
+        """
+        records = list(records)
+        market_caps = market_caps or {}
+        run_at = run_at or time.time()
+        with self.connection:
+            run_id = self.connection.execute(
+                "INSERT INTO runs (run_at, day) VALUES (?, ?)",
+                (run_at, datetime.fromtimestamp(run_at).strftime("%Y-%m-%d")),
+            ).lastrowid
+            ids = self.market_ids(records)
+            rows = {}
+            for record in records:
+                key = (record.tv_symbol, record.market_type)
+                bucket = buckets.get(key) if buckets is not None else assign_volume_bucket(record.usd_volume, thresholds)
+                rows[ids[key]] = (ids[key], run_id, record.usd_volume, bucket, market_caps.get(record.base.lower()))
+            self.connection.executemany("INSERT INTO observations VALUES (?, ?, ?, ?, ?)", rows.values())
+        return run_id
+
+    def bucket_history(self, tv_symbol: str, bucket: str, market_type: Optional[str] = None) -> BucketHistory:
+        """Days a symbol spent in a bucket, and its current streak of consecutive days there.
+
+        A day counts when any run that day saw the symbol in the bucket; the
+        streak is broken by a day with runs where it was elsewhere or absent.
+        """
+        min_volume = parse_volume_bucket(bucket)
+        market_filter = "AND m.market_type = ?" if market_type else ""
+        params = [tv_symbol] + ([market_type] if market_type else [])
+        in_bucket = {
+            day for (day,) in self.connection.execute(
+                f"""
+                SELECT DISTINCT r.day FROM observations o
+                JOIN markets m ON m.id = o.market_id
+                JOIN runs r ON r.id = o.run_id
+                WHERE m.tv_symbol = ? {market_filter} AND o.bucket = ?
+                """,
+                params + [min_volume],
+            )
+        }
+        run_days = [day for (day,) in self.connection.execute("SELECT DISTINCT day FROM runs ORDER BY day DESC")]
+        streak = 0
+        for day in run_days:
+            if day not in in_bucket:
+                break
+            streak += 1
+        ordered = sorted(in_bucket)
+        return BucketHistory(
+            tv_symbol, get_volume_bucket_label(min_volume), len(ordered), streak,
+            ordered[0] if ordered else None, ordered[-1] if ordered else None, len(run_days),
+        )
+
+    def timeline(self, tv_symbol: str) -> List[Tuple[str, str, Optional[float], Optional[str], Optional[float]]]:
+        """Return (day, market type, last USD volume, bucket label, market cap) per day, oldest first."""
+        rows = self.connection.execute(
+            """
+            SELECT r.day, m.market_type, o.usd_volume, o.bucket, o.market_cap FROM observations o
+            JOIN markets m ON m.id = o.market_id
+            JOIN runs r ON r.id = o.run_id
+            WHERE m.tv_symbol = ?
+            ORDER BY r.run_at
+            """,
+            (tv_symbol,),
+        )
+        latest: Dict[Tuple[str, str], tuple] = {}
+        for day, market_type, usd_volume, bucket, market_cap in rows:
+            label = get_volume_bucket_label(bucket) if bucket is not None else None
+            latest[(day, market_type)] = (day, market_type, usd_volume, label, market_cap)
+        return list(latest.values())
+
+
+def stored_market_caps(bases: Iterable[str], store_path: Path = Path(MARKET_CAP_STORE)) -> Dict[str, float]:
+    """Lowercase base -> market cap from the cap store, without touching the network."""
+    if not store_path.exists():
+        return {}
+    with MarketCapStore(store_path) as store:
+        return {symbol: info[0] for symbol, info in store.lookup({base.lower() for base in bases}).items()}
+
+
+def record_history(
+    records: Iterable[MarketRecord],
+    market_caps: Optional[Dict[str, float]] = None,
+    buckets: Optional[Dict[Tuple[str, str], Optional[float]]] = None,
+    store_path: Optional[Path] = None,
+) -> int:
+    """Append one run to the history store, with market caps from the cap store."""
+    records = list(records)
+    if market_caps is None:
+        market_caps = stored_market_caps(record.base for record in records)
+    with HistoryStore(Path(store_path or HISTORY_STORE)) as store:
+        return store.record_run(records, market_caps, buckets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the market snapshot history')
+    parser.add_argument('symbol', help='TradingView symbol, e.g. BINANCE:BTCUSDT or BYBIT:BTCUSDT.P')
+    parser.add_argument('--bucket', help='Report days spent in this volume bucket (e.g. 5M+)')
+    parser.add_argument('--market-type', choices=['spot', 'perp'], help='Restrict to one market type')
+    parser.add_argument('--store', default=HISTORY_STORE, help=f'History database (default: {HISTORY_STORE})')
+    args = parser.parse_args()
+
+    if not Path(args.store).exists():
+        print(f"❌ No history at {args.store} yet; run batch_update.py first")
+        return
+
+    with HistoryStore(Path(args.store)) as store:
+        if args.bucket:
+            result = store.bucket_history(args.symbol, args.bucket, args.market_type)
+            print(f"📈 {result.tv_symbol} in {result.bucket}: {result.days}/{result.total_days} days, "
+                  f"current streak {result.streak} days")
+            if result.first_seen:
+                print(f"   first {result.first_seen}, last {result.last_seen}")
+            return
+        rows = [row for row in store.timeline(args.symbol) if not args.market_type or row[1] == args.market_type]
+        if not rows:
+            print(f"○ No history for {args.symbol}")
+        for day, market_type, usd_volume, bucket, market_cap in rows:
+            volume = f"${usd_volume:,.0f}" if usd_volume is not None else "n/a"
+            cap = f"${market_cap:,.0f}" if market_cap is not None else "n/a"
+            print(f"{day}  {market_type:<4}  {bucket or '-':<10}  vol {volume:>18}  cap {cap:>20}")
+
+
+if __name__ == "__main__":
+    main()
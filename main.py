@@ -1,38 +1,109 @@
 import argparse
-import importlib
+import glob
 import os
 import sys
 from datetime import datetime
 
-from config import get_volume_bucket_label
+from config import VOLUME_THRESHOLDS, get_volume_bucket_label
+from exchanges.registry import ADAPTERS, get_adapter
+from fileio import atomic_write_text
 
 
-def save_pairs(symbols, exchange, quote_asset, min_volume, market_type='spot'):
+def pairs_path(exchange, quote_asset, min_volume, market_type='spot'):
     current_date = datetime.now().strftime('%d-%b-%y').lower()
     asset_name = quote_asset if quote_asset else 'ALL'
     volume_dir = f"vol_{get_volume_bucket_label(min_volume)}"
-    output_dir = os.path.join('output', volume_dir)
-    
-    # Create directories if they don't exist
-    os.makedirs(output_dir, exist_ok=True)
-    
     market_tag = f"_{market_type}" if market_type != 'spot' else ''
     filename = f"{exchange}_{asset_name}{market_tag}_pairs_{current_date}.txt"
-    filepath = os.path.join(output_dir, filename)
+    return os.path.join('output', volume_dir, filename)
+
+def clean_old_files(data_dirs=("forex", "stocks")):
+    """Remove data files not dated today (crypto watchlists, plus ``data_dirs``)"""
+    current_date = datetime.now().strftime('%d-%b-%y').lower()
+    print(f"🧹 Cleaning old files (keeping {current_date})...")
+    
+    removed_count = 0
+    
+    # Clean crypto files (both spot and perpetual)
+    for volume in VOLUME_THRESHOLDS:
+        vol_dir = f"output/vol_{get_volume_bucket_label(volume)}"
+        if os.path.exists(vol_dir):
+            pattern = f"{vol_dir}/*pairs*.txt"
+            for file_path in glob.glob(pattern):
+                filename = os.path.basename(file_path)
+                if current_date not in filename:
+                    os.remove(file_path)
+                    removed_count += 1
+                    print(f"  🗑️  Removed: {filename}")
+    
+    # Clean forex and stocks files
+    for data_dir in data_dirs:
+        if os.path.exists(data_dir):
+            pattern = f"{data_dir}/*.txt"
+            for file_path in glob.glob(pattern):
+                filename = os.path.basename(file_path)
+                if current_date not in filename:
+                    os.remove(file_path)
+                    removed_count += 1
+                    print(f"  🗑️  Removed: {filename}")
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(',\n'.join(sorted(symbols)))
+    print(f"✓ Removed {removed_count} old files\n")
+
+def save_pairs(symbols, exchange, quote_asset, min_volume, market_type='spot'):
+    filepath = pairs_path(exchange, quote_asset, min_volume, market_type)
+    
+    # Create directories if they don't exist
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    
+    atomic_write_text(filepath, ',\n'.join(sorted(symbols)))
     return filepath
 
+def write_if_changed(symbols, exchange, quote_asset, min_volume, market_type='spot'):
+    """Write a watchlist only when its membership changed; drop it when it became empty."""
+    path = pairs_path(exchange, quote_asset, min_volume, market_type)
+    if not symbols:
+        if os.path.exists(path):
+            os.remove(path)
+            return True
+        return False
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == ',\n'.join(sorted(symbols)):
+                return False
+    except OSError:
+        pass
+    save_pairs(symbols, exchange, quote_asset, min_volume, market_type)
+    return True
+
+def list_exchanges():
+    print(f"{'exchange':<10} {'capabilities':<28} {'req/s':>5}  quotes")
+    for adapter in ADAPTERS.values():
+        quotes = ' '.join(adapter.quotes)
+        if adapter.futures:
+            quotes += f" | perp: {' '.join(adapter.futures_quotes)}"
+        print(f"{adapter.name:<10} {', '.join(adapter.capabilities()):<28} {adapter.rate_limit:>5g}  {quotes}")
+
 def main():
     parser = argparse.ArgumentParser(description='Unified Crypto Exchange Watchlist Generator')
-    parser.add_argument('--exchange', required=True, help='Exchange name')
+    parser.add_argument('--exchange', choices=list(ADAPTERS), metavar='EXCHANGE', help='Exchange name (see --list-exchanges)')
+    parser.add_argument('--list-exchanges', action='store_true', help='List supported exchanges and their capabilities')
     parser.add_argument('--quote-asset', help='Filter by quote asset')
     parser.add_argument('--min-volume', type=float, help='Minimum 24h volume')
     parser.add_argument('--debug', action='store_true', help='Show debug information')
     parser.add_argument('--futures', action='store_true', help='Fetch perpetual futures (.P) symbols instead of spot')
+    parser.add_argument('--offline', action='store_true', help='Serve every API response from the local cache')
+    parser.add_argument('--max-age', type=float, help='Accept cached API responses up to this many seconds old')
     
     args = parser.parse_args()
+    if args.list_exchanges:
+        list_exchanges()
+        return
+    if not args.exchange:
+        parser.error('--exchange is required (see --list-exchanges)')
+
+    # Imported here so --help and --list-exchanges skip the HTTP stack
+    from exchanges import cache
+    cache.configure(offline=args.offline, max_age=args.max_age)
     
     if args.debug:
         print(f"Python path: {sys.path}")
@@ -40,14 +111,14 @@ def main():
         print(f"Directory contents: {os.listdir('.')}")
         print(f"Exchanges directory contents: {os.listdir('exchanges')}")
     
-    exchange_module = importlib.import_module(f'exchanges.{args.exchange}.volume_filtered.pairs')
+    adapter = get_adapter(args.exchange)
+    if args.futures and not adapter.futures:
+        print(f"Warning: {args.exchange} does not support futures/perpetual symbols")
+        return
+    exchange_module = adapter.load()
     
     if args.futures:
-        if hasattr(exchange_module, 'get_futures_symbols'):
-            symbols = exchange_module.get_futures_symbols(args.quote_asset, args.min_volume)
-        else:
-            print(f"Warning: {args.exchange} does not support futures/perpetual symbols")
-            return
+        symbols = exchange_module.get_futures_symbols(args.quote_asset, args.min_volume)
     else:
         symbols = exchange_module.get_spot_symbols(args.quote_asset, args.min_volume)
     
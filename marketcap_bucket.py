@@ -3,24 +3,39 @@
 
 from __future__ import annotations
 
-import time
-from dataclasses import dataclass
+import argparse
+import json
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
-import requests
+import timing
+from cap_store import load_market_caps
+from config import MARKET_CAP_MAX_AGE, MARKET_CAP_TTL, REPORT_WORKERS, VOLUME_BUCKETS
+from exchanges import cache
+from exchanges.client import get_json
+from exchanges.markets import tv_symbol_base
+from fileio import atomic_write_text, text_digest
+from symbol_index import IndexEntry, write_symbol_index
 
-from config import VOLUME_BUCKETS
 CAP_BUCKETS: List[Tuple[str, int, Optional[int]]] = [
     ("10M-100M", 10_000_000, 100_000_000),
     ("100M-500M", 100_000_000, 500_000_000),
     ("500M+", 500_000_000, None),
 ]
 MIN_MARKET_CAP = CAP_BUCKETS[0][1]
+# Lower edges of the (contiguous, ascending) cap buckets for bisect lookups
+CAP_EDGES: List[int] = [min_cap for _, min_cap, _ in CAP_BUCKETS]
 COINGECKO_URL = "https://api.coingecko.com/api/v3/coins/markets"
+COINGECKO_PAGE_SIZE = 250
 BLACKLIST_PATH = Path("crypto_blacklist.txt")
 OUTPUT_DIR = Path("output")
+MANIFEST_PATH = OUTPUT_DIR / ".cache" / "marketcap_manifest.json"
+MANIFEST_VERSION = 2
 
 
 @dataclass(frozen=True)
@@ -52,6 +67,26 @@ class RankedRecord:
     market_cap: float
     rank_score: int
     source_file: Path
+    # Derived once in rank_exchanges() and shared by every report
+    blacklisted: bool = False
+    market_cap_text: str = ""
+    is_perp: bool = False
+
+    @property
+    def status(self) -> str:
+        return "❌ SKIP" if self.blacklisted else "✅ OK"
+
+    def table_row(self, rank: int) -> str:
+        return f"| {rank} | {self.symbol} | {self.market_cap_text} | {self.cap_bucket} | {self.volume_bucket} | {self.status} |"
+
+
+@dataclass(frozen=True)
+class ExchangeRanking:
+    exchange: str
+    # Strongest first: rank score, then market cap, then symbol
+    records: List[RankedRecord]
+    spot: List[RankedRecord]
+    perp: List[RankedRecord]
 
 
 VOLUME_PRIORITY = {
@@ -67,65 +102,39 @@ CAP_PRIORITY = {
 }
 
 
-def fetch_market_caps() -> Dict[str, float]:
-    """Fetch a symbol -> market cap map from CoinGecko."""
-    session = requests.Session()
-    symbol_caps: Dict[str, float] = {}
-    page = 1
-
-    while True:
-        response = None
-        for attempt in range(4):
-            response = session.get(
-                COINGECKO_URL,
-                params={
-                    "vs_currency": "usd",
-                    "order": "market_cap_desc",
-                    "per_page": 250,
-                    "page": page,
-                    "sparkline": "false",
-                },
-                timeout=60,
-            )
-            if response.status_code != 429:
-                break
-
-            wait_seconds = int(response.headers.get("Retry-After", "10"))
-            time.sleep(wait_seconds + attempt)
-
-        if response is None:
-            break
-
-        response.raise_for_status()
-        coins = response.json()
-        if not coins:
-            break
-
-        page_min_cap: Optional[float] = None
-
-        for coin in coins:
-            symbol = str(coin.get("symbol", "")).strip().lower()
-            market_cap = coin.get("market_cap")
-            if not symbol or market_cap is None:
-                continue
-
-            if page_min_cap is None or market_cap < page_min_cap:
-                page_min_cap = float(market_cap)
-
-            current_cap = symbol_caps.get(symbol)
-            if current_cap is None or market_cap > current_cap:
-                symbol_caps[symbol] = float(market_cap)
+def fetch_market_cap_page(page: int) -> List[dict]:
+    """Fetch one page of CoinGecko's market-cap ranked coin list.
 
-        if page_min_cap is not None and page_min_cap < MIN_MARKET_CAP:
-            break
-
-        if len(coins) < 250:
-            break
-
-        page += 1
-        time.sleep(1.0)
-
-    return symbol_caps
+    Pages go through the shared HTTP client, so they are cached on disk for
+    MARKET_CAP_TTL seconds and paced by the ``coingecko`` rate limiter.
+    """
+    return get_json(
+        COINGECKO_URL,
+        params={
+            "vs_currency": "usd",
+            "order": "market_cap_desc",
+            "per_page": COINGECKO_PAGE_SIZE,
+            "page": page,
+            "sparkline": "false",
+        },
+        exchange="coingecko",
+        timeout=60,
+        ttl=MARKET_CAP_TTL,
+    )
+
+
+def fetch_market_caps(symbols: Iterable[str], max_age: float = MARKET_CAP_MAX_AGE) -> Dict[str, float]:
+    """Return a symbol -> market cap map for ``symbols`` from the persistent cap store.
+
+    Only the CoinGecko pages holding stale symbols are re-fetched.
+    """
+    return load_market_caps(
+        symbols,
+        fetch_market_cap_page,
+        min_cap=MIN_MARKET_CAP,
+        page_size=COINGECKO_PAGE_SIZE,
+        max_age=max_age,
+    )
 
 
 def read_symbols(file_path: Path) -> List[str]:
@@ -148,25 +157,34 @@ def read_blacklist() -> set[str]:
     return blocked
 
 
-def extract_blacklist_key(symbol: str, quote_asset: str) -> str:
-    """Extract the base symbol for blacklist checking, handling .P suffix."""
-    if ":" in symbol:
-        core = symbol.split(":", 1)[1]
-    else:
-        core = symbol
+def symbol_core(symbol: str) -> str:
+    """Strip the exchange prefix and perpetual suffixes: BINANCE:BTCUSDT.P -> BTCUSDT, OKX:BTC-USDT-SWAP -> BTC-USDT."""
+    core = symbol.split(":", 1)[-1].strip()
     if core.endswith(".P"):
         core = core[:-2]
+    if core.endswith("-SWAP"):
+        core = core[:-5]
+    return core
+
+
+def extract_blacklist_key(symbol: str, quote_asset: str) -> str:
+    """Extract the base symbol for blacklist checking, handling .P and -SWAP suffixes."""
+    core = symbol_core(symbol)
+    if "-" in core:
+        return core.split("-", 1)[0]
     if core.upper().endswith(quote_asset.upper()):
         core = core[:-len(quote_asset)]
     return core
 
 
+@lru_cache(maxsize=None)
 def extract_base_symbol(tv_symbol: str, quote_asset: str) -> Optional[str]:
-    core = tv_symbol.split(":", 1)[-1].strip()
-    # Strip .P suffix for perpetual futures
-    if core.endswith(".P"):
-        core = core[:-2]
+    core = symbol_core(tv_symbol)
     quote_asset = quote_asset.upper()
+    # Dash-separated instruments (OKX:BTC-USDT-SWAP)
+    if "-" in core:
+        base, _, quote = core.partition("-")
+        return base if quote.upper() == quote_asset and base else None
     if not core.endswith(quote_asset):
         return None
     base = core[: -len(quote_asset)]
@@ -182,28 +200,19 @@ def matches_cap_bucket(market_cap: float, min_cap: int, max_cap: Optional[int])
 
 
 def get_cap_bucket_label(market_cap: float) -> Optional[str]:
-    for label, min_cap, max_cap in CAP_BUCKETS:
-        if matches_cap_bucket(market_cap, min_cap, max_cap):
-            return label
-    return None
+    index = bisect_right(CAP_EDGES, market_cap) - 1
+    if index < 0:
+        return None
+    label, min_cap, max_cap = CAP_BUCKETS[index]
+    if not matches_cap_bucket(market_cap, min_cap, max_cap):
+        return None
+    return label
 
 
 def score_record(volume_bucket: str, cap_bucket: str) -> int:
     return (CAP_PRIORITY.get(cap_bucket, 0) * 10) + VOLUME_PRIORITY.get(volume_bucket, 0)
 
 
-def clean_existing_cap_files() -> None:
-    for volume_bucket in VOLUME_BUCKETS:
-        base_dir = OUTPUT_DIR / f"vol_{volume_bucket}"
-        if not base_dir.exists():
-            continue
-        for cap_label, _, _ in CAP_BUCKETS:
-            cap_dir = base_dir / f"cap_{cap_label}"
-            if cap_dir.exists():
-                for old_file in cap_dir.glob("*.txt"):
-                    old_file.unlink(missing_ok=True)
-
-
 def clean_previous_reports() -> None:
     for report_name in [
         "crypto_marketcap_summary.csv",
@@ -236,16 +245,9 @@ def parse_source_metadata(source_file: Path) -> Tuple[str, str, str]:
     return exchange, quote_asset, volume_bucket
 
 
-def build_market_cap_buckets() -> List[BucketResult]:
-    """Create nested cap folders under each volume bucket."""
-    symbol_caps = fetch_market_caps()
-    blacklist = read_blacklist()
-    results: List[BucketResult] = []
-    records: List[SymbolRecord] = []
-
-    clean_existing_cap_files()
-    clean_previous_reports()
-
+def list_source_files() -> List[Tuple[Path, List[str]]]:
+    """Return every volume-bucket pair file with its symbols."""
+    sources: List[Tuple[Path, List[str]]] = []
     for volume_bucket in VOLUME_BUCKETS:
         source_dir = OUTPUT_DIR / f"vol_{volume_bucket}"
         if not source_dir.exists():
@@ -259,52 +261,213 @@ def build_market_cap_buckets() -> List[BucketResult]:
             if len(parts) < 4:
                 continue
 
-            exchange, quote_asset, volume_bucket_label = parse_source_metadata(source_file)
-            symbols = read_symbols(source_file)
-
-            for cap_label, min_cap, max_cap in CAP_BUCKETS:
-                filtered: List[str] = []
-                for symbol in symbols:
-                    base_symbol = extract_base_symbol(symbol, quote_asset)
-                    if not base_symbol:
-                        continue
-
-                    if base_symbol.lower() in blacklist or symbol.lower() in blacklist:
-                        continue
-
-                    market_cap = symbol_caps.get(base_symbol.lower())
-                    if market_cap is None:
-                        continue
-
-                    if matches_cap_bucket(market_cap, min_cap, max_cap):
-                        filtered.append(symbol)
-                        records.append(
-                            SymbolRecord(
-                                exchange=exchange,
-                                quote_asset=quote_asset,
-                                volume_bucket=volume_bucket_label,
-                                source_file=source_file,
-                                tv_symbol=symbol,
-                                base_symbol=base_symbol,
-                                market_cap=market_cap,
-                                cap_bucket=cap_label,
-                            )
-                        )
-
-                if not filtered:
-                    continue
-
-                cap_dir = source_dir / f"cap_{cap_label}"
-                cap_dir.mkdir(parents=True, exist_ok=True)
-                output_file = cap_dir / source_file.name
-                unique_symbols = sorted(set(filtered))
-                output_file.write_text(",\n".join(unique_symbols), encoding="utf-8")
-                results.append(BucketResult(cap_label, output_file, len(unique_symbols)))
-
-    if records:
-        write_summary_reports(records, blacklist)
-        write_exchange_rankings(records, blacklist)
+            sources.append((source_file, read_symbols(source_file)))
+    return sources
+
+
+def collect_base_symbols(sources: List[Tuple[Path, List[str]]]) -> set[str]:
+    """Lowercase base assets present in today's volume files."""
+    bases: set[str] = set()
+    for source_file, symbols in sources:
+        _, quote_asset, _ = parse_source_metadata(source_file)
+        for symbol in symbols:
+            base_symbol = extract_base_symbol(symbol, quote_asset)
+            if base_symbol:
+                bases.add(base_symbol.lower())
+    return bases
+
+
+def cap_snapshot_version(symbol_caps: Dict[str, float], blacklist: set[str]) -> str:
+    """Fingerprint of the cap bucket of every symbol and the blacklist.
+
+    Caps drift on every refresh, so only a symbol moving to another bucket
+    (or the blacklist changing) invalidates the cached assignments.
+    """
+    buckets = sorted(
+        (symbol, label) for symbol, label in
+        ((symbol, get_cap_bucket_label(cap)) for symbol, cap in symbol_caps.items()) if label is not None
+    )
+    return text_digest(json.dumps([buckets, sorted(blacklist)]))
+
+
+def load_manifest() -> dict:
+    try:
+        manifest = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get("version") == MANIFEST_VERSION else {}
+
+
+def save_manifest(manifest: dict) -> None:
+    atomic_write_text(MANIFEST_PATH, json.dumps(manifest, separators=(",", ":")))
+
+
+def record_to_json(record: SymbolRecord) -> list:
+    return [
+        record.exchange, record.quote_asset, record.volume_bucket, record.source_file.as_posix(),
+        record.tv_symbol, record.base_symbol, record.market_cap, record.cap_bucket,
+    ]
+
+
+def record_from_json(values: list) -> SymbolRecord:
+    exchange, quote_asset, volume_bucket, source_file, tv_symbol, base_symbol, market_cap, cap_bucket = values
+    return SymbolRecord(exchange, quote_asset, volume_bucket, Path(source_file), tv_symbol, base_symbol, market_cap, cap_bucket)
+
+
+def bucket_source(source_file: Path, symbols: List[str], symbol_caps: Dict[str, float], blacklist: set[str]) -> List[SymbolRecord]:
+    """Assign every symbol of one volume file to its cap bucket in a single pass."""
+    exchange, quote_asset, volume_bucket_label = parse_source_metadata(source_file)
+    records: List[SymbolRecord] = []
+
+    for symbol in symbols:
+        base_symbol = extract_base_symbol(symbol, quote_asset)
+        if not base_symbol:
+            continue
+
+        base_key = base_symbol.lower()
+        if base_key in blacklist or symbol.lower() in blacklist:
+            continue
+
+        market_cap = symbol_caps.get(base_key)
+        if market_cap is None:
+            continue
+
+        cap_label = get_cap_bucket_label(market_cap)
+        if cap_label is None:
+            continue
+
+        records.append(
+            SymbolRecord(
+                exchange=exchange,
+                quote_asset=quote_asset,
+                volume_bucket=volume_bucket_label,
+                source_file=source_file,
+                tv_symbol=symbol,
+                base_symbol=base_symbol,
+                market_cap=market_cap,
+                cap_bucket=cap_label,
+            )
+        )
+    return records
+
+
+def index_entries(sources: List[Tuple[Path, List[str]]], symbol_caps: Dict[str, float], blacklist: set[str]) -> List[IndexEntry]:
+    """One symbol-index row per listed symbol, capped or not."""
+    entries: List[IndexEntry] = []
+    for source_file, symbols in sources:
+        exchange, quote_asset, volume_bucket_label = parse_source_metadata(source_file)
+        market_type = "perp" if "_perp_" in source_file.name else "spot"
+        for symbol in symbols:
+            base_symbol = (extract_base_symbol(symbol, quote_asset) or tv_symbol_base(symbol, quote_asset)).upper()
+            market_cap = symbol_caps.get(base_symbol.lower())
+            blacklisted = base_symbol.lower() in blacklist or symbol.lower() in blacklist
+            cap_label = get_cap_bucket_label(market_cap) if market_cap is not None and not blacklisted else None
+            entries.append(IndexEntry(symbol, base_symbol, exchange.lower(), quote_asset.upper(), market_type,
+                                      volume_bucket_label, cap_label or "", market_cap))
+    return entries
+
+
+def write_cap_files(source_file: Path, records: List[SymbolRecord]) -> Dict[str, int]:
+    """Write one cap file per bucket for a source; return output path -> symbol count."""
+    grouped: Dict[str, set[str]] = {}
+    for record in records:
+        grouped.setdefault(record.cap_bucket, set()).add(record.tv_symbol)
+
+    outputs: Dict[str, int] = {}
+    for cap_label, symbols in grouped.items():
+        output_file = source_file.parent / f"cap_{cap_label}" / source_file.name
+        unique_symbols = sorted(symbols)
+        atomic_write_text(output_file, ",\n".join(unique_symbols))
+        outputs[output_file.as_posix()] = len(unique_symbols)
+    return outputs
+
 
+def existing_cap_files() -> List[Path]:
+    files: List[Path] = []
+    for volume_bucket in VOLUME_BUCKETS:
+        base_dir = OUTPUT_DIR / f"vol_{volume_bucket}"
+        for cap_label, _, _ in CAP_BUCKETS:
+            cap_dir = base_dir / f"cap_{cap_label}"
+            if cap_dir.exists():
+                files.extend(cap_dir.glob("*.txt"))
+    return files
+
+
+def build_market_cap_buckets(cap_max_age: float = MARKET_CAP_MAX_AGE, incremental: bool = False) -> List[BucketResult]:
+    """Create nested cap folders under each volume bucket.
+
+    New files are written atomically before stale ones are removed, so an
+    interrupted run never leaves an empty watchlist behind. With
+    ``incremental`` a manifest of source-file hashes and the cap bucket
+    assignment lets unchanged sources, and the per-exchange rankings that only
+    depend on them, be skipped entirely; caps that moved within their bucket
+    only rewrite the reports.
+    """
+    with timing.span("read_sources", "marketcap"):
+        sources = list_source_files()
+    with timing.span("fetch_caps", "marketcap", "coingecko", profile=True):
+        symbol_caps = fetch_market_caps(collect_base_symbols(sources), cap_max_age)
+    blacklist = read_blacklist()
+    cap_version = cap_snapshot_version(symbol_caps, blacklist)
+
+    manifest = load_manifest() if incremental else {}
+    previous_sources: Dict[str, dict] = manifest.get("sources", {}) if manifest.get("cap_version") == cap_version else {}
+    current_sources: Dict[str, dict] = {}
+    changed_exchanges: set[str] = set()
+    results: List[BucketResult] = []
+    records: List[SymbolRecord] = []
+
+    with timing.span("bucket", "marketcap", profile=True):
+        for source_file, symbols in sources:
+            key = source_file.as_posix()
+            source_hash = text_digest(",\n".join(symbols))
+            cached = previous_sources.get(key)
+
+            if cached and cached["hash"] == source_hash and all(Path(path).exists() for path in cached["outputs"]):
+                # Same buckets as last run; only the reported caps need refreshing
+                cached_records = [record_from_json(values) for values in cached["records"]]
+                source_records = [
+                    replace(record, market_cap=symbol_caps.get(record.base_symbol.lower(), record.market_cap))
+                    for record in cached_records
+                ]
+                outputs = cached["outputs"]
+                if source_records != cached_records:
+                    # Cap files stay as they are, but the reports show the caps
+                    changed_exchanges.add(parse_source_metadata(source_file)[0])
+            else:
+                source_records = bucket_source(source_file, symbols, symbol_caps, blacklist)
+                outputs = write_cap_files(source_file, source_records)
+                changed_exchanges.add(parse_source_metadata(source_file)[0])
+
+            current_sources[key] = {
+                "hash": source_hash,
+                "outputs": outputs,
+                "records": [record_to_json(record) for record in source_records],
+            }
+            records.extend(source_records)
+            for path, count in outputs.items():
+                results.append(BucketResult(Path(path).parent.name.replace("cap_", ""), Path(path), count))
+
+        # Remove cap files no current source produced (and note whose they were)
+        keep = {path for source in current_sources.values() for path in source["outputs"]}
+        for cap_file in existing_cap_files():
+            if cap_file.as_posix() not in keep:
+                cap_file.unlink(missing_ok=True)
+                changed_exchanges.add(parse_source_metadata(cap_file)[0])
+        for key in previous_sources.keys() - current_sources.keys():
+            changed_exchanges.add(parse_source_metadata(Path(key))[0])
+
+    with timing.span("reports", "marketcap"):
+        if not records:
+            clean_previous_reports()
+        elif not incremental or changed_exchanges or not manifest:
+            write_summary_reports(records, blacklist)
+            write_exchange_rankings(records, blacklist, None if not incremental else changed_exchanges)
+
+    with timing.span("index", "marketcap"):
+        write_symbol_index(index_entries(sources, symbol_caps, blacklist))
+
+    save_manifest({"version": MANIFEST_VERSION, "cap_version": cap_version, "sources": current_sources})
     return results
 
 
@@ -321,7 +484,7 @@ def write_summary_reports(records: List[SymbolRecord], blacklist: set[str]) -> N
         csv_lines.append(
             f"{record.exchange},{record.quote_asset},{record.volume_bucket},{record.cap_bucket},{record.tv_symbol},{record.base_symbol},{int(record.market_cap)},{record.source_file.name}"
         )
-    csv_path.write_text("\n".join(csv_lines) + "\n", encoding="utf-8")
+    atomic_write_text(csv_path, "\n".join(csv_lines) + "\n")
 
     grouped: Dict[Tuple[str, str, str], int] = {}
     for record in records:
@@ -346,14 +509,27 @@ def write_summary_reports(records: List[SymbolRecord], blacklist: set[str]) -> N
             f"- {record.exchange} | {record.volume_bucket} | {record.cap_bucket} | {record.tv_symbol} | ${int(record.market_cap):,}"
         )
 
-    md_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    atomic_write_text(md_path, "\n".join(lines) + "\n")
+
 
+def is_blacklisted(symbol: str, quote_asset: str, blacklist: set[str]) -> bool:
+    return extract_blacklist_key(symbol, quote_asset).lower() in blacklist or symbol.lower() in blacklist
 
-def build_ranked_records(records: List[SymbolRecord]) -> List[RankedRecord]:
-    ranked: List[RankedRecord] = []
+
+def rank_exchanges(records: List[SymbolRecord], blacklist: set[str]) -> List[ExchangeRanking]:
+    """Keep each symbol's best-scoring record per exchange and derive its report fields once."""
+    best_records: Dict[Tuple[str, str], SymbolRecord] = {}
+    best_scores: Dict[Tuple[str, str], Tuple[int, float]] = {}
     for record in records:
-        rank_score = score_record(record.volume_bucket, record.cap_bucket)
-        ranked.append(
+        key = (record.exchange, record.tv_symbol)
+        score = (score_record(record.volume_bucket, record.cap_bucket), record.market_cap)
+        if key not in best_scores or score > best_scores[key]:
+            best_records[key] = record
+            best_scores[key] = score
+
+    by_exchange: Dict[str, List[RankedRecord]] = {}
+    for key, record in best_records.items():
+        by_exchange.setdefault(record.exchange, []).append(
             RankedRecord(
                 exchange=record.exchange,
                 symbol=record.tv_symbol,
@@ -361,41 +537,39 @@ def build_ranked_records(records: List[SymbolRecord]) -> List[RankedRecord]:
                 volume_bucket=record.volume_bucket,
                 cap_bucket=record.cap_bucket,
                 market_cap=record.market_cap,
-                rank_score=rank_score,
+                rank_score=best_scores[key][0],
                 source_file=record.source_file,
+                blacklisted=is_blacklisted(record.tv_symbol, record.quote_asset, blacklist),
+                market_cap_text=f"${int(record.market_cap):,}",
+                is_perp="_perp_" in record.source_file.name,
             )
         )
-    return ranked
 
+    rankings = []
+    for exchange in sorted(by_exchange.keys()):
+        exchange_records = sorted(by_exchange[exchange], key=lambda item: (-item.rank_score, -item.market_cap, item.symbol))
+        rankings.append(ExchangeRanking(
+            exchange,
+            exchange_records,
+            [r for r in exchange_records if not r.is_perp],
+            [r for r in exchange_records if r.is_perp],
+        ))
+    return rankings
 
-def write_exchange_rankings(records: List[SymbolRecord], blacklist: set[str]) -> None:
-    best_records: Dict[Tuple[str, str], RankedRecord] = {}
-    for record in build_ranked_records(records):
-        key = (record.exchange, record.symbol)
-        current = best_records.get(key)
-        if current is None or (record.rank_score, record.market_cap) > (current.rank_score, current.market_cap):
-            best_records[key] = record
-
-    ranked_records = list(best_records.values())
-    csv_path = OUTPUT_DIR / "crypto_exchange_rankings.csv"
-    md_path = OUTPUT_DIR / "crypto_exchange_rankings.md"
-    rankings_dir = OUTPUT_DIR / "crypto_rankings"
-    rankings_dir.mkdir(parents=True, exist_ok=True)
 
+def write_rankings_csv(rankings: List[ExchangeRanking], csv_path: Path) -> None:
     csv_lines = [
         "exchange,symbol,quote_asset,volume_bucket,cap_bucket,market_cap,rank_score,blacklisted,source_file"
     ]
-    for record in sorted(
-        ranked_records,
-        key=lambda item: (item.exchange, -item.rank_score, -item.market_cap, item.symbol),
-    ):
-        base_symbol = extract_blacklist_key(record.symbol, record.quote_asset)
-        is_blacklisted = "yes" if base_symbol.lower() in blacklist or record.symbol.lower() in blacklist else "no"
-        csv_lines.append(
-            f"{record.exchange},{record.symbol},{record.quote_asset},{record.volume_bucket},{record.cap_bucket},{int(record.market_cap)},{record.rank_score},{is_blacklisted},{record.source_file.name}"
-        )
-    csv_path.write_text("\n".join(csv_lines) + "\n", encoding="utf-8")
+    for ranking in rankings:
+        for record in ranking.records:
+            csv_lines.append(
+                f"{record.exchange},{record.symbol},{record.quote_asset},{record.volume_bucket},{record.cap_bucket},{int(record.market_cap)},{record.rank_score},{'yes' if record.blacklisted else 'no'},{record.source_file.name}"
+            )
+    atomic_write_text(csv_path, "\n".join(csv_lines) + "\n")
 
+
+def write_rankings_markdown(rankings: List[ExchangeRanking], blacklist_size: int, md_path: Path) -> None:
     lines = [
         "# Crypto Exchange Rankings",
         f"Generated on {datetime.now().strftime('%d-%b-%y').lower()}",
@@ -403,7 +577,7 @@ def write_exchange_rankings(records: List[SymbolRecord], blacklist: set[str]) ->
         "This list is sorted for beginners who want liquid coins with a better risk profile.",
         "Start with the 10M-100M market cap range and check the volume bucket first.",
         "Use the TXT files in output/crypto_rankings/ to import directly into TradingView.",
-        f"Blacklisted symbols: {len(blacklist)}",
+        f"Blacklisted symbols: {blacklist_size}",
         "",
         "## How To Read This List",
         "- 10M-100M is the main target range.",
@@ -413,53 +587,62 @@ def write_exchange_rankings(records: List[SymbolRecord], blacklist: set[str]) ->
         "",
     ]
 
-    by_exchange: Dict[str, List[RankedRecord]] = {}
-    for record in ranked_records:
-        by_exchange.setdefault(record.exchange, []).append(record)
-
-    for exchange in sorted(by_exchange.keys()):
-        exchange_records = sorted(
-            by_exchange[exchange],
-            key=lambda item: (-item.rank_score, -item.market_cap, item.symbol),
-        )
-
-        # Split spot vs perpetual
-        spot_records = [r for r in exchange_records if not r.symbol.endswith('.P')]
-        perp_records = [r for r in exchange_records if r.symbol.endswith('.P')]
+    for ranking in rankings:
+        exchange = ranking.exchange.upper()
 
         # --- SPOT section ---
-        lines.append(f"## {exchange.upper()}")
-        lines.append(f"Top SPOT candidates for {exchange.upper()}, sorted from strongest to weakest.")
+        lines.append(f"## {exchange}")
+        lines.append(f"Top SPOT candidates for {exchange}, sorted from strongest to weakest.")
         lines.append("| Rank | Symbol | Market Cap | Cap Range | Volume | Status |")
         lines.append("| --- | --- | --- | --- | --- | --- |")
-        for index, record in enumerate(spot_records[:20], start=1):
-            base_symbol = extract_blacklist_key(record.symbol, record.quote_asset)
-            is_blacklisted = base_symbol.lower() in blacklist or record.symbol.lower() in blacklist
-            ethics_status = "❌ SKIP" if is_blacklisted else "✅ OK"
-            lines.append(
-                f"| {index} | {record.symbol} | ${int(record.market_cap):,} | {record.cap_bucket} | {record.volume_bucket} | {ethics_status} |"
-            )
+        lines.extend(record.table_row(index) for index, record in enumerate(ranking.spot[:20], start=1))
         lines.append("")
 
         # --- PERPETUAL section ---
-        if perp_records:
-            lines.append(f"### 🔮 {exchange.upper()} Perpetual Futures (.P)")
-            lines.append(f"Top perpetual candidates for {exchange.upper()}.")
+        if ranking.perp:
+            lines.append(f"### 🔮 {exchange} Perpetual Futures (.P)")
+            lines.append(f"Top perpetual candidates for {exchange}.")
             lines.append("| Rank | Symbol | Market Cap | Cap Range | Volume | Status |")
             lines.append("| --- | --- | --- | --- | --- | --- |")
-            for index, record in enumerate(perp_records[:20], start=1):
-                base_symbol = extract_blacklist_key(record.symbol, record.quote_asset)
-                is_blacklisted = base_symbol.lower() in blacklist or record.symbol.lower() in blacklist
-                ethics_status = "❌ SKIP" if is_blacklisted else "✅ OK"
-                lines.append(
-                    f"| {index} | {record.symbol} | ${int(record.market_cap):,} | {record.cap_bucket} | {record.volume_bucket} | {ethics_status} |"
-                )
+            lines.extend(record.table_row(index) for index, record in enumerate(ranking.perp[:20], start=1))
             lines.append("")
 
-        # Generate per-exchange files (spot + perp)
-        write_exchange_files(exchange, spot_records, perp_records, blacklist, rankings_dir)
+    atomic_write_text(md_path, "\n".join(lines).rstrip() + "\n")
+
+
+def write_exchange_rankings(records: List[SymbolRecord], blacklist: set[str], exchanges_to_write: Optional[set[str]] = None) -> None:
+    """Write the combined rankings and per-exchange files.
 
-    md_path.write_text("\n".join(lines).rstrip() + "\n", encoding="utf-8")
+    Every output file is an independent job on a thread pool of
+    ``REPORT_WORKERS``. ``exchanges_to_write`` limits which
+    ``crypto_rankings/<exchange>/`` folders are regenerated (None rewrites
+    all of them).
+    """
+    rankings = rank_exchanges(records, blacklist)
+    rankings_dir = OUTPUT_DIR / "crypto_rankings"
+    rankings_dir.mkdir(parents=True, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=REPORT_WORKERS) as pool:
+        futures = [
+            pool.submit(write_rankings_csv, rankings, OUTPUT_DIR / "crypto_exchange_rankings.csv"),
+            pool.submit(write_rankings_markdown, rankings, len(blacklist), OUTPUT_DIR / "crypto_exchange_rankings.md"),
+        ]
+        futures += [
+            pool.submit(write_exchange_files, ranking, rankings_dir)
+            for ranking in rankings
+            if exchanges_to_write is None or ranking.exchange in exchanges_to_write
+        ]
+        for future in futures:
+            future.result()
+
+    # Drop per-exchange files for exchanges that no longer have any ranked symbols
+    ranked_exchanges = {ranking.exchange for ranking in rankings}
+    for subdir in rankings_dir.iterdir():
+        if subdir.is_dir() and subdir.name not in ranked_exchanges:
+            for file in subdir.glob("*.md"):
+                file.unlink(missing_ok=True)
+            for file in subdir.glob("*.txt"):
+                file.unlink(missing_ok=True)
 
 
 def create_master_watchlist() -> None:
@@ -506,13 +689,27 @@ def create_master_watchlist() -> None:
     if all_symbols:
         master_path = OUTPUT_DIR / "tradingview_master_watchlist.txt"
         sorted_symbols = sorted(all_symbols)
-        master_path.write_text("\n".join(sorted_symbols) + "\n", encoding="utf-8")
+        atomic_write_text(master_path, "\n".join(sorted_symbols) + "\n")
         print(f"✓ Master watchlist created: {len(sorted_symbols)} unique symbols")
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Create market-cap buckets from current volume output")
+    parser.add_argument("--offline", action="store_true", help="Serve CoinGecko data from the HTTP cache only")
+    parser.add_argument("--max-age", type=float, help="Accept cached responses up to this many seconds old")
+    parser.add_argument("--cap-max-age", type=float, default=MARKET_CAP_MAX_AGE,
+                        help=f"Re-fetch stored market caps older than this many seconds (default: {MARKET_CAP_MAX_AGE})")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only regenerate cap files and rankings whose input files or caps changed")
+    args = parser.parse_args()
+    cache.configure(offline=args.offline, max_age=args.max_age)
+    run_market_cap_buckets(args.cap_max_age, args.incremental)
+
+
+def run_market_cap_buckets(cap_max_age: float = MARKET_CAP_MAX_AGE, incremental: bool = False) -> None:
+    """Build the cap buckets and reports, printing the usual status lines."""
     print("Creating market-cap buckets from current volume output...")
-    results = build_market_cap_buckets()
+    results = build_market_cap_buckets(cap_max_age, incremental=incremental)
 
     if not results:
         print("No market-cap bucket files were created.")
@@ -537,13 +734,14 @@ def main() -> None:
         print(f"Exchange rankings written to {rankings_csv} and {rankings_md}")
         print(f"Per-exchange files written to {OUTPUT_DIR}/crypto_rankings/")
     
-    create_master_watchlist()
+    with timing.span("master_watchlist", "marketcap"):
+        create_master_watchlist()
 
 
-def write_exchange_files(exchange: str, spot_records: List[RankedRecord], perp_records: List[RankedRecord], blacklist: set[str], output_dir: Path) -> None:
+def write_exchange_files(ranking: ExchangeRanking, output_dir: Path) -> None:
     """Write per-exchange markdown and TradingView txt files, split spot vs perpetual."""
+    exchange = ranking.exchange
     exchange_dir = output_dir / exchange.lower()
-    exchange_dir.mkdir(parents=True, exist_ok=True)
 
     # --- Combined Markdown (spot + perp) ---
     md_path = exchange_dir / f"{exchange}_top_20.md"
@@ -556,31 +754,18 @@ def write_exchange_files(exchange: str, spot_records: List[RankedRecord], perp_r
         "| Rank | Symbol | Market Cap | Cap Range | Volume | Status |",
         "| --- | --- | --- | --- | --- | --- |",
     ]
+    md_lines.extend(record.table_row(index) for index, record in enumerate(ranking.spot[:20], start=1))
 
-    for index, record in enumerate(spot_records[:20], start=1):
-        base_symbol = extract_blacklist_key(record.symbol, record.quote_asset)
-        is_blacklisted = base_symbol.lower() in blacklist or record.symbol.lower() in blacklist
-        ethics_status = "❌ SKIP" if is_blacklisted else "✅ OK"
-        md_lines.append(
-            f"| {index} | {record.symbol} | ${int(record.market_cap):,} | {record.cap_bucket} | {record.volume_bucket} | {ethics_status} |"
-        )
-
-    if perp_records:
+    if ranking.perp:
         md_lines.extend(["", "## 🔮 PERPETUAL (.P)", "", "| Rank | Symbol | Market Cap | Cap Range | Volume | Status |", "| --- | --- | --- | --- | --- | --- |"])
-        for index, record in enumerate(perp_records[:20], start=1):
-            base_symbol = extract_blacklist_key(record.symbol, record.quote_asset)
-            is_blacklisted = base_symbol.lower() in blacklist or record.symbol.lower() in blacklist
-            ethics_status = "❌ SKIP" if is_blacklisted else "✅ OK"
-            md_lines.append(
-                f"| {index} | {record.symbol} | ${int(record.market_cap):,} | {record.cap_bucket} | {record.volume_bucket} | {ethics_status} |"
-            )
+        md_lines.extend(record.table_row(index) for index, record in enumerate(ranking.perp[:20], start=1))
 
-    md_path.write_text("\n".join(md_lines) + "\n", encoding="utf-8")
+    atomic_write_text(md_path, "\n".join(md_lines) + "\n")
 
     # --- TradingView import (spot + perp combined) ---
     txt_path = exchange_dir / f"{exchange}_tradingview_import.txt"
-    txt_lines = [r.symbol for r in spot_records[:20]] + [r.symbol for r in perp_records[:20]]
-    txt_path.write_text(",\n".join(txt_lines) + "\n", encoding="utf-8")
+    txt_lines = [r.symbol for r in ranking.spot[:20]] + [r.symbol for r in ranking.perp[:20]]
+    atomic_write_text(txt_path, ",\n".join(txt_lines) + "\n")
 
 
 if __name__ == "__main__":
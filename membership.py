@@ -0,0 +1,219 @@
+"""Watchlist membership diffs between runs.
+
+The symbols of every (exchange, market type, quote, volume bucket) list are
+kept in SQLite. Each run's lists are compared with the stored ones using set
+operations in SQL, and the result is written as a compact change set:
+
+- ``output/membership_changes.json`` — the latest run's added/removed/moved
+  symbols per exchange, market type, quote and bucket;
+- ``output/membership_changelog.jsonl`` — one line per run, appended.
+
+A symbol that left one bucket and entered another of the same exchange,
+market type and quote is reported once as moved instead of removed + added.
+Lists that failed to refresh this run are left untouched in the store.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import MEMBERSHIP_STORE, get_volume_bucket_label
+from fileio import atomic_write_text
+
+OUTPUT_DIR = Path("output")
+CHANGES_PATH = OUTPUT_DIR / "membership_changes.json"
+CHANGELOG_PATH = OUTPUT_DIR / "membership_changelog.jsonl"
+# watch.py records lists from several worker threads
+_write_lock = threading.Lock()
+
+# (exchange, market_type, quote); runs pass {ListKey: {min_volume: symbols}}
+ListKey = Tuple[str, str, str]
+
+
+@dataclass
+class MembershipChanges:
+    run_at: str
+    added: List[Tuple[str, str, str, str, str]] = field(default_factory=list)
+    removed: List[Tuple[str, str, str, str, str]] = field(default_factory=list)
+    # (exchange, market_type, quote, symbol, from_bucket, to_bucket)
+    moved: List[Tuple[str, str, str, str, str, str]] = field(default_factory=list)
+    lists: int = 0
+    new_lists: int = 0
+
+    @property
+    def total(self) -> int:
+        return len(self.added) + len(self.removed) + len(self.moved)
+
+    def as_dict(self) -> dict:
+        """Group changes as exchange -> market type -> quote -> bucket -> {added, removed, moved_in, moved_out}."""
+        tree: dict = defaultdict(lambda: defaultdict(lambda: defaultdict(lambda: defaultdict(lambda: defaultdict(list)))))
+        for exchange, market_type, quote, bucket, symbol in self.added:
+            tree[exchange][market_type][quote][bucket]["added"].append(symbol)
+        for exchange, market_type, quote, bucket, symbol in self.removed:
+            tree[exchange][market_type][quote][bucket]["removed"].append(symbol)
+        for exchange, market_type, quote, symbol, from_bucket, to_bucket in self.moved:
+            tree[exchange][market_type][quote][to_bucket]["moved_in"].append({"symbol": symbol, "from": from_bucket})
+            tree[exchange][market_type][quote][from_bucket]["moved_out"].append({"symbol": symbol, "to": to_bucket})
+        return {
+            "run_at": self.run_at,
+            "summary": {
+                "lists": self.lists,
+                "new_lists": self.new_lists,
+                "added": len(self.added),
+                "removed": len(self.removed),
+                "moved": len(self.moved),
+            },
+            "changes": json.loads(json.dumps(tree, sort_keys=True)),
+        }
+
+
+class MembershipStore:
+    def __init__(self, path: Path = Path(MEMBERSHIP_STORE)):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path), timeout=30)
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS members (
+                exchange TEXT NOT NULL,
+                market_type TEXT NOT NULL,
+                quote TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                symbol TEXT NOT NULL,
+                PRIMARY KEY (exchange, market_type, quote, bucket, symbol)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS members_by_symbol ON members (exchange, market_type, quote, symbol);
+            CREATE TABLE IF NOT EXISTS lists (
+                exchange TEXT NOT NULL,
+                market_type TEXT NOT NULL,
+                quote TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (exchange, market_type, quote)
+            );
+            """
+        )
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "MembershipStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def apply(self, current: Dict[ListKey, Dict[float, Iterable[str]]]) -> MembershipChanges:
+        """Diff ``current`` against the stored lists, then make it the stored state.
+
+        Every (exchange, market type, quote) in ``current`` is replaced as a
+        whole, so pass all of its buckets, empty ones included.
+        """
+        changes = MembershipChanges(datetime.now().isoformat(timespec="seconds"), lists=len(current))
+        connection = self.connection
+        with connection:
+            connection.execute("DROP TABLE IF EXISTS temp.current")
+            connection.execute("DROP TABLE IF EXISTS temp.scope")
+            connection.execute(
+                "CREATE TEMP TABLE current (exchange TEXT, market_type TEXT, quote TEXT, bucket TEXT, symbol TEXT, "
+                "PRIMARY KEY (exchange, market_type, quote, bucket, symbol))"
+            )
+            connection.execute("CREATE TEMP TABLE scope (exchange TEXT, market_type TEXT, quote TEXT, PRIMARY KEY (exchange, market_type, quote))")
+            connection.executemany("INSERT INTO temp.scope VALUES (?, ?, ?)", list(current))
+            connection.executemany(
+                "INSERT OR IGNORE INTO temp.current VALUES (?, ?, ?, ?, ?)",
+                [
+                    (exchange, market_type, quote, get_volume_bucket_label(min_volume), symbol)
+                    for (exchange, market_type, quote), buckets in current.items()
+                    for min_volume, symbols in buckets.items()
+                    for symbol in symbols
+                ],
+            )
+            changes.new_lists = connection.execute(
+                "SELECT COUNT(*) FROM temp.scope s WHERE NOT EXISTS "
+                "(SELECT 1 FROM lists l WHERE l.exchange = s.exchange AND l.market_type = s.market_type AND l.quote = s.quote)"
+            ).fetchone()[0]
+
+            added = connection.execute(
+                "SELECT exchange, market_type, quote, bucket, symbol FROM temp.current "
+                "EXCEPT SELECT m.exchange, m.market_type, m.quote, m.bucket, m.symbol FROM members m "
+                "JOIN temp.scope USING (exchange, market_type, quote)"
+            ).fetchall()
+            removed = connection.execute(
+                "SELECT m.exchange, m.market_type, m.quote, m.bucket, m.symbol FROM members m "
+                "JOIN temp.scope USING (exchange, market_type, quote) "
+                "EXCEPT SELECT exchange, market_type, quote, bucket, symbol FROM temp.current"
+            ).fetchall()
+
+            connection.execute(
+                "DELETE FROM members WHERE (exchange, market_type, quote) IN (SELECT exchange, market_type, quote FROM temp.scope)"
+            )
+            connection.execute("INSERT INTO members SELECT * FROM temp.current")
+            updated_at = time.time()
+            connection.executemany(
+                "INSERT INTO lists VALUES (?, ?, ?, ?) ON CONFLICT (exchange, market_type, quote) DO UPDATE SET updated_at = excluded.updated_at",
+                [(*key, updated_at) for key in current],
+            )
+            connection.execute("DROP TABLE temp.current")
+            connection.execute("DROP TABLE temp.scope")
+
+        # A symbol removed from one bucket and added to another of the same list moved
+        added_at = {(exchange, market_type, quote, symbol): bucket for exchange, market_type, quote, bucket, symbol in added}
+        removed_at = {(exchange, market_type, quote, symbol): bucket for exchange, market_type, quote, bucket, symbol in removed}
+        for key in sorted(added_at.keys() & removed_at.keys()):
+            changes.moved.append((*key, removed_at[key], added_at[key]))
+        moved = {key for key in added_at.keys() & removed_at.keys()}
+        changes.added = sorted(row for row in added if (*row[:3], row[4]) not in moved)
+        changes.removed = sorted(row for row in removed if (*row[:3], row[4]) not in moved)
+        return changes
+
+    def members(self, exchange: str, market_type: str, quote: str) -> Dict[str, List[str]]:
+        """Return bucket label -> symbols currently stored for one list."""
+        buckets: Dict[str, List[str]] = defaultdict(list)
+        rows = self.connection.execute(
+            "SELECT bucket, symbol FROM members WHERE exchange = ? AND market_type = ? AND quote = ? ORDER BY bucket, symbol",
+            (exchange, market_type, quote),
+        )
+        for bucket, symbol in rows:
+            buckets[bucket].append(symbol)
+        return dict(buckets)
+
+
+def write_changes(changes: MembershipChanges, output_dir: Path = OUTPUT_DIR) -> Path:
+    """Write the latest change set and append it to the changelog."""
+    payload = changes.as_dict()
+    path = Path(output_dir) / CHANGES_PATH.name
+    with _write_lock:
+        atomic_write_text(path, json.dumps(payload, indent=2, ensure_ascii=False) + "\n")
+        with open(Path(output_dir) / CHANGELOG_PATH.name, "a", encoding="utf-8") as f:
+            f.write(json.dumps(payload, separators=(",", ":"), ensure_ascii=False) + "\n")
+    return path
+
+
+def record_membership(current: Dict[ListKey, Dict[float, Iterable[str]]], store_path: Optional[Path] = None) -> MembershipChanges:
+    """Diff and store one run's lists, then write the change files."""
+    if not current:
+        return MembershipChanges(datetime.now().isoformat(timespec="seconds"))
+    with MembershipStore(Path(store_path or MEMBERSHIP_STORE)) as store:
+        changes = store.apply(current)
+    write_changes(changes)
+    return changes
+
+
+def format_changes(changes: MembershipChanges, limit: int = 10) -> List[str]:
+    """Render the status lines printed after a run."""
+    lines = [
+        f"🔁 Membership: {len(changes.added)} added, {len(changes.removed)} removed, {len(changes.moved)} moved "
+        f"across {changes.lists} lists ({changes.new_lists} new)"
+    ]
+    for exchange, market_type, quote, symbol, from_bucket, to_bucket in changes.moved[:limit]:
+        lines.append(f"  ↕ {symbol} ({exchange} {quote} {market_type}): {from_bucket} → {to_bucket}")
+    if len(changes.moved) > limit:
+        lines.append(f"  … {len(changes.moved) - limit} more moves in {CHANGES_PATH}")
+    return lines
@@ -0,0 +1,109 @@
+"""Aggregated pair counts of every volume watchlist, for the analysis scripts.
+
+``output/pair_counts.json`` holds one row per ``output/vol_*/*_pairs_*.txt``
+file (exchange, quote, market type, volume threshold, pair count), keyed by
+its path and stamped with the file's mtime and size. ``batch_update.py``
+fills it from the counts the runner already has; ``load_pair_counts()``
+only re-reads files whose stamp changed since, so charts and insights do
+not rescan unchanged watchlists.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from config import parse_volume_bucket
+from fileio import atomic_write_text
+
+OUTPUT_DIR = Path("output")
+PAIR_COUNTS_PATH = OUTPUT_DIR / "pair_counts.json"
+
+
+@dataclass(frozen=True)
+class PairCount:
+    exchange: str  # upper-case, as charted
+    quote: str
+    market_type: str
+    volume: int
+    pairs: int
+
+
+def _stamp(path: str) -> List[int]:
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _count_pairs(path: str) -> int:
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        content = f.read().strip()
+    return len(content.splitlines()) if content else 0
+
+
+def _row(path: str, pairs: int) -> dict:
+    """Table row for ``output/vol_<label>/<exchange>_<quote>[_<market type>]_pairs_<date>.txt``."""
+    path_obj = Path(path)
+    exchange, quote, tag, *_ = path_obj.name.split("_")
+    return {
+        "exchange": exchange.upper(),
+        "quote": quote,
+        "market_type": "spot" if tag == "pairs" else tag,
+        "volume": parse_volume_bucket(path_obj.parent.name.replace("vol_", "")),
+        "pairs": pairs,
+        "stamp": _stamp(path),
+    }
+
+
+def _load(path: Path) -> Dict[str, dict]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save(rows: Dict[str, dict], path: Path) -> None:
+    atomic_write_text(path, json.dumps(rows, sort_keys=True, separators=(",", ":")))
+
+
+def record_pair_counts(counts: Dict[str, int], path: Path = PAIR_COUNTS_PATH) -> None:
+    """Store the pair counts of files just written (``{file path: pairs}``, 0 when the file was dropped)."""
+    rows = _load(path)
+    for file_path, pairs in counts.items():
+        key = Path(file_path).as_posix()
+        if pairs and os.path.exists(file_path):
+            rows[key] = _row(file_path, pairs)
+        else:
+            rows.pop(key, None)
+    _save(rows, path)
+
+
+def load_pair_counts(path: Path = PAIR_COUNTS_PATH) -> List[PairCount]:
+    """Return the table for every watchlist on disk, re-reading only files whose stamp changed."""
+    cached = _load(path)
+    rows: Dict[str, dict] = {}
+    for volume_dir in sorted(OUTPUT_DIR.glob("vol_*")):
+        with os.scandir(volume_dir) as entries:
+            for entry in entries:
+                if not fnmatch(entry.name, "*_pairs_*.txt"):
+                    continue
+                key = Path(entry.path).as_posix()
+                row = cached.get(key)
+                if row is None or row["stamp"] != _stamp(entry.path):
+                    row = _row(entry.path, _count_pairs(entry.path))
+                rows[key] = row
+    if rows != cached:
+        _save(rows, path)
+    return [PairCount(**{k: v for k, v in row.items() if k != "stamp"}) for _, row in sorted(rows.items())]
+
+
+def totals(table: Iterable[PairCount], field: str) -> Dict[str, int]:
+    """Pair count per value of ``field``, largest first."""
+    sums: Dict[str, int] = {}
+    for row in table:
+        value = getattr(row, field)
+        sums[value] = sums.get(value, 0) + row.pairs
+    return dict(sorted(sums.items(), key=lambda item: item[1], reverse=True))
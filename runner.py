@@ -0,0 +1,138 @@
+"""In-process, thread-pooled exchange runner used by batch_update.py."""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import timing
+from config import BATCH_WORKERS
+from exchanges.markets import MarketRecord
+from main import write_if_changed
+from snapshot import build_snapshot
+
+
+@dataclass
+class ExchangeResult:
+    exchange: str
+    market_type: str
+    pair_counts: Dict[Tuple[str, float], int] = field(default_factory=dict)
+    # Symbols written per (quote, threshold), kept for the membership diff
+    symbols: Dict[Tuple[str, float], List[str]] = field(default_factory=dict)
+    # Every market seen, for the history store
+    records: List[MarketRecord] = field(default_factory=list)
+    errors: Dict[Tuple[str, float], str] = field(default_factory=dict)
+    # Watchlist files whose contents changed (written, or dropped because empty)
+    files_changed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def total_pairs(self) -> int:
+        return sum(self.pair_counts.values())
+
+    @property
+    def combinations(self) -> int:
+        return len(self.pair_counts) + len(self.errors)
+
+    def history_buckets(self) -> Dict[Tuple[str, str], float]:
+        """(tv_symbol, market_type) -> highest threshold list each symbol was written to."""
+        buckets: Dict[Tuple[str, str], float] = {}
+        for (_, min_volume), symbols in self.symbols.items():
+            for symbol in symbols:
+                key = (symbol, self.market_type)
+                buckets[key] = max(min_volume, buckets.get(key, min_volume))
+        return buckets
+
+    def membership(self) -> Dict[Tuple[str, str, str], Dict[float, List[str]]]:
+        """Lists per (exchange, market type, quote), skipping quotes with any failed threshold."""
+        failed = {quote_asset for quote_asset, _ in self.errors}
+        lists: Dict[Tuple[str, str, str], Dict[float, List[str]]] = {}
+        for (quote_asset, min_volume), symbols in self.symbols.items():
+            if quote_asset not in failed:
+                lists.setdefault((self.exchange, self.market_type, quote_asset), {})[min_volume] = symbols
+        return lists
+
+
+def run_snapshot(exchange: str, market_type: str, quote_assets: Sequence[str], thresholds: Sequence[float]) -> ExchangeResult:
+    """Fetch one exchange's spot or perp snapshot and write each quote's volume buckets.
+
+    Every symbol is written to exactly one bucket file (the highest threshold
+    it reaches); a bucket that is now empty drops today's stale file, and
+    files whose membership did not change are left untouched.
+    """
+    result = ExchangeResult(exchange, market_type)
+    started = time.perf_counter()
+    try:
+        with timing.span("fetch", market_type, exchange, profile=True):
+            snapshot = build_snapshot(exchange, market_type)
+    except Exception as e:
+        for min_volume in thresholds:
+            for quote_asset in quote_assets:
+                result.errors[(quote_asset, min_volume)] = str(e)
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    result.records = list(snapshot.records)
+    with timing.span("bucket+write", market_type, exchange):
+        for key, symbols in snapshot.volume_buckets(quote_assets, thresholds).items():
+            quote_asset, min_volume = key
+            try:
+                result.files_changed += write_if_changed(symbols, exchange, quote_asset, min_volume, market_type)
+                result.pair_counts[key] = len(symbols)
+                result.symbols[key] = symbols
+            except Exception as e:
+                result.errors[key] = str(e)
+
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def run_spot(exchange: str, quote_assets: Sequence[str], thresholds: Sequence[float]) -> ExchangeResult:
+    return run_snapshot(exchange, "spot", quote_assets, thresholds)
+
+
+def run_futures(exchange: str, quote_assets: Sequence[str], thresholds: Sequence[float]) -> ExchangeResult:
+    """Fetch the venue's perpetuals once and bucket every quote split from that snapshot."""
+    return run_snapshot(exchange, "perp", quote_assets, thresholds)
+
+
+def run_exchanges(
+    exchanges: Iterable[str],
+    quote_assets: Sequence[str],
+    thresholds: Sequence[float],
+    futures: bool = False,
+    workers: int = BATCH_WORKERS,
+) -> Iterable[ExchangeResult]:
+    """Run exchanges concurrently, yielding each result as soon as it finishes."""
+    run = run_futures if futures else run_spot
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures_by_exchange = {
+            pool.submit(run, exchange, quote_assets, thresholds): exchange
+            for exchange in exchanges
+        }
+        for future in as_completed(futures_by_exchange):
+            exchange = futures_by_exchange[future]
+            try:
+                yield future.result()
+            except Exception as e:
+                result = ExchangeResult(exchange, "perp" if futures else "spot")
+                for min_volume in thresholds:
+                    for quote_asset in quote_assets:
+                        result.errors[(quote_asset, min_volume)] = str(e)
+                yield result
+
+
+def format_result(result: ExchangeResult) -> List[str]:
+    """Render a result as the status lines batch_update has always printed."""
+    lines = [f"\n🏢 {result.exchange} {result.market_type} ({result.elapsed:.1f}s)"]
+    for (quote_asset, min_volume), pair_count in sorted(result.pair_counts.items(), key=lambda item: (item[0][1], item[0][0])):
+        label = f"{result.exchange} {quote_asset} {result.market_type} ≥{min_volume:,.0f}"
+        if pair_count > 0:
+            lines.append(f"✓ {label} ({pair_count} pairs)")
+        else:
+            lines.append(f"○ {label} (0 pairs)")
+    for (quote_asset, min_volume), error in sorted(result.errors.items(), key=lambda item: (item[0][1], item[0][0])):
+        lines.append(f"✗ {result.exchange} {quote_asset} {result.market_type} ≥{min_volume:,.0f} - {error}")
+    return lines
@@ -0,0 +1,61 @@
+"""Fetch each exchange's market data once and serve every quote/volume filter from memory."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+from config import VOLUME_THRESHOLDS, assign_volume_bucket
+
+from exchanges.markets import MarketRecord, filter_symbols
+from exchanges.registry import load_adapter
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    exchange: str
+    records: Tuple[MarketRecord, ...]
+    market_type: str = "spot"
+
+    def symbols(self, quote_asset: str = None, min_volume: float = None) -> List[str]:
+        """Return the TradingView symbols matching a quote/volume filter."""
+        return filter_symbols(self.records, quote_asset, min_volume)
+
+    def volume_buckets(
+        self,
+        quote_assets: Sequence[str],
+        thresholds: Sequence[float] = VOLUME_THRESHOLDS,
+    ) -> Dict[Tuple[str, float], List[str]]:
+        """Assign every symbol to exactly one (quote, volume bucket) in a single pass.
+
+        Each symbol lands only in the highest threshold its volume reaches, so
+        the bucket files never overlap and need no dedupe pass afterwards.
+        """
+        buckets: Dict[Tuple[str, float], List[str]] = {
+            (quote_asset, min_volume): [] for quote_asset in quote_assets for min_volume in thresholds
+        }
+        wanted = {quote_asset.upper(): quote_asset for quote_asset in quote_assets}
+        for record in self.records:
+            quote_asset = wanted.get(record.quote)
+            if quote_asset is None:
+                continue
+            min_volume = assign_volume_bucket(record.usd_volume, thresholds)
+            if min_volume is not None:
+                buckets[(quote_asset, min_volume)].append(record.tv_symbol)
+        return {key: sorted(symbols) for key, symbols in buckets.items()}
+
+
+def load_exchange_module(exchange: str):
+    return load_adapter(exchange)
+
+
+def build_snapshot(exchange: str, market_type: str = "spot") -> MarketSnapshot:
+    """Download one exchange's spot markets (or perpetuals, ``market_type="perp"``) into an in-memory snapshot.
+
+    The perpetual snapshot is the venue's whole contract list in one fetch;
+    every quote split (USDT, USDC, inverse USD) and volume bucket is derived
+    from it. Raises whatever the adapter raises (usually ``requests.RequestException``).
+    """
+    module = load_exchange_module(exchange)
+    fetch = module.fetch_futures_markets if market_type == "perp" else module.fetch_spot_markets
+    return MarketSnapshot(exchange, tuple(fetch()), market_type)
@@ -1,56 +1,153 @@
-from ftplib import FTP
-from io import BytesIO, TextIOWrapper
+from ftplib import FTP, error_perm
 import argparse
+import json
+import os
+import sys
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict
+from typing import Callable, Dict, List, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from fileio import atomic_write_text, text_digest
+
+# host[:port]; benchmarks point this at the local mock FTP server (bench/server.py)
+FTP_HOST = os.environ.get('NASDAQTRADER_FTP', 'ftp.nasdaqtrader.com')
+
+NASDAQ_LISTED = '/SymbolDirectory/nasdaqlisted.txt'
+OTHER_LISTED = '/SymbolDirectory/otherlisted.txt'
+# Last line of every directory file: "File Creation Time: mmddyyyyhh:mm|||..."
+FOOTER_PREFIX = 'File Creation Time'
+# MDTM/SIZE (or content hash) of each file at the last download, with the symbols parsed from it
+STATE_PATH = Path(__file__).resolve().parent.parent / 'output' / '.cache' / 'nasdaqtrader.json'
+STATE_VERSION = 2
 
 EXCHANGES = {
     'N': 'NYSE',
     'P': 'ARCA'
 }
 
-def get_nasdaq_stocks() -> List[str]:
-    """Fetch NASDAQ listed stocks."""
+Row = Dict[str, str]
+
+
+def connect() -> FTP:
+    host, _, port = FTP_HOST.partition(':')
+    ftp = FTP()
+    ftp.connect(host, int(port or 21))
+    ftp.login()
+    return ftp
+
+
+def remote_stamp(ftp: FTP, path: str) -> Optional[Dict[str, object]]:
+    """Return the file's MDTM and SIZE, or None when the server does not report them."""
+    try:
+        return {'mdtm': ftp.sendcmd(f'MDTM {path}').split()[-1], 'size': ftp.size(path)}
+    except error_perm:
+        return None
+
+
+def stream_directory(ftp: FTP, path: str, on_row: Callable[[Row], None], lines: Optional[Sequence[str]] = None) -> int:
+    """Parse a pipe-delimited directory file line by line as it arrives.
+
+    Columns are looked up by the names in the header line, so added or
+    reordered columns do not shift fields; the footer and truncated lines
+    are skipped. ``lines`` parses an already downloaded copy instead.
+    Returns the number of rows passed to ``on_row``.
+    """
+    columns: List[str] = []
+    rows = 0
+
+    def feed(line: str) -> None:
+        nonlocal rows
+        if not line or line.startswith(FOOTER_PREFIX):
+            return
+        fields = line.split('|')
+        if not columns:
+            columns.extend(fields)
+            return
+        if len(fields) != len(columns):
+            return
+        on_row(dict(zip(columns, fields)))
+        rows += 1
+
+    if lines is None:
+        ftp.retrlines(f'RETR {path}', feed)
+    else:
+        for line in lines:
+            feed(line)
+    return rows
+
+
+def parse_nasdaq(ftp: FTP, include_etfs: bool, lines: Optional[Sequence[str]] = None) -> Dict[str, List[str]]:
+    """NASDAQ listed stocks."""
     stocks = []
-    with BytesIO() as r:
-        ftp.retrbinary('RETR /SymbolDirectory/nasdaqlisted.txt', r.write)
-        r.seek(0)
-        wrapper = TextIOWrapper(r, encoding='utf-8')
-        
-        for line in wrapper:
-            ticker, name, market_cat, is_test, status, lot_size, x, y = line.split('|')
-            if is_test == 'N':
-                stocks.append(f'NASDAQ:{ticker}')
-    return sorted(stocks)
-
-def get_other_stocks(include_etfs: bool) -> Dict[str, List[str]]:
-    """Fetch NYSE and ARCA stocks."""
-    exchange_stocks = {'NYSE': [], 'ARCA': []}
-    
-    with BytesIO() as r:
-        ftp.retrbinary('RETR /SymbolDirectory/otherlisted.txt', r.write)
-        r.seek(0)
-        wrapper = TextIOWrapper(r, encoding='utf-8')
-        
-        for line in wrapper:
-            line_split = line.split('|')
-            ticker = line_split[0]
-            exchange = line_split[2]
-            is_etf = line_split[4]
-            is_test = line_split[6]
-            
-            if is_test == 'Y' or '$' in ticker or '.' in ticker:
-                continue
-                
-            if is_etf == 'Y' and not include_etfs:
-                continue
-                
-            if exchange in EXCHANGES:
-                exchange_stocks[EXCHANGES[exchange]].append(f'{EXCHANGES[exchange]}:{ticker}')
-    
+
+    def on_row(row: Row) -> None:
+        if row['Test Issue'] != 'N':
+            return
+        if row['ETF'] == 'Y' and not include_etfs:
+            return
+        stocks.append(f"NASDAQ:{row['Symbol']}")
+
+    stream_directory(ftp, NASDAQ_LISTED, on_row, lines)
+    return {'NASDAQ': sorted(stocks)}
+
+
+def parse_other(ftp: FTP, include_etfs: bool, lines: Optional[Sequence[str]] = None) -> Dict[str, List[str]]:
+    """NYSE and ARCA stocks, both from one pass over otherlisted.txt."""
+    exchange_stocks: Dict[str, List[str]] = {name: [] for name in EXCHANGES.values()}
+
+    def on_row(row: Row) -> None:
+        ticker = row['ACT Symbol']
+        if row['Test Issue'] == 'Y' or '$' in ticker or '.' in ticker:
+            return
+        if row['ETF'] == 'Y' and not include_etfs:
+            return
+        exchange = EXCHANGES.get(row['Exchange'])
+        if exchange:
+            exchange_stocks[exchange].append(f'{exchange}:{ticker}')
+
+    stream_directory(ftp, OTHER_LISTED, on_row, lines)
     return {k: sorted(v) for k, v in exchange_stocks.items()}
 
+
+def load_state() -> dict:
+    """Per-file state of the last run; empty when missing or written by another version."""
+    try:
+        state = json.loads(STATE_PATH.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return state.get('files', {}) if state.get('version') == STATE_VERSION else {}
+
+
+def save_state(state: dict) -> None:
+    atomic_write_text(STATE_PATH, json.dumps({'version': STATE_VERSION, 'files': state}))
+
+
+def fetch_directory(ftp: FTP, path: str, parse, include_etfs: bool, state: dict, force: bool = False) -> Dict[str, List[str]]:
+    """Download and parse ``path`` unless it is unchanged since the last run.
+
+    Unchanged means the same MDTM/SIZE or, on servers that report neither,
+    the same content hash (the file is then downloaded, but not re-parsed).
+    """
+    name = path.rsplit('/', 1)[-1]
+    stamp = remote_stamp(ftp, path)
+    lines = None
+    if stamp is None:
+        lines = []
+        ftp.retrlines(f'RETR {path}', lines.append)
+        stamp = {'sha256': text_digest('\n'.join(lines))}
+    previous = state.get(path)
+    if not force and previous and previous['stamp'] == stamp and previous['include_etfs'] == include_etfs:
+        since = f"MDTM {stamp['mdtm']}" if 'mdtm' in stamp else "same content"
+        print(f"○ {name} unchanged since last run ({since}), reusing parsed symbols")
+        return previous['symbols']
+
+    symbols = parse(ftp, include_etfs, lines)
+    state[path] = {'stamp': stamp, 'include_etfs': include_etfs, 'symbols': symbols}
+    print(f"✓ {name}: {sum(len(v) for v in symbols.values())} symbols")
+    return symbols
+
+
 def save_to_file(symbols: List[str], exchange: str):
     """Save symbols to dated and canonical pair files."""
     current_date = datetime.now().strftime('%d-%b-%y').lower()
@@ -60,14 +157,10 @@ def save_to_file(symbols: List[str], exchange: str):
     canonical_filepath = Path(__file__).resolve().parent / canonical_filename
 
     content = ',\n'.join(symbols)
+    atomic_write_text(dated_filepath, content)
+    atomic_write_text(canonical_filepath, content)
 
-    with open(dated_filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
-
-    with open(canonical_filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
-
-    print(f"Saved {exchange} stocks to {dated_filepath} and {canonical_filepath}")
+    print(f"Saved {len(symbols)} {exchange} stocks to {dated_filepath} and {canonical_filepath}")
 
 def main():
     parser = argparse.ArgumentParser(description='Nasdaq stocks downloader')
@@ -75,7 +168,8 @@ def main():
     parser.add_argument('-nyse', '--nyse', action='store_true', help='Download NYSE stocks')
     parser.add_argument('-arca', '--arca', action='store_true', help='Download ARCA stocks')
     parser.add_argument('-etfs', '--etfs', action='store_true', help='Include ETFs')
-    
+    parser.add_argument('--force', action='store_true', help='Download even if the files are unchanged since the last run')
+
     args = parser.parse_args()
 
     if not (args.nasdaq or args.nyse or args.arca):
@@ -83,29 +177,21 @@ def main():
         args.nyse = True
         args.arca = True
 
-    global ftp
-    ftp = FTP('ftp.nasdaqtrader.com')
-    ftp.login()
-    
+    state = load_state()
+    stocks: Dict[str, List[str]] = {}
+    ftp = connect()
     try:
         if args.nasdaq:
-            nasdaq_stocks = get_nasdaq_stocks()
-            save_to_file(nasdaq_stocks, 'NASDAQ')
-            print('\n'.join(nasdaq_stocks))
-            
+            stocks.update(fetch_directory(ftp, NASDAQ_LISTED, parse_nasdaq, args.etfs, state, args.force))
         if args.nyse or args.arca:
-            other_stocks = get_other_stocks(args.etfs)
-            
-            if args.nyse:
-                save_to_file(other_stocks['NYSE'], 'NYSE')
-                print('\n'.join(other_stocks['NYSE']))
-                
-            if args.arca:
-                save_to_file(other_stocks['ARCA'], 'ARCA')
-                print('\n'.join(other_stocks['ARCA']))
-                
+            stocks.update(fetch_directory(ftp, OTHER_LISTED, parse_other, args.etfs, state, args.force))
     finally:
         ftp.quit()
+    save_state(state)
+
+    for exchange, wanted in (('NASDAQ', args.nasdaq), ('NYSE', args.nyse), ('ARCA', args.arca)):
+        if wanted:
+            save_to_file(stocks[exchange], exchange)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Streaming mode: keep crypto watchlists current from exchange WebSocket tickers.
+
+Each stream is seeded from the REST adapter, then follows the exchange's
+ticker channel and keeps a ``LiveTable`` of rolling 24h volumes. Bucket
+membership goes through ``VolumeHysteresis`` so symbols hovering around a
+threshold do not flap, and only the watchlists of quote assets whose
+membership changed are rewritten (at most every ``--flush-interval`` seconds).
+
+Point ``WS_BASE_OVERRIDE`` at ``bench/ws_server.py`` to replay locally.
+"""
+import argparse
+import signal
+import threading
+import time
+from datetime import datetime
+from typing import List, Set
+
+from config import (
+    FUTURES_QUOTE_ASSETS,
+    QUOTE_ASSETS,
+    STREAM_FLUSH_INTERVAL,
+    STREAM_HYSTERESIS,
+    STREAM_MAX_BACKOFF,
+    STREAM_RETRY_DELAY,
+    VOLUME_THRESHOLDS,
+)
+from exchanges.markets import MarketRecord
+from exchanges.registry import exchange_names, get_adapter
+from exchanges.streaming import LiveTable, StreamWorker, VolumeHysteresis
+from main import write_if_changed
+
+STREAM_EXCHANGES = exchange_names(streaming=True)
+STATUS_INTERVAL = 30
+
+
+class Stream:
+    """One exchange/market-type stream and the watchlists it maintains."""
+
+    def __init__(self, exchange: str, market_type: str, margin: float):
+        module = get_adapter(exchange).load_stream()
+        self.spec = module.stream_spec(market_type)
+        self.exchange = exchange
+        self.market_type = market_type
+        self.quote_assets = FUTURES_QUOTE_ASSETS if market_type == 'perp' else QUOTE_ASSETS
+        self.lock = threading.Lock()
+        self.hysteresis = VolumeHysteresis(VOLUME_THRESHOLDS, margin)
+        self.dirty: Set[str] = set()
+        self.files_changed = 0
+
+        self.table = LiveTable(exchange, market_type, self.spec.seed())
+        with self.table.lock:
+            seeded = list(self.table.records.values())
+        self.on_change(seeded)
+        self.dirty.update(self.quote_assets)
+        self.worker = StreamWorker(self.spec, self.table, self.on_change,
+                                   retry_delay=STREAM_RETRY_DELAY, max_backoff=STREAM_MAX_BACKOFF)
+
+    def on_change(self, records: List[MarketRecord]) -> None:
+        with self.lock:
+            for record in records:
+                if self.hysteresis.update(record):
+                    self.dirty.add(record.quote)
+
+    def members(self, quote_asset: str, min_volume: float) -> List[str]:
+        # Watchlists are exclusive volume buckets, as in batch_update
+        with self.lock, self.table.lock:
+            symbols = []
+            for record in self.table.records.values():
+                if record.quote != quote_asset:
+                    continue
+                bucket = self.hysteresis.bucket(record.tv_symbol)
+                if bucket is None:
+                    continue
+                if bucket == min_volume:
+                    symbols.append(record.tv_symbol)
+        return symbols
+
+    def flush(self) -> int:
+        # Non-USD quotes (BTC, ETH, EUR) follow the streamed prices of their USD pairs
+        self.on_change(self.table.refresh_rates())
+        with self.lock:
+            quotes = [quote for quote in self.quote_assets if quote in self.dirty]
+            self.dirty.clear()
+        changed = 0
+        for quote_asset in quotes:
+            for min_volume in VOLUME_THRESHOLDS:
+                changed += write_if_changed(self.members(quote_asset, min_volume), self.exchange,
+                                            quote_asset, min_volume, self.market_type)
+        self.files_changed += changed
+        return changed
+
+    def status_line(self) -> str:
+        state = self.worker.state
+        icon = "✓" if state.connected else "✗"
+        age = f"{time.time() - state.last_message:.0f}s ago" if state.last_message else "never"
+        error = f", last error: {state.last_error}" if state.last_error and not state.connected else ""
+        return (f"{icon} {self.exchange} {self.market_type}: {len(self.table.records)} symbols, "
+                f"{state.messages} messages (last {age}), {self.files_changed} files changed{error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keep crypto watchlists current from WebSocket ticker streams')
+    parser.add_argument('--exchanges', nargs='*', default=STREAM_EXCHANGES, choices=STREAM_EXCHANGES,
+                        help=f'Exchanges to stream (default: {" ".join(STREAM_EXCHANGES)})')
+    parser.add_argument('--futures', action='store_true', help='Also stream perpetual futures tickers')
+    parser.add_argument('--margin', type=float, default=STREAM_HYSTERESIS,
+                        help=f'Hysteresis around each volume threshold, as a fraction (default: {STREAM_HYSTERESIS})')
+    parser.add_argument('--flush-interval', type=float, default=STREAM_FLUSH_INTERVAL,
+                        help=f'Seconds between watchlist rewrites (default: {STREAM_FLUSH_INTERVAL})')
+    args = parser.parse_args()
+
+    streams = []
+    for exchange in args.exchanges:
+        for market_type in (['spot', 'perp'] if args.futures else ['spot']):
+            try:
+                stream = Stream(exchange, market_type, args.margin)
+            except Exception as e:
+                print(f"✗ {exchange} {market_type}: could not seed from REST: {e}")
+                continue
+            print(f"🌱 {exchange} {market_type}: seeded {len(stream.table.records)} symbols")
+            streams.append(stream)
+    if not streams:
+        print("❌ No streams to follow")
+        return
+
+    stop_event = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+
+    for stream in streams:
+        stream.flush()
+        stream.worker.start()
+    print(f"📡 Streaming {len(streams)} feeds (flush every {args.flush_interval}s, margin {args.margin:.0%})")
+
+    last_status = time.time()
+    while not stop_event.wait(args.flush_interval):
+        for stream in streams:
+            changed = stream.flush()
+            if changed:
+                print(f"✓ {datetime.now():%H:%M:%S} {stream.exchange} {stream.market_type}: {changed} files changed")
+        if time.time() - last_status >= STATUS_INTERVAL:
+            last_status = time.time()
+            for stream in streams:
+                print(f"  {stream.status_line()}")
+
+    for stream in streams:
+        stream.worker.stop()
+    for stream in streams:
+        stream.worker.thread.join(timeout=5)
+        stream.flush()
+        print(f"  {stream.status_line()}")
+    print("👋 Streaming stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped index over every generated crypto watchlist.
+
+``marketcap_bucket.py`` writes ``output/symbol_index.bin`` once per run: one
+fixed-size row per listed symbol (base asset, exchange, quote, market type,
+volume bucket, cap bucket, market cap) plus an inverted index from every
+``field=value`` to the sorted row numbers that have it. Queries intersect
+the posting lists straight out of the memory map, so a lookup only touches
+the rows it returns:
+
+    python symbol_index.py query --base SOL --quote USDT --min-volume 1000000 --cap 100M-500M
+    python symbol_index.py query --exchange binance --cap 10M-100M --export output/binance_small_caps.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import mmap
+import struct
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from config import VOLUME_BUCKETS, parse_volume_bucket
+from fileio import atomic_write_bytes, atomic_write_text
+
+OUTPUT_DIR = Path("output")
+INDEX_PATH = OUTPUT_DIR / "symbol_index.bin"
+
+MAGIC = b"WLIDX\x00\x00\x01"
+# magic, string count, row count, key count, then byte offsets of each section
+HEADER = struct.Struct("<8sIII4Q")
+# tv_symbol, base, exchange, quote, market_type, volume_bucket, cap_bucket (string ids), market_cap
+ROW = struct.Struct("<7Id")
+# field, value (string ids), first posting, posting count
+KEY = struct.Struct("<4I")
+FIELDS = ("base", "exchange", "quote", "market_type", "volume_bucket", "cap_bucket")
+
+Filter = Union[None, str, Iterable[str]]
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    tv_symbol: str
+    base: str
+    exchange: str
+    quote: str
+    market_type: str
+    volume_bucket: str
+    cap_bucket: str  # "" when the symbol has no (or a blacklisted) market cap
+    market_cap: Optional[float]
+
+
+def write_symbol_index(entries: Iterable[IndexEntry], path: Path = INDEX_PATH) -> int:
+    """Write ``entries`` as an index file; return the number of rows."""
+    rows = sorted(set(entries), key=lambda e: (e.base, e.exchange, e.quote, e.market_type, e.volume_bucket, e.tv_symbol))
+    strings: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        if value not in strings:
+            strings[value] = len(strings)
+        return strings[value]
+
+    for field in FIELDS:
+        intern(field)
+    row_data = bytearray()
+    postings: Dict[Tuple[int, int], array] = defaultdict(lambda: array("I"))
+    for number, entry in enumerate(rows):
+        ids = [intern(entry.tv_symbol)] + [intern(getattr(entry, field)) for field in FIELDS]
+        row_data += ROW.pack(*ids, math.nan if entry.market_cap is None else entry.market_cap)
+        for field, value_id in zip(FIELDS, ids[1:]):
+            postings[(strings[field], value_id)].append(number)
+
+    encoded = [value.encode("utf-8") for value in strings]
+    string_offsets = array("I", [0])
+    for blob in encoded:
+        string_offsets.append(string_offsets[-1] + len(blob))
+    key_data = bytearray()
+    posting_data = array("I")
+    for (field_id, value_id), numbers in sorted(postings.items()):
+        key_data += KEY.pack(field_id, value_id, len(posting_data), len(numbers))
+        posting_data.extend(numbers)
+
+    offsets_at = HEADER.size
+    blob_at = offsets_at + string_offsets.itemsize * len(string_offsets)
+    rows_at = blob_at + string_offsets[-1]
+    rows_at += -rows_at % 8
+    keys_at = rows_at + len(row_data)
+    postings_at = keys_at + len(key_data)
+    header = HEADER.pack(MAGIC, len(strings), len(rows), len(postings), blob_at, rows_at, keys_at, postings_at)
+    blob = b"".join(encoded)
+    data = b"".join([
+        header, string_offsets.tobytes(), blob, b"\x00" * (rows_at - blob_at - len(blob)),
+        bytes(row_data), bytes(key_data), posting_data.tobytes(),
+    ])
+    atomic_write_bytes(path, data)
+    return len(rows)
+
+
+class SymbolIndex:
+    """Read-only view of an index file; see ``query``."""
+
+    def __init__(self, path: Path = INDEX_PATH):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.string_count, self.row_count, key_count, blob_at, self.rows_at, keys_at, postings_at = HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a symbol index (or was written by another version)")
+        self.view = memoryview(self.map)
+        self.string_offsets = self.view[HEADER.size:blob_at].cast("I")
+        self.blob_at = blob_at
+        self.postings = self.view[postings_at:].cast("I")
+        self._strings: Dict[int, str] = {}
+        self.keys: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        for field_id, value_id, start, count in KEY.iter_unpack(self.view[keys_at:postings_at]):
+            self.keys[(self.string(field_id), self.string(value_id))] = (start, count)
+
+    def close(self) -> None:
+        self.string_offsets.release()
+        self.postings.release()
+        self.view.release()
+        self.map.close()
+
+    def __enter__(self) -> "SymbolIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def string(self, string_id: int) -> str:
+        value = self._strings.get(string_id)
+        if value is None:
+            start, end = self.string_offsets[string_id], self.string_offsets[string_id + 1]
+            value = self._strings[string_id] = bytes(self.view[self.blob_at + start:self.blob_at + end]).decode("utf-8")
+        return value
+
+    def row(self, number: int) -> IndexEntry:
+        *ids, market_cap = ROW.unpack_from(self.map, self.rows_at + number * ROW.size)
+        return IndexEntry(*(self.string(string_id) for string_id in ids), None if math.isnan(market_cap) else market_cap)
+
+    def values(self, field: str) -> List[str]:
+        """Distinct values of one field, e.g. ``values("exchange")``."""
+        return sorted(value for key_field, value in self.keys if key_field == field)
+
+    def _rows(self, field: str, values: Sequence[str]) -> set:
+        numbers: set = set()
+        for value in values:
+            start, count = self.keys.get((field, value), (0, 0))
+            numbers.update(self.postings[start:start + count])
+        return numbers
+
+    def query(
+        self,
+        base: Filter = None,
+        exchange: Filter = None,
+        quote: Filter = None,
+        market_type: Filter = None,
+        volume_bucket: Filter = None,
+        cap_bucket: Filter = None,
+        min_volume: Optional[float] = None,
+    ) -> List[IndexEntry]:
+        """Return matching rows; each filter takes one value or several (any of them matches).
+
+        ``min_volume`` selects every volume bucket whose threshold reaches it.
+        """
+        filters = {
+            "base": base, "exchange": exchange, "quote": quote, "market_type": market_type,
+            "volume_bucket": volume_bucket, "cap_bucket": cap_bucket,
+        }
+        wanted: Dict[str, List[str]] = {}
+        for field, value in filters.items():
+            if value is not None:
+                wanted[field] = [value] if isinstance(value, str) else list(value)
+        for field in ("base", "exchange", "quote"):
+            if field in wanted:
+                wanted[field] = [value.lower() if field == "exchange" else value.upper() for value in wanted[field]]
+        if min_volume is not None:
+            buckets = [label for label in VOLUME_BUCKETS if parse_volume_bucket(label) >= min_volume]
+            wanted["volume_bucket"] = [label for label in wanted.get("volume_bucket", buckets) if label in buckets]
+
+        if not wanted:
+            return [self.row(number) for number in range(self.row_count)]
+        # Intersect the smallest posting lists first
+        candidates = sorted((self._rows(field, values) for field, values in wanted.items()), key=len)
+        numbers = candidates[0].intersection(*candidates[1:])
+        return [self.row(number) for number in sorted(numbers)]
+
+
+def build_from_output(path: Path = INDEX_PATH) -> int:
+    """Rebuild the index from today's volume files and the stored market caps (no network)."""
+    from history import stored_market_caps
+    from marketcap_bucket import collect_base_symbols, index_entries, list_source_files, read_blacklist
+
+    sources = list_source_files()
+    symbol_caps = stored_market_caps(collect_base_symbols(sources))
+    return write_symbol_index(index_entries(sources, symbol_caps, read_blacklist()), path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the index of generated crypto watchlists")
+    parser.add_argument("--index", type=Path, default=INDEX_PATH, help=f"Index file (default: {INDEX_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("build", help="Rebuild the index from the current output/ files and cached market caps")
+    query = commands.add_parser("query", help="List symbols matching every given filter")
+    query.add_argument("--base", nargs="*", help="Base assets, e.g. SOL ETH")
+    query.add_argument("--exchange", nargs="*", help="Exchanges")
+    query.add_argument("--quote", nargs="*", help="Quote assets")
+    query.add_argument("--market-type", nargs="*", choices=["spot", "perp"], help="Market types")
+    query.add_argument("--volume-bucket", nargs="*", choices=VOLUME_BUCKETS, help="Volume buckets")
+    query.add_argument("--min-volume", type=float, help="Minimum 24h volume (selects buckets at or above it)")
+    query.add_argument("--cap", nargs="*", help="Market-cap buckets, e.g. 100M-500M")
+    query.add_argument("--export", type=Path, help="Write the matching TradingView symbols to this file")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        count = build_from_output(args.index)
+        print(f"✓ Indexed {count} listings in {args.index}")
+        return
+
+    if not args.index.exists():
+        print(f"❌ No index at {args.index}; run marketcap_bucket.py or `symbol_index.py build` first")
+        return
+    with SymbolIndex(args.index) as index:
+        entries = index.query(args.base, args.exchange, args.quote, args.market_type,
+                              args.volume_bucket, args.cap, args.min_volume)
+    if args.export:
+        atomic_write_text(args.export, ",\n".join(sorted({entry.tv_symbol for entry in entries})))
+        print(f"✓ Exported {len(entries)} symbols to {args.export}")
+        return
+    for entry in entries:
+        cap = f"${entry.market_cap:,.0f}" if entry.market_cap is not None else "n/a"
+        print(f"{entry.tv_symbol:<28} {entry.exchange:<9} {entry.quote:<5} {entry.market_type:<4} "
+              f"{entry.volume_bucket:<11} {entry.cap_bucket or '-':<10} {cap:>20}")
+    print(f"({len(entries)} listings, {len({entry.exchange for entry in entries})} exchanges)")
+
+
+if __name__ == "__main__":
+    main()
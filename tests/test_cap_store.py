@@ -0,0 +1,56 @@
+"""Page refreshes of the persistent market-cap store."""
+
+import cap_store
+from cap_store import MarketCapStore, load_market_caps
+
+PAGE_SIZE = 250
+
+
+def make_loader(monkeypatch, tmp_path, pages):
+    clock = [5000.0]
+    monkeypatch.setattr(cap_store.time, "time", lambda: clock[0])
+    fetched = []
+
+    def fetch_page(page):
+        fetched.append(page)
+        return pages.get(page, [])
+
+    def load(at):
+        clock[0] = at
+        fetched.clear()
+        return load_market_caps(["btc", "gone"], fetch_page, min_cap=1e6, page_size=PAGE_SIZE,
+                                max_age=50, rescan_age=1000, store_path=tmp_path / "caps.sqlite")
+
+    return load, fetched
+
+
+def test_missing_symbol_is_dropped_and_retried_once_per_max_age(monkeypatch, tmp_path):
+    pages = {1: [{"symbol": "btc", "market_cap": 2e12}, {"symbol": "gone", "market_cap": 1e12}]}
+    load, fetched = make_loader(monkeypatch, tmp_path, pages)
+
+    assert load(5000.0) == {"btc": 2e12, "gone": 1e12}
+    assert fetched == [1]
+
+    # "gone" was delisted: its page and the neighbours are searched once and its old cap is not returned...
+    pages[1] = [{"symbol": "btc", "market_cap": 2.1e12}]
+    assert load(5100.0) == {"btc": 2.1e12}
+    assert fetched == [1, 2]
+
+    # ...and not searched again until another max_age has passed
+    assert load(5120.0) == {"btc": 2.1e12}
+    assert fetched == []
+
+    load(5200.0)
+    assert fetched == [1, 2]
+
+
+def test_full_scan_drops_symbols_it_did_not_see(monkeypatch, tmp_path):
+    pages = {1: [{"symbol": "btc", "market_cap": 2e12}, {"symbol": "gone", "market_cap": 1e12}]}
+    load, fetched = make_loader(monkeypatch, tmp_path, pages)
+    load(5000.0)
+
+    pages[1] = [{"symbol": "btc", "market_cap": 2.1e12}]
+    assert load(7000.0) == {"btc": 2.1e12}
+    assert fetched == [1]
+    with MarketCapStore(tmp_path / "caps.sqlite") as store:
+        assert set(store.lookup(["btc", "gone"])) == {"btc"}
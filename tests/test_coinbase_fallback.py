@@ -0,0 +1,39 @@
+"""Coinbase per-product stats fallback (used when /products/stats fails)."""
+
+import requests
+
+from exchanges.coinbase.volume_filtered import pairs
+
+PRODUCTS = [
+    {"id": "BTC-USD", "base_currency": "BTC", "quote_currency": "USD", "status": "online"},
+    {"id": "BTC-EUR", "base_currency": "BTC", "quote_currency": "EUR", "status": "online"},
+    {"id": "ETH-EUR", "base_currency": "ETH", "quote_currency": "EUR", "status": "online"},
+    {"id": "SOL-GBP", "base_currency": "SOL", "quote_currency": "GBP", "status": "online"},
+]
+STATS = {
+    "BTC-USD": {"last": "60000", "volume": "1000"},
+    "BTC-EUR": {"last": "50000", "volume": "100"},
+    "ETH-EUR": {"last": "2500", "volume": "1"},
+    "SOL-GBP": {"last": "100", "volume": "100000"},
+}
+
+
+def fake_get_json(url, **kwargs):
+    if url == pairs.PRODUCTS_URL:
+        return PRODUCTS
+    if url == pairs.BULK_STATS_URL:
+        raise requests.ConnectionError("bulk stats unavailable")
+    product_id = url.split("/products/", 1)[1].split("/", 1)[0]
+    return STATS[product_id]
+
+
+def test_fallback_prices_non_usd_quotes_from_usd_markets(monkeypatch):
+    monkeypatch.setattr(pairs, "get_json", fake_get_json)
+
+    records = {record.tv_symbol: record for record in pairs.fetch_spot_markets("EUR")}
+
+    # EUR = 60000 / 50000 USD, so 100 BTC * 50000 EUR is 6M USD
+    assert records["COINBASE:BTCEUR"].usd_volume == 6_000_000
+    # Products in other non-USD quotes are not fetched
+    assert "COINBASE:SOLGBP" not in records
+    assert pairs.get_spot_symbols("EUR", 500_000) == ["COINBASE:BTCEUR"]
@@ -0,0 +1,19 @@
+"""Quote-to-USD rates of a streamed ticker table."""
+
+from exchanges.markets import MarketRecord
+from exchanges.streaming import LiveTable
+
+
+def test_cross_quote_volumes_follow_streamed_prices():
+    table = LiveTable("binance", "spot", [
+        MarketRecord("binance", "BTC", "USDT", "BINANCE:BTCUSDT", last_price=50_000, quote_volume=1e9),
+        MarketRecord("binance", "ETH", "BTC", "BINANCE:ETHBTC", last_price=0.05, quote_volume=100),
+    ])
+    assert table.apply([("BINANCE:ETHBTC", "ETH", "BTC", 100, None)])[0].usd_volume == 5_000_000
+
+    table.apply([("BINANCE:BTCUSDT", "BTC", "USDT", None, 60_000)])
+    changed = table.refresh_rates()
+
+    assert [record.tv_symbol for record in changed] == ["BINANCE:ETHBTC"]
+    assert table.records["BINANCE:ETHBTC"].usd_volume == 6_000_000
+    assert table.refresh_rates() == []
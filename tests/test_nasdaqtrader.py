@@ -0,0 +1,54 @@
+"""nasdaqtrader symbol-directory parsing and change detection."""
+
+from ftplib import error_perm
+
+from stocks import nasdaqtrader
+
+NASDAQ_LINES = [
+    "Symbol|Security Name|Market Category|Test Issue|Financial Status|Round Lot Size|ETF|NextShares",
+    "AAPL|Apple Inc. - Common Stock|Q|N|N|100|N|N",
+    "QQQ|Invesco QQQ Trust|G|N|N|100|Y|N",
+    "ZZZT|Test Issue|Q|Y|N|100|N|N",
+    "File Creation Time: 1018202612:00|||||||",
+]
+
+
+class NoStampFTP:
+    """Serves nasdaqlisted.txt without MDTM/SIZE support."""
+
+    def __init__(self):
+        self.downloads = 0
+
+    def sendcmd(self, command):
+        raise error_perm("502 Command not implemented")
+
+    def size(self, path):
+        raise error_perm("502 Command not implemented")
+
+    def retrlines(self, command, callback):
+        self.downloads += 1
+        for line in NASDAQ_LINES:
+            callback(line)
+
+
+def test_nasdaq_etfs_follow_the_flag():
+    ftp = NoStampFTP()
+    assert nasdaqtrader.parse_nasdaq(ftp, include_etfs=False) == {"NASDAQ": ["NASDAQ:AAPL"]}
+    assert nasdaqtrader.parse_nasdaq(ftp, include_etfs=True) == {"NASDAQ": ["NASDAQ:AAPL", "NASDAQ:QQQ"]}
+
+
+def test_unchanged_content_is_reused_without_mdtm():
+    ftp, state = NoStampFTP(), {}
+    calls = []
+
+    def parse(ftp, include_etfs, lines=None):
+        calls.append(lines)
+        return nasdaqtrader.parse_nasdaq(ftp, include_etfs, lines)
+
+    first = nasdaqtrader.fetch_directory(ftp, nasdaqtrader.NASDAQ_LISTED, parse, False, state)
+    second = nasdaqtrader.fetch_directory(ftp, nasdaqtrader.NASDAQ_LISTED, parse, False, state)
+
+    assert first == second == {"NASDAQ": ["NASDAQ:AAPL"]}
+    # Downloaded each time to hash it, but parsed only once and from that download
+    assert ftp.downloads == 2
+    assert calls == [NASDAQ_LINES]
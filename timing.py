@@ -0,0 +1,173 @@
+"""Per-stage timing spans and HTTP counters for batch runs.
+
+Wrap a stage in ``span(...)`` to record its wall time plus the HTTP calls,
+bytes downloaded, retries, 429s and cache hits ``exchanges/client.py``
+made meanwhile. Spans tagged with an exchange only count that exchange's
+requests, so concurrent exchanges do not bleed into each other.
+``write_report()`` dumps every span as JSON and CSV; with profiling enabled,
+spans opened with ``profile=True`` also write a cProfile dump.
+"""
+
+import cProfile
+import csv
+import io
+import json
+import pstats
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from fileio import atomic_write_text
+
+REPORT_DIR = Path("output")
+PROFILE_DIR = REPORT_DIR / "profiles"
+COUNTERS = ("calls", "bytes", "retries", "rate_limited", "cache_hits")
+
+
+@dataclass
+class Span:
+    name: str
+    stage: str = ""
+    exchange: str = ""
+    started: float = 0.0
+    wall: float = 0.0
+    calls: int = 0
+    bytes: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    cache_hits: int = 0
+    error: str = ""
+
+
+class RunTimer:
+    """Collects spans and per-exchange HTTP counters for one process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+        self.started_at = datetime.now()
+        self.spans: List[Span] = []
+        self.counters: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+        self.profile_dir: Optional[Path] = None
+        self.profiles: List[Path] = []
+
+    def record_http(self, source: str, calls: int = 0, bytes: int = 0, retries: int = 0,
+                    rate_limited: int = 0, cache_hits: int = 0) -> None:
+        with self.lock:
+            counter = self.counters[source or "other"]
+            counter["calls"] += calls
+            counter["bytes"] += bytes
+            counter["retries"] += retries
+            counter["rate_limited"] += rate_limited
+            counter["cache_hits"] += cache_hits
+
+    def snapshot(self, exchange: str = "") -> Tuple[int, ...]:
+        with self.lock:
+            if exchange:
+                counter = self.counters.get(exchange, {})
+                return tuple(counter.get(name, 0) for name in COUNTERS)
+            return tuple(sum(counter[name] for counter in self.counters.values()) for name in COUNTERS)
+
+    @contextmanager
+    def span(self, name: str, stage: str = "", exchange: str = "", profile: bool = False) -> Iterator[Span]:
+        record = Span(name, stage, exchange, started=time.perf_counter() - self.origin)
+        before = self.snapshot(exchange)
+        profiler = self._start_profiler() if profile and self.profile_dir else None
+        started = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record.error = str(e) or type(e).__name__
+            raise
+        finally:
+            record.wall = time.perf_counter() - started
+            if profiler:
+                self._save_profile(profiler, record)
+            for field_name, start, end in zip(COUNTERS, before, self.snapshot(exchange)):
+                setattr(record, field_name, end - start)
+            with self.lock:
+                self.spans.append(record)
+
+    @staticmethod
+    def _start_profiler() -> Optional[cProfile.Profile]:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active in this process (nested span)
+            return None
+        return profiler
+
+    def _save_profile(self, profiler: cProfile.Profile, record: Span) -> None:
+        profiler.disable()
+        label = "_".join(part for part in (record.stage, record.name, record.exchange) if part)
+        path = self.profile_dir / f"{label.replace(':', '-').replace('/', '-')}.prof"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(path))
+        with self.lock:
+            self.profiles.append(path)
+
+    def totals(self) -> Dict[str, Dict[str, int]]:
+        with self.lock:
+            return {source: dict(counter) for source, counter in sorted(self.counters.items())}
+
+    def write_report(self, directory: Path = REPORT_DIR) -> Tuple[Path, Path]:
+        """Write ``run_report.json`` and ``run_report.csv`` into ``directory``."""
+        with self.lock:
+            spans = sorted(self.spans, key=lambda item: item.started)
+        report = {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "wall": time.perf_counter() - self.origin,
+            "http": self.totals(),
+            "spans": [asdict(record) for record in spans],
+        }
+        json_path = Path(directory) / "run_report.json"
+        atomic_write_text(json_path, json.dumps(report, indent=2) + "\n")
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        columns = [item.name for item in fields(Span)]
+        writer.writerow(columns)
+        for record in spans:
+            row = asdict(record)
+            row["started"] = f"{record.started:.3f}"
+            row["wall"] = f"{record.wall:.3f}"
+            writer.writerow([row[column] for column in columns])
+        csv_path = Path(directory) / "run_report.csv"
+        atomic_write_text(csv_path, buffer.getvalue())
+
+        if self.profiles:
+            stats_buffer = io.StringIO()
+            stats = pstats.Stats(*(str(path) for path in self.profiles), stream=stats_buffer)
+            stats.sort_stats("cumulative").print_stats(40)
+            atomic_write_text(self.profile_dir / "summary.txt", stats_buffer.getvalue())
+        return json_path, csv_path
+
+    def slowest(self, count: int = 10) -> List[Span]:
+        with self.lock:
+            return sorted(self.spans, key=lambda item: item.wall, reverse=True)[:count]
+
+
+timer = RunTimer()
+
+
+def span(name: str, stage: str = "", exchange: str = "", profile: bool = False):
+    """Time a block on the process-wide timer (see ``RunTimer.span``)."""
+    return timer.span(name, stage, exchange, profile)
+
+
+def record_http(source: str, **counts: int) -> None:
+    timer.record_http(source, **counts)
+
+
+def enable_profiling(directory: Path = PROFILE_DIR) -> None:
+    timer.profile_dir = Path(directory)
+
+
+def write_report(directory: Path = REPORT_DIR) -> Tuple[Path, Path]:
+    return timer.write_report(directory)
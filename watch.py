@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Long-running watch mode: keep the crypto watchlists continuously fresh.
+
+One process keeps the pooled HTTP session and cached instrument metadata
+warm, refreshes each exchange's tickers on its own schedule and rewrites only
+the watchlist files whose membership changed. Failed refreshes back off
+exponentially. Freshness is reported in ``WATCH_STATUS_PATH`` and, with
+``--status-port``, over HTTP.
+"""
+import argparse
+import json
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from config import (
+    BATCH_WORKERS,
+    FUTURES_QUOTE_ASSETS,
+    QUOTE_ASSETS,
+    VOLUME_THRESHOLDS,
+    WATCH_INTERVAL,
+    WATCH_INTERVALS,
+    WATCH_MAX_BACKOFF,
+    WATCH_RETRY_DELAY,
+    WATCH_STATUS_PATH,
+)
+from exchanges import cache
+from exchanges.registry import exchange_names
+from fileio import atomic_write_text
+from main import clean_old_files
+from marketcap_bucket import build_market_cap_buckets, create_master_watchlist
+from membership import ListKey, format_changes, record_membership
+from runner import run_snapshot
+
+
+@dataclass
+class Job:
+    name: str
+    market_type: str
+    interval: float
+    next_run: float = 0.0
+    running: bool = False
+    last_attempt: Optional[float] = None
+    last_success: Optional[float] = None
+    failures: int = 0
+    last_error: str = ""
+    pairs: int = 0
+    files_changed: int = 0
+
+    def backoff(self) -> float:
+        return min(WATCH_MAX_BACKOFF, WATCH_RETRY_DELAY * 2 ** (self.failures - 1))
+
+    def status(self, now: float) -> dict:
+        age = now - self.last_success if self.last_success else None
+        return {
+            "market_type": self.market_type,
+            "interval": self.interval,
+            "last_success": iso(self.last_success),
+            "last_attempt": iso(self.last_attempt),
+            "next_run": iso(self.next_run),
+            "age_seconds": round(age, 1) if age is not None else None,
+            "stale": age is None or age > 2 * self.interval,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "pairs": self.pairs,
+            "files_changed": self.files_changed,
+        }
+
+
+def iso(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat(timespec="seconds") if timestamp else None
+
+
+def refresh_snapshot(exchange: str, market_type: str) -> tuple:
+    """Run the batch snapshot stage for one exchange; return (pairs, files changed, membership lists)."""
+    quote_assets = FUTURES_QUOTE_ASSETS if market_type == 'perp' else QUOTE_ASSETS
+    result = run_snapshot(exchange, market_type, quote_assets, VOLUME_THRESHOLDS)
+    if result.errors:
+        raise RuntimeError(next(iter(result.errors.values())))
+    return result.total_pairs, result.files_changed, result.membership() if result.files_changed else {}
+
+
+def refresh_spot(exchange: str) -> tuple:
+    return refresh_snapshot(exchange, 'spot')
+
+
+def refresh_perp(exchange: str) -> tuple:
+    return refresh_snapshot(exchange, 'perp')
+
+
+def refresh_marketcap(_name: str) -> tuple:
+    started = time.time()
+    results = build_market_cap_buckets(incremental=True)
+    create_master_watchlist()
+    changed = sum(1 for result in results if result.file_path.exists() and result.file_path.stat().st_mtime >= started)
+    return sum(result.symbol_count for result in results), changed, {}
+
+
+REFRESHERS = {'spot': refresh_spot, 'perp': refresh_perp, 'marketcap': refresh_marketcap}
+
+
+@dataclass
+class Cycle:
+    """Jobs that fell due together; their membership lists are recorded once, after the last one finishes."""
+    remaining: int
+    lists: Dict[ListKey, Dict[float, List[str]]] = field(default_factory=dict)
+
+
+class Watcher:
+    def __init__(self, jobs: List[Job], workers: int, status_path: str):
+        self.jobs = jobs
+        self.status_path = status_path
+        self.pool = ThreadPoolExecutor(max_workers=max(1, workers))
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.started = time.time()
+
+    def run_job(self, job: Job, cycle: Cycle) -> None:
+        started = time.time()
+        job.last_attempt = started
+        try:
+            job.pairs, job.files_changed, lists = REFRESHERS[job.market_type](job.name)
+            with self.lock:
+                cycle.lists.update(lists)
+            job.failures = 0
+            job.last_error = ""
+            job.last_success = time.time()
+            job.next_run = started + job.interval
+            icon = "✓" if job.files_changed else "○"
+            print(f"{icon} {datetime.now():%H:%M:%S} {job.name} {job.market_type}: "
+                  f"{job.pairs} pairs, {job.files_changed} files changed ({time.time() - started:.1f}s)")
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            job.next_run = time.time() + job.backoff()
+            print(f"✗ {datetime.now():%H:%M:%S} {job.name} {job.market_type}: {e} "
+                  f"(retry {job.failures} in {job.backoff():.0f}s)")
+        finally:
+            with self.lock:
+                job.running = False
+                cycle.remaining -= 1
+                finished = cycle.remaining == 0
+            if finished:
+                self.record_cycle(cycle)
+            self.write_status()
+
+    def record_cycle(self, cycle: Cycle) -> None:
+        """Diff the cycle's changed lists in one membership run, so the change file covers every job."""
+        if not cycle.lists:
+            return
+        try:
+            changes = record_membership(cycle.lists)
+            if changes.total:
+                print(format_changes(changes, limit=0)[0])
+        except Exception as e:
+            print(f"⚠️  Membership diff failed: {e}")
+
+    def status(self) -> dict:
+        now = time.time()
+        with self.lock:
+            jobs = {f"{job.name}:{job.market_type}": job.status(now) for job in self.jobs}
+        return {
+            "updated_at": iso(now),
+            "uptime_seconds": round(now - self.started, 1),
+            "stale": sorted(key for key, job in jobs.items() if job["stale"]),
+            "jobs": jobs,
+        }
+
+    def write_status(self) -> None:
+        try:
+            atomic_write_text(self.status_path, json.dumps(self.status(), indent=2) + "\n")
+        except OSError as e:
+            print(f"⚠️  Could not write {self.status_path}: {e}")
+
+    def roll_over(self, now: float) -> None:
+        """Start a new day: drop yesterday's watchlists and rewrite today's right away."""
+        try:
+            # Forex and stock lists are not refreshed here, so leave them to batch_update
+            clean_old_files(data_dirs=())
+        except OSError as e:
+            print(f"⚠️  Could not clean old files: {e}")
+        for job in self.jobs:
+            if job.market_type != 'marketcap':
+                job.next_run = now
+
+    def serve(self) -> None:
+        day = datetime.now().date()
+        while not self.stop_event.is_set():
+            now = time.time()
+            with self.lock:
+                rollover = datetime.now().date() != day
+                if rollover and not any(job.running for job in self.jobs):
+                    day = datetime.now().date()
+                    self.roll_over(now)
+                    rollover = False
+                # While the date changes, let running jobs finish before cleaning up
+                due = [] if rollover else [job for job in self.jobs if not job.running and job.next_run <= now]
+                for job in due:
+                    job.running = True
+            cycle = Cycle(len(due))
+            for job in due:
+                self.pool.submit(self.run_job, job, cycle)
+            with self.lock:
+                waiting = [job.next_run for job in self.jobs if not job.running]
+            self.stop_event.wait(min(1.0, max(0.05, min(waiting, default=now + 1.0) - now)))
+        self.pool.shutdown(wait=True)
+        self.write_status()
+
+    def stop(self, *_args) -> None:
+        self.stop_event.set()
+
+
+def start_status_server(watcher: Watcher, port: int) -> ThreadingHTTPServer:
+    class StatusHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = json.dumps(watcher.status(), indent=2).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), StatusHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def parse_intervals(values: List[str]) -> Dict[str, float]:
+    intervals = {}
+    for value in values:
+        name, _, seconds = value.partition('=')
+        if not seconds:
+            raise argparse.ArgumentTypeError(f"expected exchange=seconds, got {value!r}")
+        intervals[name.strip()] = float(seconds)
+    return intervals
+
+
+def build_jobs(args) -> List[Job]:
+    intervals = {**WATCH_INTERVALS, **parse_intervals(args.exchange_interval)}
+    exchanges = args.exchanges or exchange_names(spot=True)
+    jobs = [Job(exchange, 'spot', intervals.get(exchange, args.interval)) for exchange in exchanges]
+    if args.futures:
+        jobs += [
+            Job(exchange, 'perp', intervals.get(exchange, args.interval))
+            for exchange in exchange_names(futures=True) if exchange in exchanges
+        ]
+    if args.marketcap_interval:
+        jobs.append(Job('marketcap', 'marketcap', args.marketcap_interval, next_run=time.time() + args.marketcap_interval))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keep crypto watchlists fresh in a long-running process')
+    parser.add_argument('--exchanges', nargs='*', help='Exchanges to watch (default: all batch exchanges)')
+    parser.add_argument('--interval', type=float, default=WATCH_INTERVAL,
+                        help=f'Default seconds between refreshes (default: {WATCH_INTERVAL})')
+    parser.add_argument('--exchange-interval', action='append', default=[], metavar='EXCHANGE=SECONDS',
+                        help='Per-exchange refresh interval, repeatable (e.g. binance=60)')
+    parser.add_argument('--futures', action='store_true', help='Also refresh perpetual futures watchlists')
+    parser.add_argument('--marketcap-interval', type=float,
+                        help='Rebuild market-cap buckets incrementally every N seconds')
+    parser.add_argument('--workers', type=int, default=BATCH_WORKERS,
+                        help=f'Refreshes run concurrently (default: {BATCH_WORKERS})')
+    parser.add_argument('--status-file', default=WATCH_STATUS_PATH, help=f'Status JSON path (default: {WATCH_STATUS_PATH})')
+    parser.add_argument('--status-port', type=int, help='Also serve the status JSON on 127.0.0.1:PORT')
+    args = parser.parse_args()
+
+    # Keep cache entries (instrument metadata in particular) in memory between refreshes
+    cache.configure(memory=True)
+    watcher = Watcher(build_jobs(args), args.workers, args.status_file)
+    signal.signal(signal.SIGINT, watcher.stop)
+    signal.signal(signal.SIGTERM, watcher.stop)
+
+    print(f"👀 Watching {len(watcher.jobs)} jobs with {args.workers} workers (status: {args.status_file})")
+    for job in watcher.jobs:
+        print(f"  {job.name} {job.market_type}: every {job.interval:.0f}s")
+    if args.status_port:
+        start_status_server(watcher, args.status_port)
+        print(f"🌐 Status: http://127.0.0.1:{args.status_port}/")
+
+    watcher.serve()
+    print("👋 Watch mode stopped")
+
+
+if __name__ == "__main__":
+    main()